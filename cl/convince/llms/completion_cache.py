@@ -13,9 +13,14 @@
 # limitations under the License.
 
 import csv
+import io
 import os
 from dataclasses import dataclass
+from dataclasses import field
+from threading import RLock
 from typing import Any
+from typing import Iterator
+from typing import Sequence
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.contexts.context_manager import active_or_default
 from cl.runtime.db.data_source import DataSource
@@ -24,6 +29,7 @@ from cl.runtime.records.for_dataclasses.dataclass_mixin import DataclassMixin
 from cl.runtime.server.env import Env
 from cl.runtime.settings.project_settings import ProjectSettings
 from cl.convince.llms.completion import Completion
+from cl.convince.llms.completion_key import CompletionKey
 from cl.convince.llms.completion_key_gen import CompletionKeyGen
 from cl.convince.llms.completion_util import CompletionUtil
 from cl.convince.llms.llm_key import LlmKey
@@ -36,6 +42,27 @@ _csv_headers = ["RequestID", "Query", "Completion"]
 """CSV column headers."""
 
 
+_STORE_DICT: dict[str, "_CompletionStore"] = {}
+"""Completion stores shared by all CompletionCache instances within the process, indexed by cache file path."""
+
+_STORE_LOCK = RLock()
+"""Lock for access to the dictionary of completion stores from multiple threads."""
+
+
+@dataclass(slots=True)
+class _CompletionStore:
+    """Completions read from the same cache file and the position in the file after the last row read."""
+
+    completions: dict[str, str] = field(default_factory=dict)
+    """Completion string indexed by completion_id, the latest row for the same completion_id takes precedence."""
+
+    offset: int = 0
+    """Position in the file after the last complete row read so far, rows after it are read on the next refresh."""
+
+    lock: RLock = field(default_factory=RLock)
+    """Lock for reading the file and updating the store from multiple threads."""
+
+
 def _error_extension_not_supported(ext: str) -> Any:
     raise RuntimeError(
         f"Extension {ext} is not supported by CompletionCache. "
@@ -52,6 +79,8 @@ class CompletionCache(DataclassMixin):
         - After each model call, input and output are recorded in 'channel.completions.csv'
         - The channel may be based on llm_id or include some of all of the LLM settings or their hash
         - If exactly the same input is subsequently found in the completions file, it is used without calling the LLM
+        - The file is parsed once per process into a store shared by all instances with the same output_path,
+          rows appended after that are read incrementally from the last position when a lookup misses
         - To record a new completions file, delete the existing one
     """
 
@@ -64,8 +93,8 @@ class CompletionCache(DataclassMixin):
     output_path: str | None = None
     """Path for the cache file where completions are stored."""
 
-    _completions_loaded: bool = False
-    """Flag indicating stored completions were loaded."""
+    _store: _CompletionStore | None = None
+    """Process-wide store of completions from the cache file, shared by instances with the same output_path."""
 
     def __init(self) -> None:
         """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
@@ -103,20 +132,29 @@ class CompletionCache(DataclassMixin):
 
     def add(self, request_id: str, query: str, completion: str) -> None:
         """Add to file even if already exits, the latest will take precedence during lookup."""
-
-        # Remove leading and trailing whitespace and normalize EOL in value
-        completion = CompletionUtil.format_completion(completion)
-
-        # Create and save a completion record
-        completion_record = Completion(
-            llm=LlmKey(llm_id=self.channel),
-            query=query,
-            completion=completion,
-            timestamp=request_id,
-        ).build()
+        self.add_many([(request_id, query, completion)])
+
+    def add_many(self, rows: Sequence[tuple[str, str, str]]) -> None:
+        """
+        Add (request_id, query, completion) rows to DB and file in one batch even if already exist,
+        the latest will take precedence during lookup.
+        """
+
+        # Create completion records, removing leading and trailing whitespace and normalizing EOL in value
+        completion_records = [
+            Completion(
+                llm=LlmKey(llm_id=self.channel),
+                query=query,
+                completion=CompletionUtil.format_completion(completion),
+                timestamp=request_id,
+            ).build()
+            for request_id, query, completion in rows
+        ]
+        if not completion_records:
+            return
 
         # Save completions to DB (including preloads) outside a test
-        active(DataSource).replace_one(completion_record, commit=True)
+        active(DataSource).replace_many(completion_records, commit=True)
 
         # Save completions to a file unless explicitly turned off in CompletionSettings
         if CompletionSettings.instance().completion_save_to_csv:
@@ -131,83 +169,165 @@ class CompletionCache(DataclassMixin):
                     os.makedirs(output_dir)
 
             if self.ext == "csv":
-                with open(self.output_path, mode="a", newline="", encoding="utf-8") as file:
-                    writer = csv.writer(
-                        file,
-                        delimiter=",",
-                        quotechar='"',
-                        quoting=csv.QUOTE_MINIMAL,
-                        escapechar="\\",
-                        lineterminator=os.linesep,
-                    )
+                # Lock to prevent rows written from different threads from interleaving
+                store = self._store
+                with store.lock:
+                    # Read the rows appended by other writers so the offset can be advanced past the new rows
+                    self._read_rows()
+                    self._write_rows(completion_records, is_new=is_new)
+            else:
+                # Should not be reached here because of a previous check in __init__
+                _error_extension_not_supported(self.ext)
+        else:
+            # Add to the store so that the latest completion takes precedence during lookup
+            with self._store.lock:
+                self._store.completions.update((x.completion_id, x.completion) for x in completion_records)
+
+    def _write_rows(self, completion_records: Sequence[Completion], *, is_new: bool) -> None:
+        """Append completions to the cache file and add them to the store, invoked under store lock."""
+        store = self._store
+        with open(self.output_path, mode="a", newline="", encoding="utf-8") as file:
+            # The file position is at the end in append mode, the new rows follow the last row read
+            # unless another process appended rows after the file was read
+            is_read_to_end = file.tell() == store.offset
+            writer = csv.writer(
+                file,
+                delimiter=",",
+                quotechar='"',
+                quoting=csv.QUOTE_MINIMAL,
+                escapechar="\\",
+                lineterminator=os.linesep,
+            )
 
-                    if is_new:
-                        # Write the headers if the file is new
-                        writer.writerow(CompletionUtil.to_os_eol(_csv_headers))
+            if is_new:
+                # Write the headers if the file is new
+                writer.writerow(CompletionUtil.to_os_eol(_csv_headers))
 
-                    # NOT ADDING THE VALUE TO COMPLETION DICT HERE IS NOT A BUG
-                    # Because we are not adding to the dict here but only writing to a file,
-                    # the model will not reuse cached completions within the same session,
-                    # preventing incorrect measurement of stability
+            # Write the new completions without checking if one already exists
+            writer.writerows(CompletionUtil.to_os_eol([x.timestamp, x.query, x.completion]) for x in completion_records)
 
-                    # Write the new completion without checking if one already exists
-                    writer.writerow(
-                        CompletionUtil.to_os_eol([request_id, completion_record.query, completion_record.completion])
-                    )
+            # Flush immediately to ensure all of the output is on disk in the event of exception
+            file.flush()
 
-                    # Flush immediately to ensure all of the output is on disk in the event of exception
-                    file.flush()
-            else:
-                # Should not be reached here because of a previous check in __init__
-                _error_extension_not_supported(self.ext)
+            # Add to the store so that the latest completion takes precedence during lookup
+            store.completions.update((x.completion_id, x.completion) for x in completion_records)
+            if is_read_to_end:
+                # Skip the new rows on the next read, otherwise they are read again with the preceding rows
+                store.offset = file.tell()
 
     def get(self, query: str) -> str | None:
         """Return completion for the specified query if found and None otherwise."""
+        return self.get_many([query])[0]
 
-        # Set only those fields that are required for computing the key
-        completion_key = CompletionKeyGen(llm=LlmKey(llm_id=self.channel), query=query).build().get_key()
+    def get_many(self, queries: Sequence[str]) -> list[str | None]:
+        """Return completions for the specified queries in the same order, None for those that are not found."""
 
-        # Return completion string from DB or None if the record is not found
-        completion = active(DataSource).load_one_or_none(completion_key, cast_to=Completion)
-        result = completion.completion if completion is not None else None
+        # Set only those fields that are required for computing the key
+        llm = LlmKey(llm_id=self.channel).build()
+        completion_ids = [CompletionKeyGen(llm=llm, query=query).build().completion_id for query in queries]
+
+        # Look up in the store, read the rows appended to the file since the last lookup if any are not found
+        result = [self._store.completions.get(x) for x in completion_ids]
+        if None in result:
+            self._read_rows()
+            result = [self._store.completions.get(x) for x in completion_ids]
+
+        if missing := [i for i, x in enumerate(result) if x is None]:
+            # Load completion records for the remaining queries from DB in one call, None if not found
+            completion_keys = [CompletionKey(completion_id=completion_ids[i]).build() for i in missing]
+            completions = active(DataSource).load_many_or_none(completion_keys, cast_to=Completion)
+            for i, completion in zip(missing, completions):
+                result[i] = completion.completion if completion is not None else None
         return result
 
     def load_completion_dict(self) -> None:
-        """Load cache file."""
+        """Get the process-wide store for the cache file, parse the file and save completions to DB on first use."""
+        if self._store is None:
+            with _STORE_LOCK:
+                if (store := _STORE_DICT.get(self.output_path)) is None:
+                    store = _STORE_DICT[self.output_path] = _CompletionStore()
+            self._store = store
+
+            # Completions are saved to DB only when the file is parsed from the beginning
+            if completions := self._read_rows():
+                # Save to DB unless inside a test
+                active(DataSource).replace_many(
+                    completions, commit=True
+                )  # TODO: Review to see how to use insert_many instead
+
+    def _read_rows(self) -> list[Completion]:
+        """Add rows appended to the cache file since the last read to the store, return them only if read from start."""
         # Load if the file exists unless explicitly turned off in CompletionSettings
-        if not self._completions_loaded:
-            self._completions_loaded = True
-
-            if CompletionSettings.instance().completion_load_from_csv and os.path.exists(self.output_path):
-                # Populate the dictionary from file if exists but not yet loaded
-                with open(self.output_path, mode="r", newline="", encoding="utf-8") as file:
-                    reader = csv.reader(file, delimiter=",", quotechar='"', escapechar="\\", lineterminator=os.linesep)
-
-                    # Read and validate the headers
-                    headers_in_file = next(reader, None)
-                    if headers_in_file != _csv_headers:
-                        max_len = 20
-                        headers_in_file = [h if len(h) < max_len else f"{h[:max_len]}..." for h in headers_in_file]
-                        headers_in_file_str = ", ".join(headers_in_file)
-                        expected_headers_str = ", ".join(_csv_headers)
-                        raise ValueError(
-                            f"Expected column headers in completions cache are {expected_headers_str}. "
-                            f"Actual headers: {headers_in_file_str}."
-                        )
-
-                    # Create and save a completion record
-                    completions = [
-                        Completion(
-                            llm=LlmKey(llm_id=self.channel),
-                            query=row[1],
-                            completion=row[2],
-                            timestamp=row[0],
-                        ).build()
-                        for row_ in reader
-                        if (row := CompletionUtil.to_python_eol(row_))
-                    ]
-
-                    # Save to DB unless inside a test
-                    active(DataSource).replace_many(
-                        completions, commit=True
-                    )  # TODO: Review to see how to use insert_many instead
+        if not CompletionSettings.instance().completion_load_from_csv:
+            return []
+
+        store = self._store
+        with store.lock:
+            file_size = os.path.getsize(self.output_path) if os.path.exists(self.output_path) else 0
+            if file_size < store.offset:
+                # The file was deleted or replaced, read again from the beginning
+                store.completions.clear()
+                store.offset = 0
+            if file_size == store.offset:
+                return []
+
+            with open(self.output_path, mode="rb") as file:
+                file.seek(store.offset)
+                data = file.read(file_size - store.offset)
+
+            # A row may span several lines because queries and completions can contain EOL inside quotes,
+            # pass only the lines that end with EOL to the reader and record the number of bytes passed
+            num_bytes = 0
+            is_exhausted = False
+
+            def _iter_lines() -> Iterator[str]:
+                nonlocal num_bytes, is_exhausted
+                for line in io.BytesIO(data):
+                    if not line.endswith(b"\n"):
+                        break
+                    num_bytes += len(line)
+                    yield line.decode("utf-8")
+                is_exhausted = True
+
+            # Another process may not have finished writing the last row, a row returned by the reader after
+            # the lines are exhausted or with fewer fields than headers is incomplete and is read again
+            # from its start on the next call
+            reader = csv.reader(_iter_lines(), delimiter=",", quotechar='"', escapechar="\\")
+            rows = []
+            end = 0
+            for row in reader:
+                if is_exhausted or (row and len(row) != len(_csv_headers)):
+                    break
+                rows.append(row)
+                end = num_bytes
+            if not rows:
+                return []
+
+            is_start = store.offset == 0
+            if is_start:
+                # Validate the headers
+                headers_in_file = rows.pop(0)
+                if headers_in_file != _csv_headers:
+                    max_len = 20
+                    headers_in_file = [h if len(h) < max_len else f"{h[:max_len]}..." for h in headers_in_file]
+                    headers_in_file_str = ", ".join(headers_in_file)
+                    expected_headers_str = ", ".join(_csv_headers)
+                    raise ValueError(
+                        f"Expected column headers in completions cache are {expected_headers_str}. "
+                        f"Actual headers: {headers_in_file_str}."
+                    )
+
+            # Create completion records and add them to the store in the order of rows
+            completions = [
+                Completion(
+                    llm=LlmKey(llm_id=self.channel),
+                    query=row[1],
+                    completion=row[2],
+                    timestamp=row[0],
+                ).build()
+                for row_ in rows
+                if (row := CompletionUtil.to_python_eol(row_))
+            ]
+            store.completions.update((x.completion_id, x.completion) for x in completions)
+            store.offset += end
+            return completions if is_start else []
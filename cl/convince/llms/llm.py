@@ -12,10 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import contextvars
+import random
+import time
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from threading import BoundedSemaphore
+from threading import Lock
 from typing import Self
+from typing import Sequence
 from cl.runtime.contexts.context_manager import active_or_default
 from cl.runtime.parsers.locale import Locale
 from cl.runtime.parsers.locale_key import LocaleKey
@@ -23,12 +31,22 @@ from cl.runtime.parsers.locale_keys import LocaleKeys
 from cl.runtime.primitive.timestamp import Timestamp
 from cl.runtime.records.for_dataclasses.extensions import required
 from cl.runtime.records.record_mixin import RecordMixin
+from cl.runtime.records.typename import typename
 from cl.runtime.schema.type_info import TypeInfo
 from cl.convince.llms.completion_cache import CompletionCache
 from cl.convince.llms.completion_util import CompletionUtil
 from cl.convince.llms.llm_key import LlmKey
 from cl.convince.settings.llm_settings import LlmSettings
 
+_PROVIDER_SEMAPHORES: dict[type, BoundedSemaphore] = {}
+"""Semaphores limiting the number of concurrent provider calls within the process, indexed by LLM type."""
+
+_PROVIDER_SEMAPHORES_LOCK = Lock()
+"""Lock for creating provider semaphores."""
+
+_RATE_LIMIT_STATUS_CODE = 429
+"""HTTP status code returned by the LLM provider when the rate limit is exceeded."""
+
 
 @dataclass(slots=True, kw_only=True)
 class Llm(LlmKey, RecordMixin, ABC):
@@ -71,8 +89,9 @@ class Llm(LlmKey, RecordMixin, ABC):
             # TODO: Enable locale other than en-US after the code using LLM locale is added
             raise RuntimeError("LLM locale is not yet supported.")
 
-        # Initialize completion cache
-        self._completion_cache = CompletionCache(channel=self.llm_id).build()
+        # Completion cache is initialized on first use rather than here, because the cache directory
+        # under a test is found from the call stack, which is not available when records are built
+        # by a worker thread, for example during parallel preload
 
     def completion(self, query: str) -> str:
         """Text-in, text-out single query completion without model-specific tags (uses response caching)."""
@@ -80,30 +99,171 @@ class Llm(LlmKey, RecordMixin, ABC):
         # Get cache key with trial, EOL normalization, and stripped leading and trailing whitespace
         query_create = CompletionUtil.format_query(query)
 
-        if not self._completion_cache:
-            # Initialize completion cache on first use, error message if self is not yet frozen
-            # to prevent the cache from being out of sync with the object
-            self.check_frozen()
-            self._completion_cache = CompletionCache(channel=self.llm_id).build()
-
         # Try to find in completion cache by cache_key, make cloud provider call only if not found
-        if (result := self._completion_cache.get(query_create)) is None:
+        if (result := self._get_cache().get(query_create)) is None:
             # Request identifier is UUIDv7 timestamp in time-ordered dash-delimited format
             # is used to prevent LLM cloud provider caching and to identify LLM API calls
             # for audit log and error reporting purposes
             request_id = Timestamp.create()
 
             # Invoke LLM by calling the cloud provider API
-            result = self.uncached_completion(request_id, query_create)
+            result = self._provider_completion(request_id, query_create)
 
             # Save the result in cache before returning, request_id is recorded
             # but not taken into account during lookup
-            self._completion_cache.add(request_id, query_create, result)
+            self._get_cache().add(request_id, query_create, result)
 
         # Remove leading and trailing whitespace and normalize EOL in result
         result = CompletionUtil.format_completion(result)
         return result
 
+    def completion_many(self, queries: Sequence[str]) -> list[str]:
+        """
+        Text-in, text-out completion for multiple queries returned in the same order (uses response caching).
+
+        Notes:
+            - Identical queries are sent to the provider only once
+            - Cached completions are looked up in bulk, the remaining queries are sent to the provider concurrently
+              from a thread pool, up to get_max_concurrency() calls at a time for each provider
+            - New completions are saved to the completion cache in one batch after all calls complete,
+              if some calls fail the completions of the other calls are saved before the first error is raised
+        """
+        formatted_queries, completions, misses = self._get_cached_many(queries)
+        if misses:
+            # Copy the active contexts into the executor threads for each call
+            max_workers = min(len(misses), self.get_max_concurrency())
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=typename(type(self))) as executor:
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self._provider_completion, request_id, query)
+                    for query, request_id in misses.items()
+                ]
+                # Wait for all calls so that completions returned before an error are cached
+                results = [future.exception() or future.result() for future in futures]
+            self._add_many(completions, misses, results)
+        return [CompletionUtil.format_completion(completions[x]) for x in formatted_queries]
+
+    async def completion_many_async(self, queries: Sequence[str]) -> list[str]:
+        """
+        Async version of completion_many that does not block the event loop.
+
+        Notes:
+            - Cache lookups and writes run in a worker thread, provider calls run concurrently in worker threads
+            - The number of concurrent provider calls is limited by get_max_concurrency() for each provider
+        """
+        # Initialize completion cache in the calling thread
+        self._get_cache()
+        formatted_queries, completions, misses = await asyncio.to_thread(self._get_cached_many, queries)
+        if misses:
+            # Limit the number of threads waiting for the provider semaphore
+            semaphore = asyncio.Semaphore(self.get_max_concurrency())
+
+            async def _call(request_id: str, query: str) -> str:
+                async with semaphore:
+                    return await asyncio.to_thread(self._provider_completion, request_id, query)
+
+            results = await asyncio.gather(
+                *(_call(request_id, query) for query, request_id in misses.items()), return_exceptions=True
+            )
+            await asyncio.to_thread(self._add_many, completions, misses, results)
+        return [CompletionUtil.format_completion(completions[x]) for x in formatted_queries]
+
+    @classmethod
+    def get_max_concurrency(cls) -> int:
+        """Maximum number of concurrent calls to the provider of this LLM type, derived types may override."""
+        return LlmSettings.instance().llm_max_concurrency
+
+    def get_retry_delay(self, error: Exception, attempt: int) -> float | None:
+        """
+        Return delay in seconds before retrying after the provider error or None if the error is not retryable,
+        derived types may override to recognize provider-specific rate limit errors.
+
+        Notes:
+            - Recognizes errors with status_code 429 or type name containing 'RateLimit'
+            - Uses the Retry-After header of the error response if present, and exponential backoff with jitter
+              starting from LlmSettings.llm_retry_delay otherwise
+        """
+        is_rate_limit = (
+            getattr(error, "status_code", None) == _RATE_LIMIT_STATUS_CODE or "RateLimit" in type(error).__name__
+        )
+        if not is_rate_limit or attempt >= LlmSettings.instance().llm_max_retries:
+            return None
+        if (headers := getattr(getattr(error, "response", None), "headers", None)) is not None:
+            if (retry_after := headers.get("retry-after")) is not None:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass  # Not in seconds format, use exponential backoff
+        return LlmSettings.instance().llm_retry_delay * 2**attempt * (1.0 + random.random())
+
     @abstractmethod
     def uncached_completion(self, request_id: str, query: str) -> str:
         """Perform completion without CompletionCache lookup, call completion instead."""
+
+    def _get_cache(self) -> CompletionCache:
+        """Return completion cache, initializing it on first use."""
+        if not self._completion_cache:
+            # Initialize completion cache on first use, error message if self is not yet frozen
+            # to prevent the cache from being out of sync with the object
+            self.check_frozen()
+            self._completion_cache = CompletionCache(channel=self.llm_id).build()
+        return self._completion_cache
+
+    def _get_cached_many(self, queries: Sequence[str]) -> tuple[list[str], dict[str, str | None], dict[str, str]]:
+        """
+        Return a tuple of (1) formatted queries in the input order, (2) completions for unique formatted queries,
+        None if not cached, and (3) request_id for each unique formatted query that is not cached.
+        """
+        formatted_queries = [CompletionUtil.format_query(x) for x in queries]
+        unique_queries = list(dict.fromkeys(formatted_queries))
+        completions = dict(zip(unique_queries, self._get_cache().get_many(unique_queries)))
+
+        # Request identifiers are created in the calling thread to preserve time ordering
+        misses = {query: Timestamp.create() for query, completion in completions.items() if completion is None}
+        return formatted_queries, completions, misses
+
+    def _add_many(
+        self,
+        completions: dict[str, str | None],
+        misses: dict[str, str],
+        results: Sequence[str | BaseException],
+    ) -> None:
+        """
+        Add the results of provider calls for the queries that are not cached, save to cache in one batch.
+
+        Notes:
+            - Results that are exceptions are not cached, the first of them is raised after saving the completions
+        """
+        added = [
+            (request_id, query, result)
+            for (query, request_id), result in zip(misses.items(), results)
+            if not isinstance(result, BaseException)
+        ]
+        completions.update((query, result) for _, query, result in added)
+        if added:
+            self._get_cache().add_many(added)
+        if (error := next((x for x in results if isinstance(x, BaseException)), None)) is not None:
+            raise error
+
+    def _provider_completion(self, request_id: str, query: str) -> str:
+        """Call uncached_completion within the provider concurrency limit, retry after rate limit errors."""
+        semaphore = self._get_provider_semaphore()
+        attempt = 0
+        while True:
+            with semaphore:
+                try:
+                    return self.uncached_completion(request_id, query)
+                except Exception as e:
+                    if (delay := self.get_retry_delay(e, attempt)) is None:
+                        raise
+            # Wait outside the semaphore so other calls can proceed
+            time.sleep(delay)
+            attempt += 1
+
+    @classmethod
+    def _get_provider_semaphore(cls) -> BoundedSemaphore:
+        """Return the semaphore shared by all instances of this LLM type within the process."""
+        if (result := _PROVIDER_SEMAPHORES.get(cls)) is None:
+            with _PROVIDER_SEMAPHORES_LOCK:
+                if (result := _PROVIDER_SEMAPHORES.get(cls)) is None:
+                    result = _PROVIDER_SEMAPHORES[cls] = BoundedSemaphore(cls.get_max_concurrency())
+        return result
@@ -34,3 +34,12 @@ class LlmSettings(Settings):
     Locale the default LLM instance is instructed to use in BCP 47 language-country format, for example en-US.
     This applies to LLM completions only and has no effect on the UI or the data file format.
     """
+
+    llm_max_concurrency: int = 8
+    """Maximum number of concurrent calls to each LLM provider within the process, LLM types may override."""
+
+    llm_max_retries: int = 5
+    """Maximum number of retries after a rate limit error returned by the LLM provider."""
+
+    llm_retry_delay: float = 1.0
+    """Initial delay in seconds before retrying after a rate limit error, doubled after each retry."""
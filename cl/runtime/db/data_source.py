@@ -15,6 +15,7 @@
 import logging
 from collections import defaultdict
 from dataclasses import dataclass
+from typing import Iterator
 from typing import Self
 from typing import Sequence
 from typing import cast
@@ -22,6 +23,7 @@ from more_itertools import consume
 from cl.runtime.db.data_source_key import DataSourceKey
 from cl.runtime.db.dataset import Dataset
 from cl.runtime.db.dataset_key import DatasetKey
+from cl.runtime.db.db import DEFAULT_BATCH_SIZE
 from cl.runtime.db.db import Db
 from cl.runtime.db.db_key import DbKey
 from cl.runtime.db.filter import Filter
@@ -258,8 +260,8 @@ class DataSource(DataSourceKey, RecordMixin):
             sort_order=sort_order,
         )
 
-        # Perform checks and return
-        assert TypeCheck.guard_record_sequence(result)
+        # Perform checks and return, the result has project_to type if specified
+        assert project_to is not None or TypeCheck.guard_record_sequence(result)
         return result
 
     def load_many_or_none(
@@ -339,7 +341,9 @@ class DataSource(DataSourceKey, RecordMixin):
 
         # Concatenated list
         loaded_records = [item for sublist in loaded_records_grouped_by_key_type for item in sublist]
-        serialized_loaded_keys = [KeySerializers.TUPLE.serialize(x.get_key()) for x in loaded_records]
+        serialized_loaded_keys = [
+            KeySerializers.TUPLE.serialize(x if is_key_type(type(x)) else x.get_key()) for x in loaded_records
+        ]
 
         # Create a dictionary with pairs consisting of serialized key (after normalization) and the record for this key
         loaded_records_dict = {k: v for k, v in zip(serialized_loaded_keys, loaded_records)}
@@ -351,9 +355,9 @@ class DataSource(DataSourceKey, RecordMixin):
             for x in records_or_keys
         )
 
-        # Invoke build and return (build will have no effect if already invoked)
+        # Invoke build and return, skip records that are already frozen such as those built by the deserializer
         if result is not None:
-            result = tuple(x.build() if x is not None else x for x in result)
+            result = tuple(x if x is None or x.is_frozen() else x.build() for x in result)
 
         # Cast to cast_to if specified, pass through None
         if cast_to is not None:
@@ -437,9 +441,9 @@ class DataSource(DataSourceKey, RecordMixin):
             skip=skip,
         )
 
-        # Invoke build and return (build will have no effect if already invoked)
+        # Invoke build and return, skip records that are already frozen such as those built by the deserializer
         if result is not None:
-            result = tuple(x.build() if x is not None else x for x in result)
+            result = tuple(x if x is None or x.is_frozen() else x.build() for x in result)
 
         # If result is empty return from parent DataSource
         if not result and self.parent:
@@ -455,6 +459,64 @@ class DataSource(DataSourceKey, RecordMixin):
         else:
             return result
 
+    def iter_all(
+        self,
+        key_type: type[KeyMixin],
+        *,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
+        """
+        Iterate over all records for the specified key type, fetching and deserializing them in batches
+        so memory use does not grow with the number of records.
+
+        Args:
+            key_type: Key type determines the database table
+            cast_to: Cast the result to this type (error if not a subtype)
+            restrict_to: Include only this type and its subtypes, skip other types
+            project_to: Use some or all fields from the stored record to create and return instances of this type
+            sort_order: Sort by key fields in the specified order, reversing for fields marked as DESC
+            limit: Maximum number of records to return (for pagination)
+            skip: Number of records to skip (for pagination)
+            batch_size: Number of records fetched from the database in one round trip
+        """
+        assert TypeCheck.guard_key_type(key_type)
+
+        has_records = False
+        for record in self._get_db().iter_all(
+            key_type=key_type,
+            dataset=self.dataset.dataset_id,
+            tenant=self.tenant.tenant_id,
+            cast_to=cast_to,
+            restrict_to=restrict_to,
+            project_to=project_to,
+            sort_order=sort_order,
+            limit=limit,
+            skip=skip,
+            batch_size=batch_size,
+        ):
+            has_records = True
+            # Invoke build and return, skip records that are already frozen such as those built by the deserializer
+            yield record if record is None or record.is_frozen() else record.build()
+
+        # If result is empty return from parent DataSource
+        if not has_records and self.parent:
+            yield from self.parent.iter_all(
+                key_type,
+                cast_to=cast_to,
+                restrict_to=restrict_to,
+                project_to=project_to,
+                sort_order=sort_order,
+                limit=limit,
+                skip=skip,
+                batch_size=batch_size,
+            )
+
     def load_by_filter(
         self,
         filter_: Filter,
@@ -565,9 +627,9 @@ class DataSource(DataSourceKey, RecordMixin):
             skip=skip,
         )
 
-        # Invoke build and return (build will have no effect if already invoked)
+        # Invoke build and return, skip records that are already frozen such as those built by the deserializer
         if result is not None:
-            result = tuple(x.build() if x is not None else x for x in result)
+            result = tuple(x if x is None or x.is_frozen() else x.build() for x in result)
 
         # If result is empty return from parent DataSource
         if not result and self.parent:
@@ -583,6 +645,62 @@ class DataSource(DataSourceKey, RecordMixin):
         else:
             return result
 
+    def iter_by_query(
+        self,
+        query: QueryMixin,
+        *,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
+        """
+        Iterate over records that match the specified query, fetching and deserializing them in batches
+        so memory use does not grow with the number of records.
+
+        Args:
+            query: Contains predicates to match
+            cast_to: Cast the result to this type (error if not a subtype)
+            restrict_to: Include only this type and its subtypes, skip other types
+            project_to: Use some or all fields from the stored record to create and return instances of this type
+            sort_order: Sort by query fields in the specified order, reversing for fields marked as DESC
+            limit: Maximum number of records to return (for pagination)
+            skip: Number of records to skip (for pagination)
+            batch_size: Number of records fetched from the database in one round trip
+        """
+        has_records = False
+        for record in self._get_db().iter_by_query(
+            query,
+            dataset=self.dataset.dataset_id,
+            tenant=self.tenant.tenant_id,
+            cast_to=cast_to,
+            restrict_to=restrict_to,
+            project_to=project_to,
+            sort_order=sort_order,
+            limit=limit,
+            skip=skip,
+            batch_size=batch_size,
+        ):
+            has_records = True
+            # Invoke build and return, skip records that are already frozen such as those built by the deserializer
+            yield record if record is None or record.is_frozen() else record.build()
+
+        # If result is empty return from parent DataSource
+        if not has_records and self.parent:
+            yield from self.parent.iter_by_query(
+                query,
+                cast_to=cast_to,
+                restrict_to=restrict_to,
+                project_to=project_to,
+                sort_order=sort_order,
+                limit=limit,
+                skip=skip,
+                batch_size=batch_size,
+            )
+
     def count_by_query(
         self,
         query: QueryMixin,
@@ -605,7 +723,38 @@ class DataSource(DataSourceKey, RecordMixin):
 
         # If result is empty return from parent DataSource
         if result == 0 and self.parent:
-            return self.parent.count_by_query()
+            return self.parent.count_by_query(query, restrict_to=restrict_to)
+        else:
+            return result
+
+    def count_by_group(
+        self,
+        query: QueryMixin,
+        *,
+        group_by: Sequence[str],
+        restrict_to: type | None = None,
+    ) -> tuple[tuple[tuple, int], ...]:
+        """
+        Return (group_values, count) pairs for records that match the specified query, where group_values
+        is a tuple with the value of each group_by field. Only groups with nonzero count are returned,
+        in no particular order.
+
+        Args:
+            query: Contains predicates to match
+            group_by: Names of primitive, enum or key fields of restrict_to or the query target type to group by
+            restrict_to: Include only this type and its subtypes, skip other types
+        """
+        result = self._get_db().count_by_group(
+            query,
+            group_by=group_by,
+            dataset=self.dataset.dataset_id,
+            tenant=self.tenant.tenant_id,
+            restrict_to=restrict_to,
+        )
+
+        # If result is empty return from parent DataSource
+        if not result and self.parent:
+            return self._get_parent().count_by_group(query, group_by=group_by, restrict_to=restrict_to)
         else:
             return result
 
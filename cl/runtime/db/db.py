@@ -15,20 +15,34 @@
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
+from typing import Iterator
 from typing import Sequence
+from memoization import cached
 from cl.runtime.contexts.context_manager import active_or_default
 from cl.runtime.db.db_key import DbKey
 from cl.runtime.db.query_mixin import QueryMixin
 from cl.runtime.db.save_policy import SavePolicy
 from cl.runtime.db.sort_order import SortOrder
 from cl.runtime.qa.qa_util import QaUtil
+from cl.runtime.records.cast_util import CastUtil
 from cl.runtime.records.key_mixin import KeyMixin
+from cl.runtime.records.protocols import is_enum_type
+from cl.runtime.records.protocols import is_key_type
+from cl.runtime.records.protocols import is_primitive_type
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.records.record_mixin import TRecord
+from cl.runtime.records.typename import typename
+from cl.runtime.schema.data_spec import DataSpec
+from cl.runtime.schema.type_hint import TypeHint
 from cl.runtime.schema.type_info import TypeInfo
+from cl.runtime.schema.type_kind import TypeKind
+from cl.runtime.schema.type_schema import TypeSchema
 from cl.runtime.server.env import Env
 from cl.runtime.settings.db_settings import DbSettings
 
+DEFAULT_BATCH_SIZE = 1000
+"""Default number of records fetched from the database in one round trip by the streaming methods."""
+
 
 @dataclass(slots=True, kw_only=True)
 class Db(DbKey, RecordMixin, ABC):
@@ -118,6 +132,90 @@ class Db(DbKey, RecordMixin, ABC):
             skip: Number of records to skip (for pagination)
         """
 
+    def iter_all(
+        self,
+        key_type: type[KeyMixin],
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
+        """
+        Iterate over all records for the specified key type, fetching and deserializing them in batches.
+        The default implementation delegates to load_all, override to stream the records natively.
+
+        Args:
+            key_type: Key type determines the database table
+            dataset: Backslash-delimited dataset argument is combined with self.base_dataset if specified
+            tenant: Unique tenant identifier, tenants are isolated when sharing the same DB
+            cast_to: Cast the result to this type (error if not a subtype)
+            restrict_to: Include only this type and its subtypes, skip other types
+            project_to: Use some or all fields from the stored record to create and return instances of this type
+            sort_order: Sort by key fields in the specified order, reversing for fields marked as DESC
+            limit: Maximum number of records to return (for pagination)
+            skip: Number of records to skip (for pagination)
+            batch_size: Number of records fetched from the database in one round trip
+        """
+        yield from self.load_all(
+            key_type,
+            dataset=dataset,
+            tenant=tenant,
+            cast_to=cast_to,
+            restrict_to=restrict_to,
+            project_to=project_to,
+            sort_order=sort_order,
+            limit=limit,
+            skip=skip,
+        )
+
+    def iter_by_query(
+        self,
+        query: QueryMixin,
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
+        """
+        Iterate over records that match the specified query, fetching and deserializing them in batches.
+        The default implementation delegates to load_by_query, override to stream the records natively.
+
+        Args:
+            query: Contains predicates to match
+            dataset: Backslash-delimited dataset argument is combined with self.base_dataset if specified
+            tenant: Unique tenant identifier, tenants are isolated when sharing the same DB
+            cast_to: Cast the result to this type (error if not a subtype)
+            restrict_to: Include only this type and its subtypes, skip other types
+            project_to: Use some or all fields from the stored record to create and return instances of this type
+            sort_order: Sort by query fields in the specified order, reversing for fields marked as DESC
+            limit: Maximum number of records to return (for pagination)
+            skip: Number of records to skip (for pagination)
+            batch_size: Number of records fetched from the database in one round trip
+        """
+        yield from self.load_by_query(
+            query,
+            dataset=dataset,
+            tenant=tenant,
+            cast_to=cast_to,
+            restrict_to=restrict_to,
+            project_to=project_to,
+            sort_order=sort_order,
+            limit=limit,
+            skip=skip,
+        )
+
     @abstractmethod
     def count_by_query(
         self,
@@ -137,6 +235,42 @@ class Db(DbKey, RecordMixin, ABC):
             restrict_to: Include only this type and its subtypes, skip other types
         """
 
+    def count_by_group(
+        self,
+        query: QueryMixin,
+        *,
+        group_by: Sequence[str],
+        dataset: str,
+        tenant: str,
+        restrict_to: type | None = None,
+    ) -> tuple[tuple[tuple, int], ...]:
+        """
+        Return (group_values, count) pairs for records that match the specified query, where group_values
+        is a tuple with the value of each group_by field. Only groups with nonzero count are returned,
+        in no particular order.
+
+        Notes:
+            - Group values are deserialized using field types of restrict_to or the query target type
+            - Only primitive, enum and key fields can be used for grouping
+            - This default implementation iterates over records, derived classes push grouping to the database
+
+        Args:
+            query: Contains predicates to match
+            group_by: Names of fields to group by
+            dataset: Backslash-delimited dataset argument is combined with self.base_dataset if specified
+            tenant: Unique tenant identifier, tenants are isolated when sharing the same DB
+            restrict_to: Include only this type and its subtypes, skip other types
+        """
+        self._get_group_by_type_hints(restrict_to or query.get_target_type(), tuple(group_by))
+        result: list[list] = []
+        for record in self.iter_by_query(query, dataset=dataset, tenant=tenant, restrict_to=restrict_to):
+            group_values = tuple(getattr(record, field_name, None) for field_name in group_by)
+            if (group := next((x for x in result if x[0] == group_values), None)) is not None:
+                group[1] += 1
+            else:
+                result.append([group_values, 1])
+        return tuple((group_values, count) for group_values, count in result)
+
     @abstractmethod
     def save_many(
         self,
@@ -277,6 +411,51 @@ class Db(DbKey, RecordMixin, ABC):
                 f"does not start from temporary DB prefix '{db_settings.db_temp_prefix}'."
             )
 
+    @classmethod
+    @cached
+    def _get_group_by_type_hints(cls, record_type: type, group_by: tuple[str, ...]) -> tuple[TypeHint, ...]:
+        """Get type hints for the group_by fields of record_type, error if a field is not found or not groupable."""
+        if not group_by:
+            raise RuntimeError("Parameter group_by must specify at least one field name.")
+        field_specs = {x.field_name: x for x in CastUtil.cast(DataSpec, TypeSchema.for_type(record_type)).fields}
+        result = []
+        for field_name in group_by:
+            if (field_spec := field_specs.get(field_name)) is None:
+                raise RuntimeError(
+                    f"Cannot group by field {field_name} because it is not found in {typename(record_type)}."
+                )
+            field_type_hint = field_spec.field_type_hint
+            field_type = field_type_hint.schema_type
+            if field_type_hint.remaining or not (
+                is_primitive_type(field_type) or is_enum_type(field_type) or is_key_type(field_type)
+            ):
+                raise RuntimeError(
+                    f"Cannot group by field {field_name} in {typename(record_type)} because\n"
+                    f"only primitive, enum and key fields can be used for grouping."
+                )
+            result.append(field_type_hint)
+        return tuple(result)
+
+    @classmethod
+    @cached
+    def _get_projected_field_names(cls, key_type: type[KeyMixin], project_to: type) -> tuple[str, ...]:
+        """
+        Get names of the fields loaded from the stored record to create instances of project_to,
+        error if a field is not present in any of the record types stored for key_type.
+        """
+        stored_field_names = set(
+            field_name
+            for record_type_name in TypeInfo.get_child_and_self_type_names(key_type, type_kind=TypeKind.RECORD)
+            for field_name in TypeInfo.from_type_name(record_type_name).get_field_names()
+        )
+        result = tuple(x.field_name for x in CastUtil.cast(DataSpec, TypeSchema.for_type(project_to)).fields)
+        if missing_fields := [x for x in result if x not in stored_field_names]:
+            raise RuntimeError(
+                f"Cannot project records with key type {typename(key_type)} to {typename(project_to)}\n"
+                f"because the following fields are not present in the stored records: {', '.join(missing_fields)}."
+            )
+        return result
+
     @classmethod
     def _check_dataset(cls, dataset: str) -> None:
         """Error if dataset is None, an empty string, or has invalid format."""
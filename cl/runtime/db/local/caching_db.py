@@ -0,0 +1,405 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from cl.runtime.db.db import DEFAULT_BATCH_SIZE
+from cl.runtime.db.db import Db
+from cl.runtime.db.db_key import DbKey
+from cl.runtime.db.query_mixin import QueryMixin
+from cl.runtime.db.save_policy import SavePolicy
+from cl.runtime.db.sort_order import SortOrder
+from cl.runtime.records.for_dataclasses.extensions import required
+from cl.runtime.records.key_mixin import KeyMixin
+from cl.runtime.records.protocols import is_key_type
+from cl.runtime.records.record_mixin import RecordMixin
+from cl.runtime.records.record_mixin import TRecord
+from cl.runtime.records.type_check import TypeCheck
+from cl.runtime.records.typename import typename
+from cl.runtime.serializers.key_serializers import KeySerializers
+
+_KEY_SERIALIZER = KeySerializers.TUPLE
+"""Serializer for keys used in cache lookup."""
+
+_SORT_KEY_SERIALIZER = KeySerializers.DELIMITED
+"""Serializer for keys used to sort cached records the same way as the backend sorts by the _key column."""
+
+
+@dataclass(slots=True, kw_only=True)
+class CachingDb(Db):
+    """
+    Read-through and write-through cache of deserialized records in front of another Db.
+
+    Notes:
+        - Records loaded by key are cached by (tenant, dataset, key type, serialized key) with LRU eviction
+        - Writes and deletions are forwarded to the backend and invalidate the affected cache entries
+        - Queries are forwarded to the backend without caching
+        - Changes made to the backend by other processes are not visible until the entry is evicted or invalidated
+    """
+
+    db: DbKey = required()
+    """Backend database, must be a Db instance rather than a key."""
+
+    max_size: int = 10000
+    """Maximum number of cached records, least recently used records are evicted when exceeded."""
+
+    _cache: OrderedDict[tuple, RecordMixin] | None = None
+    """Cached records in the order of use, indexed by (tenant, dataset, key type, serialized key)."""
+
+    _lock: Optional[Lock] = None
+    """Lock for cache access from multiple threads."""
+
+    _generations: dict[tuple, int] | None = None
+    """
+    Write generation indexed by cache key or by (tenant, dataset, key type) for delete_by_query, incremented
+    before and after each write so that records loaded by a concurrent read are not cached if the write
+    overlapped with the read (cleared when there are no reads in progress).
+    """
+
+    _read_count: int = 0
+    """Number of reads from the backend in progress."""
+
+    _hit_count: int = 0
+    """Number of keys found in cache."""
+
+    _miss_count: int = 0
+    """Number of keys not found in cache and requested from the backend."""
+
+    def __init(self) -> None:
+        """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
+        if is_key_type(type(self.db)):
+            raise RuntimeError(f"Field {typename(type(self))}.db must be a Db instance rather than a key.")
+        if self.db_id is None:
+            # Use the backend identifier if not specified
+            self.db_id = self.db.db_id
+        if self.max_size < 1:
+            raise RuntimeError(f"Field {typename(type(self))}.max_size={self.max_size} must be positive.")
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        self._generations = {}
+
+    def get_hit_count(self) -> int:
+        """Number of keys found in cache since creation or the last call to clear_cache."""
+        return self._hit_count
+
+    def get_miss_count(self) -> int:
+        """Number of keys requested from the backend since creation or the last call to clear_cache."""
+        return self._miss_count
+
+    def clear_cache(self) -> None:
+        """Remove all cached records and reset hit and miss counters."""
+        with self._lock:
+            self._cache.clear()
+            self._hit_count = 0
+            self._miss_count = 0
+
+    def load_many(
+        self,
+        key_type: type[KeyMixin],
+        keys: Sequence[KeyMixin],
+        *,
+        dataset: str,
+        tenant: str,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder,  # Default value not provided due to the lack of natural default for this method
+    ) -> tuple[RecordMixin, ...]:
+
+        # Check params
+        assert TypeCheck.guard_key_type(key_type)
+        assert TypeCheck.guard_key_sequence(keys)
+        self._check_dataset(dataset)
+        self._check_tenant(tenant)
+
+        # Projections are not cached
+        if project_to is not None:
+            return self.db.load_many(
+                key_type, keys, dataset=dataset, tenant=tenant, project_to=project_to, sort_order=sort_order
+            )
+
+        # Look up the keys in cache, moving the found records to the end of LRU order
+        cache_keys = [(tenant, dataset, key_type, _KEY_SERIALIZER.serialize(key)) for key in keys]
+        with self._lock:
+            found = {x: record for x in cache_keys if (record := self._cache.get(x)) is not None}
+            for cache_key in found:
+                self._cache.move_to_end(cache_key)
+            missing_keys = [key for key, cache_key in zip(keys, cache_keys) if cache_key not in found]
+            self._hit_count += len(keys) - len(missing_keys)
+            self._miss_count += len(missing_keys)
+            if missing_keys:
+                # Record write generations before the backend read to detect writes that overlap with the read
+                type_generation = self._generations.get((tenant, dataset, key_type), 0)
+                generations = {x: self._generations.get(x, 0) for x in cache_keys if x not in found}
+                self._read_count += 1
+
+        if missing_keys:
+            try:
+                # Load the missing records from the backend, build to freeze before caching
+                loaded_records = self.db.load_many(
+                    key_type,
+                    missing_keys,
+                    dataset=dataset,
+                    tenant=tenant,
+                    sort_order=SortOrder.UNORDERED,
+                )
+                loaded = {
+                    (tenant, dataset, key_type, _KEY_SERIALIZER.serialize(record.get_key())): record.build()
+                    for record in loaded_records
+                }
+                self._add_to_cache(loaded, generations=generations, type_generation=type_generation)
+            finally:
+                with self._lock:
+                    self._read_count -= 1
+                    if self._read_count == 0:
+                        # Generations are only compared during reads, clear to avoid unbounded growth
+                        self._generations.clear()
+            found.update(loaded)
+
+        # Keep the input order, skipping the records that are not found
+        result = [record for x in dict.fromkeys(cache_keys) if (record := found.get(x)) is not None]
+
+        # Sort by key the same way as the backend if requested
+        if sort_order in (SortOrder.ASC, SortOrder.DESC):
+            result.sort(key=lambda x: _SORT_KEY_SERIALIZER.serialize(x.get_key()), reverse=sort_order == SortOrder.DESC)
+        return tuple(result)
+
+    def load_all(
+        self,
+        key_type: type[KeyMixin],
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+    ) -> tuple[TRecord, ...]:
+        return self.db.load_all(
+            key_type,
+            dataset=dataset,
+            tenant=tenant,
+            cast_to=cast_to,
+            restrict_to=restrict_to,
+            project_to=project_to,
+            sort_order=sort_order,
+            limit=limit,
+            skip=skip,
+        )
+
+    def iter_all(
+        self,
+        key_type: type[KeyMixin],
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
+        return self.db.iter_all(
+            key_type,
+            dataset=dataset,
+            tenant=tenant,
+            cast_to=cast_to,
+            restrict_to=restrict_to,
+            project_to=project_to,
+            sort_order=sort_order,
+            limit=limit,
+            skip=skip,
+            batch_size=batch_size,
+        )
+
+    def load_by_query(
+        self,
+        query: QueryMixin,
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+    ) -> tuple[TRecord, ...]:
+        return self.db.load_by_query(
+            query,
+            dataset=dataset,
+            tenant=tenant,
+            cast_to=cast_to,
+            restrict_to=restrict_to,
+            project_to=project_to,
+            sort_order=sort_order,
+            limit=limit,
+            skip=skip,
+        )
+
+    def iter_by_query(
+        self,
+        query: QueryMixin,
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
+        return self.db.iter_by_query(
+            query,
+            dataset=dataset,
+            tenant=tenant,
+            cast_to=cast_to,
+            restrict_to=restrict_to,
+            project_to=project_to,
+            sort_order=sort_order,
+            limit=limit,
+            skip=skip,
+            batch_size=batch_size,
+        )
+
+    def count_by_query(
+        self,
+        query: QueryMixin,
+        *,
+        dataset: str,
+        tenant: str,
+        restrict_to: type | None = None,
+    ) -> int:
+        return self.db.count_by_query(query, dataset=dataset, tenant=tenant, restrict_to=restrict_to)
+
+    def count_by_group(
+        self,
+        query: QueryMixin,
+        *,
+        group_by: Sequence[str],
+        dataset: str,
+        tenant: str,
+        restrict_to: type | None = None,
+    ) -> tuple[tuple[tuple, int], ...]:
+        return self.db.count_by_group(query, group_by=group_by, dataset=dataset, tenant=tenant, restrict_to=restrict_to)
+
+    def save_many(
+        self,
+        key_type: type[KeyMixin],
+        records: Sequence[RecordMixin],
+        *,
+        dataset: str,
+        tenant: str,
+        save_policy: SavePolicy,
+    ) -> None:
+        # Invalidate before and after the write, a concurrent read does not cache the old record because
+        # the write generation for its key changes between the start and the end of the read
+        cache_keys = [(tenant, dataset, key_type, _KEY_SERIALIZER.serialize(x.get_key())) for x in records]
+        self._remove_from_cache(cache_keys)
+        try:
+            self.db.save_many(key_type, records, dataset=dataset, tenant=tenant, save_policy=save_policy)
+        finally:
+            self._remove_from_cache(cache_keys)
+
+    def delete_many(
+        self,
+        key_type: type[KeyMixin],
+        keys: Sequence[KeyMixin],
+        *,
+        dataset: str,
+        tenant: str,
+    ) -> None:
+        cache_keys = [(tenant, dataset, key_type, _KEY_SERIALIZER.serialize(x)) for x in keys]
+        self._remove_from_cache(cache_keys)
+        try:
+            self.db.delete_many(key_type, keys, dataset=dataset, tenant=tenant)
+        finally:
+            self._remove_from_cache(cache_keys)
+
+    def delete_by_query(
+        self,
+        query: QueryMixin,
+        *,
+        dataset: str,
+        tenant: str,
+        restrict_to: type | None = None,
+    ) -> None:
+        # The keys of deleted records are not known, invalidate all records of the query key type
+        key_type = query.get_target_type().get_key_type()
+        self._remove_key_type_from_cache((tenant, dataset, key_type))
+        try:
+            self.db.delete_by_query(query, dataset=dataset, tenant=tenant, restrict_to=restrict_to)
+        finally:
+            self._remove_key_type_from_cache((tenant, dataset, key_type))
+
+    def drop_test_db(self) -> None:
+        self.clear_cache()
+        self.db.drop_test_db()
+
+    def drop_temp_db(self, *, user_approval: bool) -> None:
+        self.clear_cache()
+        self.db.drop_temp_db(user_approval=user_approval)
+
+    def close_connection(self) -> None:
+        self.db.close_connection()
+
+    def _add_to_cache(
+        self,
+        records: dict[tuple, RecordMixin],
+        *,
+        generations: dict[tuple, int],
+        type_generation: int,
+    ) -> None:
+        """
+        Add records to cache, evicting the least recently used records if max_size is exceeded.
+
+        Args:
+            records: Records indexed by cache key
+            generations: Write generations of the cache keys recorded before the backend read
+            type_generation: Write generation of (tenant, dataset, key type) recorded before the backend read
+        """
+        with self._lock:
+            for cache_key, record in records.items():
+                # Skip the record if a write to the same key or a delete by query overlapped with the read
+                if (
+                    self._generations.get(cache_key, 0) == generations.get(cache_key, 0)
+                    and self._generations.get(cache_key[:3], 0) == type_generation
+                ):
+                    self._cache[cache_key] = record
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def _remove_from_cache(self, cache_keys: Sequence[tuple]) -> None:
+        """Remove the specified entries from cache if present and increment their write generation."""
+        with self._lock:
+            for cache_key in cache_keys:
+                self._cache.pop(cache_key, None)
+                if self._read_count > 0:
+                    self._generations[cache_key] = self._generations.get(cache_key, 0) + 1
+
+    def _remove_key_type_from_cache(self, type_key: tuple) -> None:
+        """Remove entries for (tenant, dataset, key type) from cache and increment its write generation."""
+        with self._lock:
+            for cache_key in [x for x in self._cache if x[:3] == type_key]:
+                del self._cache[cache_key]
+            if self._read_count > 0:
+                self._generations[type_key] = self._generations.get(type_key, 0) + 1
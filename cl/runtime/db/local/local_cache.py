@@ -12,32 +12,94 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+
+import datetime as dt
+import operator
+from bisect import bisect_left
+from bisect import bisect_right
+from bisect import insort
 from dataclasses import dataclass
+from dataclasses import field
+from enum import Enum
+from itertools import islice
+from threading import RLock
+from typing import Any
+from typing import Callable
+from typing import Iterable
 from typing import Sequence
+from uuid import UUID
 from cl.runtime.db.db import Db
 from cl.runtime.db.query_mixin import QueryMixin
 from cl.runtime.db.save_policy import SavePolicy
 from cl.runtime.db.sort_order import SortOrder
-from cl.runtime.records.for_dataclasses.extensions import required
+from cl.runtime.exceptions.error_util import ErrorUtil
+from cl.runtime.records.cast_util import CastUtil
 from cl.runtime.records.key_mixin import KeyMixin
+from cl.runtime.records.predicates import And
+from cl.runtime.records.predicates import Exists
+from cl.runtime.records.predicates import In
+from cl.runtime.records.predicates import Not
+from cl.runtime.records.predicates import NotIn
+from cl.runtime.records.predicates import Or
+from cl.runtime.records.predicates import Predicate
+from cl.runtime.records.protocols import is_key_type
+from cl.runtime.records.protocols import is_record_type
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.records.record_mixin import TRecord
 from cl.runtime.records.type_check import TypeCheck
+from cl.runtime.records.typename import typename
+from cl.runtime.records.typename import typenameof
 from cl.runtime.serializers.key_serializers import KeySerializers
 
-_KEY_SERIALIZER = KeySerializers.TUPLE
-"""Serializer for keys used in cache lookup."""
+_KEY_SERIALIZER = KeySerializers.DELIMITED
+"""Serializer for keys used in cache lookup, sorting by key matches sorting by the _key column in other backends."""
+
+_RANGE_OPERATORS = (
+    ("op_gt", operator.gt),
+    ("op_gte", operator.ge),
+    ("op_lt", operator.lt),
+    ("op_lte", operator.le),
+)
+"""Attribute names of range predicate bounds and the matching comparison operators."""
+
+_PRIMITIVE_CLASSES = (str, int, float, dt.date, dt.time, UUID, bytes, Enum)
+"""Classes of field values that are compared without conversion, checked first for performance."""
+
+_TABLES_DICT: dict[str, dict[tuple[str, str, type], "_LocalTable"]] = {}
+"""Tables for each db_id indexed by (tenant, dataset, key type), shared by LocalCache instances with the same db_id."""
+
+_TABLES_LOCK = RLock()
+"""Lock for access to the tables from multiple threads."""
+
+
+@dataclass(slots=True)
+class _LocalTable:
+    """Records with the same tenant, dataset and key type and the indexes for them."""
+
+    records: dict[str, RecordMixin] = field(default_factory=dict)
+    """Record instances indexed by serialized key in the order of insertion."""
+
+    sorted_keys: list[str] | None = None
+    """Serialized keys in ascending order, created on demand."""
+
+    hash_indexes: dict[tuple[str, ...], dict[tuple, set[str]]] = field(default_factory=dict)
+    """Serialized keys indexed by the values of the fields used in equality conditions, updated on write."""
 
-_local_cache_instance = None
-"""Singleton instance is created on first access."""
+    sorted_indexes: dict[str, tuple[list, list[str]]] = field(default_factory=dict)
+    """Sorted field values and matching serialized keys for range conditions, created on demand and reset on write."""
 
 
 @dataclass(slots=True, kw_only=True)
 class LocalCache(Db):
-    """In-memory cache for objects without serialization."""
+    """
+    In-memory database for record instances without serialization.
 
-    __cache: dict[type[KeyMixin], dict[tuple, RecordMixin]] = required(default_factory=lambda: {})
-    """Record instance is stored in cache without serialization."""
+    Notes:
+        - Records are stored by reference, loading returns the same frozen instance that was saved
+        - Instances with the same db_id share the same records within the process
+        - Query conditions are evaluated over the record fields, hash indexes for equality conditions
+          and sorted indexes for range conditions are added on the first query for the fields set in the query
+    """
 
     def load_many(
         self,
@@ -56,17 +118,18 @@ class LocalCache(Db):
         self._check_dataset(dataset)
         self._check_tenant(tenant)
 
-        if (table_cache := self.__cache.get(key_type, None)) is not None:
-            result = []
-            for key in keys:
-                # Look up the record, defaults to None
-                serialized_key = _KEY_SERIALIZER.serialize(key)  # Use hash instead?
-                record = table_cache.get(serialized_key, None)
-                result.append(record)
-            return result
-        else:
-            # Tables are created on demand, table not found means no records with this key type are stored
-            return []
+        with _TABLES_LOCK:
+            if (table := self._get_table(key_type, dataset=dataset, tenant=tenant, create=False)) is None:
+                # Tables are created on demand, table not found means no records with this key type are stored
+                return tuple()
+
+            # Keep the input order, skipping duplicate keys and the records that are not found
+            serialized_keys = [x for x in dict.fromkeys(_KEY_SERIALIZER.serialize(key) for key in keys)]
+            if sort_order in (SortOrder.ASC, SortOrder.DESC):
+                serialized_keys.sort(reverse=sort_order == SortOrder.DESC)
+            records = [record for x in serialized_keys if (record := table.records.get(x)) is not None]
+
+        return tuple(self._project_records(key_type, records, project_to=project_to))
 
     def load_all(
         self,
@@ -81,7 +144,20 @@ class LocalCache(Db):
         limit: int | None = None,
         skip: int | None = None,
     ) -> tuple[TRecord, ...]:
-        raise NotImplementedError()
+
+        # Check params
+        assert TypeCheck.guard_key_type(key_type)
+        self._check_dataset(dataset)
+        self._check_tenant(tenant)
+
+        with _TABLES_LOCK:
+            if (table := self._get_table(key_type, dataset=dataset, tenant=tenant, create=False)) is None:
+                return tuple()
+            records = self._select_records(
+                table, sort_order=sort_order, restrict_to=restrict_to, limit=limit, skip=skip
+            )
+
+        return tuple(self._project_records(key_type, records, project_to=project_to))
 
     def load_by_query(
         self,
@@ -96,7 +172,25 @@ class LocalCache(Db):
         limit: int | None = None,
         skip: int | None = None,
     ) -> tuple[TRecord, ...]:
-        raise NotImplementedError()
+
+        # Check params
+        self._check_dataset(dataset)
+        self._check_tenant(tenant)
+
+        key_type = query.get_target_type().get_key_type()
+        restrict_to = self._get_query_restrict_to(query, restrict_to=restrict_to)
+        with _TABLES_LOCK:
+            if (table := self._get_table(key_type, dataset=dataset, tenant=tenant, create=False)) is None:
+                return tuple()
+            records = self._select_records(
+                table, query=query, sort_order=sort_order, restrict_to=restrict_to, limit=limit, skip=skip
+            )
+
+        if project_to is not None:
+            return tuple(self._project_records(key_type, records, project_to=project_to))
+        else:
+            # Set cast_to to restrict_to if not specified and apply cast (error if not a subtype)
+            return tuple(CastUtil.cast(cast_to or restrict_to, x) for x in records)
 
     def count_by_query(
         self,
@@ -106,7 +200,19 @@ class LocalCache(Db):
         tenant: str,
         restrict_to: type | None = None,
     ) -> int:
-        raise NotImplementedError()
+
+        # Check params
+        self._check_dataset(dataset)
+        self._check_tenant(tenant)
+
+        key_type = query.get_target_type().get_key_type()
+        restrict_to = self._get_query_restrict_to(query, restrict_to=restrict_to)
+        with _TABLES_LOCK:
+            if (table := self._get_table(key_type, dataset=dataset, tenant=tenant, create=False)) is None:
+                return 0
+            return len(
+                self._select_records(table, query=query, sort_order=SortOrder.UNORDERED, restrict_to=restrict_to)
+            )
 
     def save_many(
         self,
@@ -124,25 +230,33 @@ class LocalCache(Db):
         self._check_dataset(dataset)
         self._check_tenant(tenant)
 
-        # TODO: Provide a more performant implementation
-        for record in records:
-            # Try to retrieve table dictionary, insert if it does not yet exist
-            table_cache = self.__cache.setdefault(key_type, {})
-
-            # Serialize both key and record
-            key = record.get_key()
-            serialized_key = _KEY_SERIALIZER.serialize(key)
+        serialized_keys = [_KEY_SERIALIZER.serialize(record.get_key()) for record in records]
+        with _TABLES_LOCK:
+            table = self._get_table(key_type, dataset=dataset, tenant=tenant, create=True)
 
             if save_policy == SavePolicy.INSERT:
-                # Insert the record, error if already exists
-                if serialized_key in table_cache:
-                    raise RuntimeError(f"Key {serialized_key} already exists in cache while INSERT policy is selected.")
-                table_cache[serialized_key] = record
-            elif save_policy == SavePolicy.REPLACE:
-                # Add record to cache, overwriting an existing record if present
-                table_cache[serialized_key] = record
-            else:
-                ErrorUtil.enum_value_error(save_policy, SavePolicy)
+                # Check all keys before saving so that no records are saved on error
+                if existing_keys := [x for x in dict.fromkeys(serialized_keys) if x in table.records]:
+                    raise RuntimeError(
+                        f"Records with the following keys already exist while INSERT policy is selected:\n"
+                        f"{', '.join(existing_keys)}"
+                    )
+                if len(set(serialized_keys)) != len(serialized_keys):
+                    raise RuntimeError(
+                        "Records passed to save_many have duplicate keys while INSERT policy is selected."
+                    )
+            elif save_policy != SavePolicy.REPLACE:
+                raise ErrorUtil.enum_value_error(save_policy, SavePolicy)
+
+            # Range indexes are recreated on the next query
+            table.sorted_indexes.clear()
+            for serialized_key, record in zip(serialized_keys, records):
+                if (existing_record := table.records.get(serialized_key)) is not None:
+                    self._update_hash_indexes(table, serialized_key, existing_record, add=False)
+                elif table.sorted_keys is not None:
+                    insort(table.sorted_keys, serialized_key)
+                table.records[serialized_key] = record
+                self._update_hash_indexes(table, serialized_key, record, add=True)
 
     def delete_many(
         self,
@@ -152,7 +266,16 @@ class LocalCache(Db):
         dataset: str,
         tenant: str,
     ) -> None:
-        raise NotImplementedError()
+
+        # Check params
+        assert TypeCheck.guard_key_type(key_type)
+        assert TypeCheck.guard_key_sequence(keys)
+        self._check_dataset(dataset)
+        self._check_tenant(tenant)
+
+        with _TABLES_LOCK:
+            if (table := self._get_table(key_type, dataset=dataset, tenant=tenant, create=False)) is not None:
+                self._delete_serialized_keys(table, (_KEY_SERIALIZER.serialize(key) for key in keys))
 
     def delete_by_query(
         self,
@@ -162,25 +285,288 @@ class LocalCache(Db):
         tenant: str,
         restrict_to: type | None = None,
     ) -> None:
-        raise NotImplementedError()
+
+        # Check params
+        self._check_dataset(dataset)
+        self._check_tenant(tenant)
+
+        key_type = query.get_target_type().get_key_type()
+        restrict_to = self._get_query_restrict_to(query, restrict_to=restrict_to)
+        with _TABLES_LOCK:
+            if (table := self._get_table(key_type, dataset=dataset, tenant=tenant, create=False)) is not None:
+                records = self._select_records(
+                    table, query=query, sort_order=SortOrder.UNORDERED, restrict_to=restrict_to
+                )
+                self._delete_serialized_keys(table, [_KEY_SERIALIZER.serialize(x.get_key()) for x in records])
 
     def drop_test_db(self) -> None:
         # Check preconditions
         self.check_drop_test_db_preconditions()
 
-        # Create a new cache, the objects in the old cache will no longer be accessible.
+        # Remove the tables for db_id, the records will no longer be accessible.
         # This relies on the preconditions check above to prevent unintended use
-        __cache = {}
+        with _TABLES_LOCK:
+            _TABLES_DICT.pop(self.db_id, None)
 
     def drop_temp_db(self, *, user_approval: bool) -> None:
         # Check preconditions
         self.check_drop_temp_db_preconditions(user_approval=user_approval)
 
-        # Create a new cache, the objects in the old cache will no longer be accessible.
+        # Remove the tables for db_id, the records will no longer be accessible.
         # This relies on the preconditions check above to prevent unintended use
-        __cache = {}
+        with _TABLES_LOCK:
+            _TABLES_DICT.pop(self.db_id, None)
 
     def close_connection(self) -> None:
         """Close database connection to releasing resource locks."""
-        # TODO: Review if this should be in __exit__ method
         # Do nothing here, as this is an in-memory cache which does not require a connection
+
+    def _get_table(self, key_type: type[KeyMixin], *, dataset: str, tenant: str, create: bool) -> _LocalTable | None:
+        """Get table for the arguments, create if it does not exist and create is True or return None otherwise."""
+        tables = _TABLES_DICT.get(self.db_id) if not create else _TABLES_DICT.setdefault(self.db_id, {})
+        if tables is None:
+            return None
+        elif create:
+            return tables.setdefault((tenant, dataset, key_type), _LocalTable())
+        else:
+            return tables.get((tenant, dataset, key_type))
+
+    def _get_query_restrict_to(self, query: QueryMixin, *, restrict_to: type | None) -> type:
+        """Validate restrict_to or use the query target type if not specified."""
+        query_target_type = query.get_target_type()
+        if restrict_to is None:
+            # Default to the query target type
+            return query_target_type
+        elif not issubclass(restrict_to, query_target_type):
+            # Ensure restrict_to is a subclass of the query target type
+            raise RuntimeError(
+                f"In {typename(type(self))}, restrict_to={typename(restrict_to)} is not a subclass\n"
+                f"of the target type {typename(query_target_type)} for {typenameof(query)}."
+            )
+        else:
+            return restrict_to
+
+    @classmethod
+    def _select_records(
+        cls,
+        table: _LocalTable,
+        *,
+        query: QueryMixin | None = None,
+        sort_order: SortOrder,
+        restrict_to: type | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+    ) -> list[RecordMixin]:
+        """Select records from the table that match the query and restrict_to, sorted by key."""
+
+        # Get the conditions for the fields set in the query
+        conditions = {}
+        if query is not None:
+            field_values = ((x, getattr(query, x, None)) for x in query.get_field_names())
+            conditions = {name: value for name, value in field_values if value is not None}
+
+        # Use an index to select candidate keys if possible, otherwise check all records
+        candidate_keys = cls._get_indexed_keys(table, conditions)
+        if sort_order in (SortOrder.ASC, SortOrder.DESC):
+            if candidate_keys is None:
+                if table.sorted_keys is None:
+                    table.sorted_keys = sorted(table.records)
+                candidate_keys = table.sorted_keys
+            else:
+                candidate_keys = sorted(candidate_keys)
+            if sort_order == SortOrder.DESC:
+                candidate_keys = reversed(candidate_keys)
+        elif sort_order not in (SortOrder.UNORDERED, SortOrder.INPUT):
+            raise ErrorUtil.enum_value_error(sort_order, SortOrder)
+        elif candidate_keys is None:
+            candidate_keys = table.records
+
+        matchers = [(name, cls._get_matcher(value)) for name, value in conditions.items()]
+        records = (
+            record
+            for x in candidate_keys
+            if (record := table.records[x]) is not None
+            and (restrict_to is None or isinstance(record, restrict_to))
+            and all(matcher(cls._normalize(getattr(record, name, None))) for name, matcher in matchers)
+        )
+
+        # Apply skip and limit after all other conditions
+        start = skip or 0
+        return list(islice(records, start, start + limit if limit is not None else None))
+
+    @classmethod
+    def _get_indexed_keys(cls, table: _LocalTable, conditions: dict[str, Any]) -> Iterable[str] | None:
+        """Use hash or sorted indexes to get keys that may match the conditions, or None if no index applies."""
+
+        # Fields that must be equal to the value in the query, use the hash index for all of them
+        equality_conditions = {k: v for k, v in conditions.items() if not isinstance(v, Predicate)}
+        if equality_conditions:
+            field_names = tuple(equality_conditions)
+            if (hash_index := cls._get_hash_index(table, field_names)) is not None:
+                index_key = tuple(cls._normalize(x) for x in equality_conditions.values())
+                try:
+                    return hash_index.get(index_key, ())
+                except TypeError:
+                    # Unhashable value in the query
+                    return None
+
+        # Union of hash index lookups for a field with In condition
+        if (field_name := next((k for k, v in conditions.items() if isinstance(v, In)), None)) is not None:
+            if (hash_index := cls._get_hash_index(table, (field_name,))) is not None:
+                try:
+                    return set().union(
+                        *(hash_index.get((cls._normalize(x),), ()) for x in conditions[field_name].op_in)
+                    )
+                except TypeError:
+                    return None
+
+        # Slice of the sorted index for a field with range condition
+        for field_name, condition in conditions.items():
+            bounds = [(x, getattr(condition, x, None)) for x, _ in _RANGE_OPERATORS]
+            bounds = [(x, cls._normalize(y)) for x, y in bounds if y is not None]
+            if bounds and (sorted_index := cls._get_sorted_index(table, field_name)) is not None:
+                values, keys = sorted_index
+                start, end = 0, len(values)
+                try:
+                    for op_name, value in bounds:
+                        if op_name == "op_gt":
+                            start = max(start, bisect_right(values, value))
+                        elif op_name == "op_gte":
+                            start = max(start, bisect_left(values, value))
+                        elif op_name == "op_lt":
+                            end = min(end, bisect_left(values, value))
+                        else:
+                            end = min(end, bisect_right(values, value))
+                except TypeError:
+                    # Value in the query is not comparable with the stored values
+                    continue
+                return keys[start:end]
+
+        return None
+
+    @classmethod
+    def _get_hash_index(cls, table: _LocalTable, field_names: tuple[str, ...]) -> dict[tuple, set[str]] | None:
+        """Get or create hash index for the specified fields, return None if field values are not hashable."""
+        if (result := table.hash_indexes.get(field_names)) is None:
+            result = {}
+            try:
+                for serialized_key, record in table.records.items():
+                    index_key = tuple(cls._normalize(getattr(record, x, None)) for x in field_names)
+                    result.setdefault(index_key, set()).add(serialized_key)
+            except TypeError:
+                # Field values are not hashable, do not use index for these fields
+                return None
+            table.hash_indexes[field_names] = result
+        return result
+
+    @classmethod
+    def _get_sorted_index(cls, table: _LocalTable, field_name: str) -> tuple[list, list[str]] | None:
+        """Get or create sorted index for the specified field, return None if field values are not comparable."""
+        if (result := table.sorted_indexes.get(field_name)) is None:
+            # Records where the field is not set never match a range condition and are excluded
+            field_values = (
+                (cls._normalize(getattr(record, field_name, None)), x) for x, record in table.records.items()
+            )
+            try:
+                items = sorted((value, x) for value, x in field_values if value is not None)
+            except TypeError:
+                # Field values are not comparable, do not use index for this field
+                return None
+            result = ([value for value, _ in items], [x for _, x in items])
+            table.sorted_indexes[field_name] = result
+        return result
+
+    @classmethod
+    def _update_hash_indexes(cls, table: _LocalTable, serialized_key: str, record: RecordMixin, *, add: bool) -> None:
+        """Add or remove the record to or from all hash indexes of the table."""
+        for field_names, hash_index in tuple(table.hash_indexes.items()):
+            try:
+                index_key = tuple(cls._normalize(getattr(record, x, None)) for x in field_names)
+                if add:
+                    hash_index.setdefault(index_key, set()).add(serialized_key)
+                elif (index_keys := hash_index.get(index_key)) is not None:
+                    index_keys.discard(serialized_key)
+                    if not index_keys:
+                        del hash_index[index_key]
+            except TypeError:
+                # Field values are not hashable, stop using index for these fields
+                del table.hash_indexes[field_names]
+
+    @classmethod
+    def _delete_serialized_keys(cls, table: _LocalTable, serialized_keys: Iterable[str]) -> None:
+        """Delete records with the specified serialized keys from the table if they exist."""
+        table.sorted_indexes.clear()
+        for serialized_key in serialized_keys:
+            if (record := table.records.pop(serialized_key, None)) is not None:
+                if (sorted_keys := table.sorted_keys) is not None:
+                    del sorted_keys[bisect_left(sorted_keys, serialized_key)]
+                cls._update_hash_indexes(table, serialized_key, record, add=False)
+
+    @classmethod
+    def _project_records(
+        cls, key_type: type[KeyMixin], records: Iterable[RecordMixin], *, project_to: type | None
+    ) -> Iterable[RecordMixin]:
+        """Create instances of project_to from the field values of each record, or return records if None."""
+        if project_to is None:
+            return records
+        field_names = cls._get_projected_field_names(key_type, project_to)
+        return (
+            project_to(
+                **{name: value for name in field_names if (value := getattr(record, name, None)) is not None}
+            ).build()
+            for record in records
+        )
+
+    @classmethod
+    def _get_matcher(cls, condition: Any) -> Callable[[Any], bool]:
+        """Get a function that checks if a normalized field value matches the query condition."""
+        if isinstance(condition, Predicate):
+            if isinstance(condition, And):
+                matchers = [cls._get_matcher(x) for x in condition.op_and]
+                return lambda x: all(matcher(x) for matcher in matchers)
+            elif isinstance(condition, Or):
+                matchers = [cls._get_matcher(x) for x in condition.op_or]
+                return lambda x: any(matcher(x) for matcher in matchers)
+            elif isinstance(condition, Not):
+                matcher = cls._get_matcher(condition.op_not)
+                return lambda x: not matcher(x)
+            elif isinstance(condition, Exists):
+                return lambda x: (x is not None) == bool(condition.op_exists)
+            elif isinstance(condition, In):
+                values = tuple(cls._normalize(x) for x in condition.op_in)
+                return lambda x: x is not None and x in values
+            elif isinstance(condition, NotIn):
+                values = tuple(cls._normalize(x) for x in condition.op_nin)
+                return lambda x: x is not None and x not in values
+            elif bounds := [
+                (op, cls._normalize(value))
+                for op_name, op in _RANGE_OPERATORS
+                if (value := getattr(condition, op_name, None)) is not None
+            ]:
+                return lambda x: x is not None and all(cls._compare(op, x, value) for op, value in bounds)
+            else:
+                raise RuntimeError(f"Predicate {typenameof(condition)} is not supported by {typename(cls)}.")
+        else:
+            value = cls._normalize(condition)
+            return lambda x: x == value
+
+    @classmethod
+    def _compare(cls, op: Callable[[Any, Any], bool], lhs: Any, rhs: Any) -> bool:
+        """Apply comparison operator, values of types that cannot be compared do not match."""
+        try:
+            return op(lhs, rhs)
+        except TypeError:
+            return False
+
+    @classmethod
+    def _normalize(cls, value: Any) -> Any:
+        """Convert keys and records in key fields to serialized keys for comparison, return other values unchanged."""
+        if value is None or isinstance(value, _PRIMITIVE_CLASSES):
+            return value
+        value_type = type(value)
+        if is_key_type(value_type):
+            return _KEY_SERIALIZER.serialize(value)
+        elif is_record_type(value_type):
+            return _KEY_SERIALIZER.serialize(value.get_key())
+        else:
+            return value
@@ -16,13 +16,18 @@ import re
 from dataclasses import dataclass
 from typing import Any
 from typing import Iterable
+from typing import Iterator
 from typing import Sequence
 from typing import cast
 import pymongo
+from pymongo import InsertOne
 from pymongo import MongoClient
+from pymongo import ReplaceOne
 from pymongo.database import Database
+from pymongo.errors import BulkWriteError
 from pymongo.synchronous.collection import Collection
 from pymongo.synchronous.cursor import Cursor
+from cl.runtime.db.db import DEFAULT_BATCH_SIZE
 from cl.runtime.db.db import Db
 from cl.runtime.db.query_mixin import QueryMixin
 from cl.runtime.db.save_policy import SavePolicy
@@ -65,6 +70,9 @@ _KEY_SERIALIZER = KeySerializers.DELIMITED
 """Used for key serialization."""
 
 # TODO (Roman): Clean up open connections on worker shutdown
+_MAX_REPORTED_KEYS = 10
+"""Maximum number of failed keys per batch included in the error message by save_many."""
+
 _mongo_client_dict: dict[tuple[type, str | None], MongoClient] = {}
 """Mongo client dict for caching and reusing Mongo connection."""
 
@@ -76,6 +84,12 @@ class BasicMongoDb(Db):
     client_uri: str | None = None
     """MongoDB client URI, defaults to mongodb://localhost:27017/"""
 
+    save_batch_size: int = DEFAULT_BATCH_SIZE
+    """Maximum number of records sent to MongoDB in one bulk write by save_many."""
+
+    save_ordered: bool = True
+    """If true, save_many stops at the first failed record, otherwise it attempts to save all other records."""
+
     _mongo_client: MongoClient | None = None
     """MongoDB client instance, initialized once and stored."""
 
@@ -98,6 +112,9 @@ class BasicMongoDb(Db):
         if self.client_uri is None:
             self.client_uri = db_settings.db_mongo_uri
 
+        if self.save_batch_size < 1:
+            raise RuntimeError(f"Field {typename(type(self))}.save_batch_size={self.save_batch_size} must be positive.")
+
     def load_many(
         self,
         key_type: type[KeyMixin],
@@ -118,15 +135,18 @@ class BasicMongoDb(Db):
         # Get MongoDB collection for the key type
         collection = self._get_mongo_collection(key_type=key_type)
 
-        # Query for all records in one call using $in operator
-        serialized_records = collection.find(self._get_mongo_keys_filter(keys, dataset=dataset, tenant=tenant))
+        # Query for all records in one call using $in operator, loading only the fields of project_to if specified
+        serialized_records = collection.find(
+            self._get_mongo_keys_filter(keys, dataset=dataset, tenant=tenant),
+            self._get_projection(key_type, project_to),
+        )
 
         # Apply sort to the iterable
         serialized_records = self._apply_sort(serialized_records, sort_field="_key", sort_order=sort_order)
 
         # Prune the fields used by Db that are not part of the serialized record data and deserialize
         result = tuple(
-            _RECORD_SERIALIZER.deserialize(self._with_pruned_fields(x, expected_dataset=dataset))
+            _RECORD_SERIALIZER.deserialize(self._with_pruned_fields(x, expected_dataset=dataset, project_to=project_to))
             for x in serialized_records
         )
         return cast(tuple[TRecord, ...], result)
@@ -144,6 +164,34 @@ class BasicMongoDb(Db):
         limit: int | None = None,
         skip: int | None = None,
     ) -> tuple[TRecord, ...]:
+        return tuple(
+            self.iter_all(
+                key_type,
+                dataset=dataset,
+                tenant=tenant,
+                cast_to=cast_to,
+                restrict_to=restrict_to,
+                project_to=project_to,
+                sort_order=sort_order,
+                limit=limit,
+                skip=skip,
+            )
+        )
+
+    def iter_all(
+        self,
+        key_type: type[KeyMixin],
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
 
         # Check params
         assert TypeCheck.guard_key_type(key_type)
@@ -166,8 +214,8 @@ class BasicMongoDb(Db):
         # serialized_primary_key = _KEY_SERIALIZER.serialize(key)
         # serialized_record = collection.find_one({"_key": serialized_primary_key})
 
-        # Get iterable from the query, execution is deferred
-        serialized_records = collection.find(query_dict)
+        # Get iterable from the query, execution is deferred, load only the fields of project_to if specified
+        serialized_records = collection.find(query_dict, self._get_projection(key_type, project_to))
 
         # Apply sort to the iterable
         serialized_records = self._apply_sort(serialized_records, sort_field="_key", sort_order=sort_order)
@@ -176,11 +224,9 @@ class BasicMongoDb(Db):
         serialized_records = self._apply_limit_and_skip(serialized_records, limit=limit, skip=skip)
 
         # Prune the fields used by Db that are not part of the serialized record data and deserialize
-        result = tuple(
-            _RECORD_SERIALIZER.deserialize(self._with_pruned_fields(x, expected_dataset=dataset))
-            for x in serialized_records
+        yield from self._iter_deserialized(
+            serialized_records, expected_dataset=dataset, project_to=project_to, batch_size=batch_size
         )
-        return cast(tuple[TRecord, ...], result)
 
     def load_by_query(
         self,
@@ -195,6 +241,34 @@ class BasicMongoDb(Db):
         limit: int | None = None,
         skip: int | None = None,
     ) -> tuple[TRecord, ...]:
+        return tuple(
+            self.iter_by_query(
+                query,
+                dataset=dataset,
+                tenant=tenant,
+                cast_to=cast_to,
+                restrict_to=restrict_to,
+                project_to=project_to,
+                sort_order=sort_order,
+                limit=limit,
+                skip=skip,
+            )
+        )
+
+    def iter_by_query(
+        self,
+        query: QueryMixin,
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
 
         # Check that the query has been frozen
         query.check_frozen()
@@ -240,8 +314,8 @@ class BasicMongoDb(Db):
         # Filter by restrict_to if specified
         self._apply_restrict_to(query_dict=query_dict, key_type=key_type, restrict_to=restrict_to)
 
-        # Get iterable from the query, execution is deferred
-        serialized_records = collection.find(query_dict)
+        # Get iterable from the query, execution is deferred, load only the fields of project_to if specified
+        serialized_records = collection.find(query_dict, self._get_projection(key_type, project_to))
 
         # Apply sort to the iterable
         serialized_records = self._apply_sort(serialized_records, sort_field="_key", sort_order=sort_order)
@@ -254,11 +328,9 @@ class BasicMongoDb(Db):
             cast_to = restrict_to
 
         # Prune the fields used by Db that are not part of the serialized record data and deserialize
-        result = tuple(
-            _RECORD_SERIALIZER.deserialize(self._with_pruned_fields(x, expected_dataset=dataset))
-            for x in serialized_records
+        yield from self._iter_deserialized(
+            serialized_records, expected_dataset=dataset, project_to=project_to, batch_size=batch_size
         )
-        return cast(tuple[TRecord, ...], result)
 
     def count_by_query(
         self,
@@ -317,6 +389,81 @@ class BasicMongoDb(Db):
         count = collection.count_documents(query_dict)
         return count
 
+    def count_by_group(
+        self,
+        query: QueryMixin,
+        *,
+        group_by: Sequence[str],
+        dataset: str,
+        tenant: str,
+        restrict_to: type | None = None,
+    ) -> tuple[tuple[tuple, int], ...]:
+
+        # Check that the query has been frozen
+        query.check_frozen()
+
+        # Check dataset
+        self._check_dataset(dataset)
+        self._check_tenant(tenant)
+
+        # Get type hints for deserializing group values, this also validates group_by
+        group_by = tuple(group_by)
+        query_target_type = query.get_target_type()
+        group_by_type_hints = self._get_group_by_type_hints(restrict_to or query_target_type, group_by)
+
+        # Get MongoDB collection for the key type
+        key_type = query_target_type.get_key_type()
+        collection = self._get_mongo_collection(key_type=key_type)
+
+        # Add index based on public fields of the query target type in the order of declaration from base to derived
+        self._add_index(collection=collection, query_type=typeof(query))
+
+        # Create query dict
+        query_dict = {
+            "_dataset": dataset,
+            "_tenant": tenant,
+        }
+
+        # Serialize the query and update query dict
+        query_dict.update(BootstrapSerializers.FOR_MONGO_QUERY.serialize(query))
+
+        # Convert op_* fields to MongoDB $* syntax
+        query_dict = self._convert_op_fields_to_mongo_syntax(query_dict)
+
+        # Validate restrict_to or use the query target type if not specified
+        if restrict_to is None:
+            # Default to the query target type
+            restrict_to = query_target_type
+        elif not issubclass(restrict_to, query_target_type):
+            # Ensure restrict_to is a subclass of the query target type
+            raise RuntimeError(
+                f"In {typename(type(self))}.count_by_group, restrict_to={typename(restrict_to)} is not a subclass\n"
+                f"of the target type {typename(query_target_type)} for {typename(query)}."
+            )
+
+        # Filter by restrict_to if specified
+        self._apply_restrict_to(query_dict=query_dict, key_type=key_type, restrict_to=restrict_to)
+
+        # Group on the server, missing fields are omitted from the group identifier
+        pipeline = [
+            {"$match": query_dict},
+            {"$group": {"_id": {x: f"${x}" for x in group_by}, "count": {"$sum": 1}}},
+        ]
+        return tuple(
+            (
+                tuple(
+                    (
+                        _RECORD_SERIALIZER.deserialize(value, type_hint)
+                        if (value := group["_id"].get(x)) is not None
+                        else None
+                    )
+                    for x, type_hint in zip(group_by, group_by_type_hints)
+                ),
+                group["count"],
+            )
+            for group in collection.aggregate(pipeline)
+        )
+
     def save_many(
         self,
         key_type: type[KeyMixin],
@@ -336,28 +483,64 @@ class BasicMongoDb(Db):
         # Get MongoDB collection for the key type
         collection = self._get_mongo_collection(key_type=key_type)
 
-        # TODO: Provide a more performant implementation
-        for record in records:
-            # Serialize key
-            serialized_key = _KEY_SERIALIZER.serialize(record.get_key())
-            key_dict = {
-                "_dataset": dataset,
-                "_key": serialized_key,
-                "_tenant": tenant,
-            }
-
-            # Serialize record
-            serialized_record = _RECORD_SERIALIZER.serialize(record)
-            serialized_record["_dataset"] = dataset
-            serialized_record["_key"] = serialized_key
-            serialized_record["_tenant"] = tenant
+        # Send records in batches of save_batch_size, each batch is one bulk write round trip
+        batch_errors = []
+        for batch_start in range(0, len(records), self.save_batch_size):
+            batch = records[batch_start : batch_start + self.save_batch_size]
+            serialized_keys = [_KEY_SERIALIZER.serialize(record.get_key()) for record in batch]
+            serialized_records = []
+            for record, serialized_key in zip(batch, serialized_keys):
+                # Serialize record
+                serialized_record = _RECORD_SERIALIZER.serialize(record)
+                serialized_record["_dataset"] = dataset
+                serialized_record["_key"] = serialized_key
+                serialized_record["_tenant"] = tenant
+                serialized_records.append(serialized_record)
 
             if save_policy == SavePolicy.INSERT:
-                collection.insert_one(serialized_record)
+                key_dicts = None
             elif save_policy == SavePolicy.REPLACE:
-                collection.replace_one(key_dict, serialized_record, upsert=True)
+                key_dicts = [
+                    {
+                        "_dataset": dataset,
+                        "_key": serialized_key,
+                        "_tenant": tenant,
+                    }
+                    for serialized_key in serialized_keys
+                ]
             else:
-                ErrorUtil.enum_value_error(save_policy, SavePolicy)
+                raise ErrorUtil.enum_value_error(save_policy, SavePolicy)
+
+            try:
+                self._bulk_write(collection, serialized_records, key_dicts=key_dicts, ordered=self.save_ordered)
+            except BulkWriteError as e:
+                # Index of each write error is the position of the failed record within the batch
+                write_errors = e.details.get("writeErrors", [])
+                failed_keys = [serialized_keys[x["index"]] for x in write_errors]
+                failed_keys_str = ", ".join(failed_keys[:_MAX_REPORTED_KEYS])
+                if len(failed_keys) > _MAX_REPORTED_KEYS:
+                    failed_keys_str += f" and {len(failed_keys) - _MAX_REPORTED_KEYS} more"
+                reason = write_errors[0]["errmsg"] if write_errors else str(e)
+                batch_errors.append(
+                    f"Records {batch_start} to {batch_start + len(batch) - 1} failed for keys: {failed_keys_str}\n"
+                    f"Reason: {reason}"
+                )
+                if self.save_ordered:
+                    # Stop at the first failed record
+                    break
+
+        if batch_errors:
+            batch_errors_str = "\n".join(batch_errors)
+            remaining_str = (
+                "The records following the first failed record were not saved."
+                if self.save_ordered
+                else "The remaining records were saved."
+            )
+            raise RuntimeError(
+                f"Failed to save {typename(key_type)} records to MongoDB with save_policy={save_policy.name}.\n"
+                f"{batch_errors_str}\n"
+                f"{remaining_str}"
+            )
 
     def delete_many(
         self,
@@ -486,6 +669,29 @@ class BasicMongoDb(Db):
 
         return result
 
+    def _bulk_write(
+        self,
+        collection: Collection,
+        serialized_records: list[dict[str, Any]],
+        *,
+        key_dicts: list[dict[str, Any]] | None,
+        ordered: bool,
+    ) -> None:
+        """
+        Send serialized records to MongoDB in one bulk write, raises BulkWriteError on failure.
+
+        Args:
+            collection: MongoDB collection
+            serialized_records: Serialized records including the _dataset, _key and _tenant fields
+            key_dicts: Insert if None, otherwise replace or insert the records matching each key dict
+            ordered: If true, stop at the first failed record
+        """
+        if key_dicts is None:
+            requests = [InsertOne(x) for x in serialized_records]
+        else:
+            requests = [ReplaceOne(k, x, upsert=True) for k, x in zip(key_dicts, serialized_records)]
+        collection.bulk_write(requests, ordered=ordered)
+
     def _get_mongo_collection(self, key_type: type[KeyMixin]) -> Collection:
         """Get pymongo collection for the specified key type."""
         if self._mongo_collection_dict is None:
@@ -642,21 +848,64 @@ class BasicMongoDb(Db):
         else:
             raise ValueError(f"Unsupported SortOrder: {order}")
 
+    def _iter_deserialized(
+        self,
+        serialized_records: Iterable,
+        *,
+        expected_dataset: str,
+        project_to: type | None = None,
+        batch_size: int,
+    ) -> Iterator[TRecord]:
+        """Deserialize records lazily, fetching them from the server in batches of the specified size."""
+        if batch_size < 1:
+            raise RuntimeError(f"Param batch_size={batch_size} must be a positive integer.")
+        if isinstance(serialized_records, tuple):
+            # Empty result returned by _apply_limit_and_skip for limit=0
+            return
+        try:
+            for serialized_record in serialized_records.batch_size(batch_size):
+                yield _RECORD_SERIALIZER.deserialize(
+                    self._with_pruned_fields(
+                        serialized_record, expected_dataset=expected_dataset, project_to=project_to
+                    )
+                )
+        finally:
+            serialized_records.close()
+
     def _with_pruned_fields(
         self,
         record_dict: dict[str, Any],
         *,
         expected_dataset: str,
+        project_to: type | None = None,
     ) -> dict[str, Any]:
-        """Prune and validate fields that are not part of the serialized record data and return the same instance."""
+        """
+        Prune and validate fields that are not part of the serialized record data and return the same instance.
+
+        Args:
+            record_dict: Serialized record with all fields, or only the fields of project_to if specified
+            expected_dataset: Error if the _dataset field has a different value
+            project_to: Deserialize as this type instead of the stored record type if specified
+        """
 
         # Remove or pop and validate
         del record_dict["_id"]
         assert record_dict.pop("_dataset") == expected_dataset
         del record_dict["_key"]
 
+        if project_to is not None:
+            record_dict["_type"] = typename(project_to)
+
         return record_dict
 
+    def _get_projection(self, key_type: type[KeyMixin], project_to: type | None) -> dict[str, bool] | None:
+        """Get MongoDB projection for the fields of project_to and the fields used by Db, or None for all fields."""
+        if project_to is None:
+            return None
+        result = {"_dataset": True, "_key": True}
+        result.update((x, True) for x in self._get_projected_field_names(key_type, project_to))
+        return result
+
     def _get_mongo_keys_filter(self, keys: Sequence[KeyMixin], *, dataset: str, tenant: str) -> dict[str, Any]:
         """Get filter for loading records that match one of the specified keys."""
         serialized_keys = tuple(_KEY_SERIALIZER.serialize(key) for key in keys)
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from typing import Any
 from mongomock import MongoClient as MongoClientMock
+from pymongo.synchronous.collection import Collection
 from cl.runtime.db.mongo.basic_mongo_db import BasicMongoDb
 
 
@@ -24,3 +26,21 @@ class BasicMongoMockDb(BasicMongoDb):
     def _get_mongo_client_type(self) -> type:
         """Get the type of MongoDB client object, this method overrides base to return the mongomock class."""
         return MongoClientMock
+
+    def _bulk_write(
+        self,
+        collection: Collection,
+        serialized_records: list[dict[str, Any]],
+        *,
+        key_dicts: list[dict[str, Any]] | None,
+        ordered: bool,
+    ) -> None:
+        """Override to replace with mongomock bulk operation builder which does not accept pymongo ReplaceOne sort."""
+        if key_dicts is None:
+            # Inserts use collection.bulk_write in base to test the same code path as MongoDB
+            BasicMongoDb._bulk_write(self, collection, serialized_records, key_dicts=None, ordered=ordered)
+        else:
+            bulk = collection.initialize_ordered_bulk_op() if ordered else collection.initialize_unordered_bulk_op()
+            for key_dict, serialized_record in zip(key_dicts, serialized_records):
+                bulk.find(key_dict).upsert().replace_one(serialized_record)
+            bulk.execute()
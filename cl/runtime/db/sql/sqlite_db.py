@@ -15,10 +15,17 @@
 import os
 import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import field
+from threading import Lock
+from threading import RLock
+from typing import Iterator
 from typing import Sequence
 from typing import cast
 from memoization import cached
+from cl.runtime.db.db import DEFAULT_BATCH_SIZE
 from cl.runtime.db.db import Db
 from cl.runtime.db.query_mixin import QueryMixin
 from cl.runtime.db.save_policy import SavePolicy
@@ -30,12 +37,19 @@ from cl.runtime.records.data_mixin import DataMixin
 from cl.runtime.records.data_mixin import TDataDict
 from cl.runtime.records.key_mixin import KeyMixin
 from cl.runtime.records.key_mixin import TKey
+from cl.runtime.records.protocols import is_data_key_or_record_type
+from cl.runtime.records.protocols import is_enum_type
+from cl.runtime.records.protocols import is_key_type
+from cl.runtime.records.protocols import is_primitive_type
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.records.record_mixin import TRecord
 from cl.runtime.records.type_check import TypeCheck
 from cl.runtime.records.typename import typename
+from cl.runtime.records.typename import typeof
+from cl.runtime.schema.data_spec import DataSpec
 from cl.runtime.schema.type_info import TypeInfo
 from cl.runtime.schema.type_kind import TypeKind
+from cl.runtime.schema.type_schema import TypeSchema
 from cl.runtime.serializers.bootstrap_serializers import BootstrapSerializers
 from cl.runtime.serializers.data_serializers import DataSerializers
 from cl.runtime.serializers.key_serializers import KeySerializers
@@ -44,8 +58,11 @@ from cl.runtime.settings.db_settings import DbSettings
 _KEY_SERIALIZER = KeySerializers.DELIMITED
 _DATA_SERIALIZER = DataSerializers.FOR_SQLITE
 
-_connection_dict: dict[str, sqlite3.Connection] = {}
-"""Dict of Connection instances with db_id key stored outside the class to avoid serialization."""
+_POOL_DICT: dict[str, "_SqlitePool"] = {}
+"""Connection pools with db_id key stored outside the class to avoid serialization."""
+
+_POOL_LOCK = Lock()
+"""Lock for creating and closing connection pools and reader connections."""
 
 # Regex for a safe SQLite table name (letters, digits, underscores, start with letter or underscore)
 _TABLE_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
@@ -54,8 +71,42 @@ _TABLE_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 _COLUMN_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 
+@dataclass(slots=True)
+class _SqlitePool:
+    """Connections to the same database file, a single writer and a reader for each thread."""
+
+    writer: sqlite3.Connection
+    """The only connection used for writes, accessed under write_lock."""
+
+    write_lock: RLock = field(default_factory=RLock)
+    """Serializes writes so that commit includes only the statements of the caller."""
+
+    readers: dict[int, sqlite3.Connection] = field(default_factory=dict)
+    """Read-only connections indexed by thread identifier, reads in WAL mode do not wait for the writer."""
+
+    existing_tables: set[str] = field(default_factory=set)
+    """Names of the tables known to exist, tables are not dropped except together with the database."""
+
+    indexed_tables: set[tuple[str, tuple[str, ...]]] = field(default_factory=set)
+    """Set of (table_name, index_query_types) for which the indexes for index_query_types have been added."""
+
+    added_indexes: set[tuple[str, tuple]] = field(default_factory=set)
+    """Set of (table_name, index_columns) for which an index has already been added."""
+
+
 @dataclass(slots=True, kw_only=True)
 class SqliteDb(Db):
+    """
+    SQLite database with one table per key type and composite indexes for query types.
+
+    Notes:
+        - Each thread reads using its own read-only connection in WAL mode, up to DbSettings.db_sqlite_pool_size
+          reader connections for each database, threads above this limit open a short-lived connection for each read
+        - Writes use a single writer connection and are serialized, each write is committed separately
+    """
+
+    index_query_types: tuple[str, ...] | None = None
+    """Names of query types indexed on table creation, otherwise each query type is indexed on first use."""
 
     def load_many(
         self,
@@ -88,8 +139,10 @@ class SqliteDb(Db):
         # Build SQL query to select records by keys
         placeholders = ",".join("?" for _ in serialized_keys)
         values = [tenant, *serialized_keys]
+        select_columns = self._get_select_columns(key_type=key_type, project_to=project_to)
         select_sql = (
-            f'SELECT * FROM {self._quote_identifier(table_name)} WHERE "_tenant" = ? AND "_key" IN ({placeholders})'
+            f"SELECT {select_columns} FROM {self._quote_identifier(table_name)} "
+            f'WHERE "_tenant" = ? AND "_key" IN ({placeholders})'
         )
 
         if sort_order is not None:
@@ -97,14 +150,11 @@ class SqliteDb(Db):
             select_sql = self._add_order(select_sql, sort_field="_key", sort_order=sort_order)
 
         # Execute SQL query
-        conn = self._get_connection()
-        cursor = conn.execute(select_sql, values)
+        with self._read() as conn:
+            rows = conn.execute(select_sql, values).fetchall()
 
         # Deserialize records and return
-        return [
-            _DATA_SERIALIZER.deserialize({k: row[k] for k in row.keys() if row[k] is not None})
-            for row in cursor.fetchall()
-        ]
+        return [self._deserialize_row(row, project_to=project_to) for row in rows]
 
     def load_all(
         self,
@@ -119,22 +169,50 @@ class SqliteDb(Db):
         limit: int | None = None,
         skip: int | None = None,
     ) -> tuple[TRecord, ...]:
+        return tuple(
+            self.iter_all(
+                key_type,
+                dataset=dataset,
+                tenant=tenant,
+                cast_to=cast_to,
+                restrict_to=restrict_to,
+                project_to=project_to,
+                sort_order=sort_order,
+                limit=limit,
+                skip=skip,
+            )
+        )
+
+    def iter_all(
+        self,
+        key_type: type[KeyMixin],
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
 
         # Check params
         assert TypeCheck.guard_key_type(key_type)
         self._check_dataset(dataset)
         self._check_tenant(tenant)
 
-        if project_to is not None:
-            raise RuntimeError(f"{typename(type(self))} does not currently support 'project_to' option.")
-
         # Get table name from key type and check it has an acceptable format
         table_name = self._get_validated_table_name(key_type=key_type)
 
         if not self._table_exists(table_name=table_name):
-            return tuple()
+            return
 
-        select_sql, values = f'SELECT * FROM {self._quote_identifier(table_name)} WHERE "_tenant" = ?', [tenant]
+        # Select only the columns for the fields of project_to if specified
+        select_columns = self._get_select_columns(key_type=key_type, project_to=project_to)
+        select_sql = f'SELECT {select_columns} FROM {self._quote_identifier(table_name)} WHERE "_tenant" = ?'
+        values = [tenant]
 
         if restrict_to is not None:
             # Add filter condition on type
@@ -151,23 +229,9 @@ class SqliteDb(Db):
         select_sql, add_params = self._add_limit_and_skip(select_sql, limit=limit, skip=skip)
         values.extend(add_params)
 
-        # Execute SQL query
-        conn = self._get_connection()
-        cursor = conn.execute(select_sql, values)
-
-        # Deserialize records
-        result = []
-        for row in cursor.fetchall():
-            # Convert sqlite3.Row to dict
-            serialized_record = {k: row[k] for k in row.keys() if row[k] is not None}
-            del serialized_record["_key"]
-
-            # Create a record from the serialized data
-            record = _DATA_SERIALIZER.deserialize(serialized_record)
-
-            result.append(record)
-
-        return tuple(result)
+        # Execute SQL query and deserialize records one batch at a time
+        for row in self._iter_rows(select_sql, values, batch_size=batch_size):
+            yield self._deserialize_row(row, project_to=project_to)
 
     def load_by_query(
         self,
@@ -182,6 +246,34 @@ class SqliteDb(Db):
         limit: int | None = None,
         skip: int | None = None,
     ) -> tuple[TRecord, ...]:
+        return tuple(
+            self.iter_by_query(
+                query,
+                dataset=dataset,
+                tenant=tenant,
+                cast_to=cast_to,
+                restrict_to=restrict_to,
+                project_to=project_to,
+                sort_order=sort_order,
+                limit=limit,
+                skip=skip,
+            )
+        )
+
+    def iter_by_query(
+        self,
+        query: QueryMixin,
+        *,
+        dataset: str,
+        tenant: str,
+        cast_to: type[TRecord] | None = None,
+        restrict_to: type[TRecord] | None = None,
+        project_to: type[TRecord] | None = None,
+        sort_order: SortOrder = SortOrder.ASC,
+        limit: int | None = None,
+        skip: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[TRecord]:
 
         # Check that the query has been frozen
         query.check_frozen()
@@ -190,18 +282,19 @@ class SqliteDb(Db):
         self._check_dataset(dataset)
         self._check_tenant(tenant)
 
-        if project_to is not None:
-            raise RuntimeError(f"{typename(type(self))} does not currently support 'project_to' option.")
-
         # Get table name from key type and check it has an acceptable format
-        table_name = self._get_validated_table_name(key_type=query.get_target_type().get_key_type())
+        key_type = query.get_target_type().get_key_type()
+        table_name = self._get_validated_table_name(key_type=key_type)
 
         if not self._table_exists(table_name=table_name):
-            return tuple()
+            return
 
         # Serialize the query
         query_dict = BootstrapSerializers.FOR_SQLITE_QUERY.serialize(query)
 
+        # Add index based on the fields of the query type in the order of declaration if not already added
+        self._add_index(table_name=table_name, query_type=typeof(query))
+
         # Validate restrict_to or use the query target type if not specified
         if restrict_to is None:
             # Default to the query target type
@@ -227,7 +320,9 @@ class SqliteDb(Db):
             where += f'"_type" IN ({placeholders})'
             values += subtype_names
 
-        select_sql = f'SELECT * FROM {self._quote_identifier(table_name)} WHERE "_tenant" = ?'
+        # Select only the columns for the fields of project_to if specified
+        select_columns = self._get_select_columns(key_type=key_type, project_to=project_to)
+        select_sql = f'SELECT {select_columns} FROM {self._quote_identifier(table_name)} WHERE "_tenant" = ?'
 
         if where:
             select_sql += f" AND {where}"
@@ -239,29 +334,17 @@ class SqliteDb(Db):
         select_sql, add_params = self._add_limit_and_skip(select_sql, limit=limit, skip=skip)
         values.extend(add_params)
 
-        # Execute SQL query
-        conn = self._get_connection()
-        cursor = conn.execute(select_sql, values)
-
         # Set cast_to to restrict_to if not specified
         if cast_to is None:
             cast_to = restrict_to
 
-        # Deserialize records
-        result = []
-        for row in cursor.fetchall():
-            # Convert sqlite3.Row to dict
-            serialized_record = {k: row[k] for k in row.keys() if row[k] is not None}
-            del serialized_record["_key"]
-
-            # Create a record from the serialized data
-            record = _DATA_SERIALIZER.deserialize(serialized_record)
-
-            # Apply cast (error if not a subtype)
-            record = CastUtil.cast(cast_to, record)
-            result.append(record)
-
-        return tuple(result)
+        # Execute SQL query and deserialize records one batch at a time
+        for row in self._iter_rows(select_sql, values, batch_size=batch_size):
+            if project_to is not None:
+                yield self._deserialize_row(row, project_to=project_to)
+            else:
+                # Apply cast (error if not a subtype)
+                yield CastUtil.cast(cast_to, self._deserialize_row(row))
 
     def count_by_query(
         self,
@@ -285,46 +368,63 @@ class SqliteDb(Db):
         if not self._table_exists(table_name=table_name):
             return 0
 
-        # TODO (Roman): Use a specialized serializer for SQL query.
-        # Serialize the query
-        query_dict = BootstrapSerializers.FOR_SQLITE_QUERY.serialize(query)
+        # Build SQL query to count records in table by conditions
+        where, values = self._get_count_where(query, table_name=table_name, tenant=tenant, restrict_to=restrict_to)
+        select_sql = f"SELECT COUNT(*) FROM {self._quote_identifier(table_name)} WHERE {where}"
 
-        # Validate restrict_to or use the query target type if not specified
-        if restrict_to is None:
-            # Default to the query target type
-            restrict_to = query.get_target_type()
-        elif not issubclass(restrict_to, (query_target_type := query.get_target_type())):
-            # Ensure restrict_to is a subclass of the query target type
-            raise RuntimeError(
-                f"In {typename(type(self))}.load_by_query, restrict_to={typename(restrict_to)} is not a subclass\n"
-                f"of the target type {typename(query_target_type)} for {typename(query)}."
-            )
+        # Execute SQL query
+        with self._read() as conn:
+            count = conn.execute(select_sql, values).fetchone()[0]
+        return count
 
-        # Build SQL query to count records in table by conditions
-        where, values = self._convert_query_dict_to_sql_syntax(query_dict, tenant)
+    def count_by_group(
+        self,
+        query: QueryMixin,
+        *,
+        group_by: Sequence[str],
+        dataset: str,
+        tenant: str,
+        restrict_to: type | None = None,
+    ) -> tuple[tuple[tuple, int], ...]:
 
-        if restrict_to is not None:
-            # Add filter condition on type
-            subtype_names = TypeInfo.get_child_and_self_type_names(restrict_to, type_kind=TypeKind.RECORD)
-            placeholders = ",".join("?" for _ in subtype_names)
+        # Check that the query has been frozen
+        query.check_frozen()
 
-            if where:
-                where += " AND "
+        # Check dataset
+        self._check_dataset(dataset)
+        self._check_tenant(tenant)
 
-            where += f'"_type" IN ({placeholders})'
-            values += subtype_names
+        # Get type hints for deserializing group values, this also validates group_by
+        group_by = tuple(group_by)
+        group_by_type_hints = self._get_group_by_type_hints(restrict_to or query.get_target_type(), group_by)
 
-        select_sql = f'SELECT COUNT(*) FROM {self._quote_identifier(table_name)} WHERE "_tenant" = ?'
+        # Get table name from key type and check it has an acceptable format
+        table_name = self._get_validated_table_name(key_type=query.get_target_type().get_key_type())
 
-        if where:
-            select_sql += f" AND {where}"
+        if not self._table_exists(table_name=table_name):
+            return ()
 
-        # Execute SQL query
-        conn = self._get_connection()
-        cursor = conn.execute(select_sql, values)
+        # Build SQL query to count records in table by conditions, grouped by the specified columns
+        where, values = self._get_count_where(query, table_name=table_name, tenant=tenant, restrict_to=restrict_to)
+        group_columns = ", ".join(self._quote_identifier(self._get_validated_column_name(x)) for x in group_by)
+        select_sql = (
+            f"SELECT {group_columns}, COUNT(*) FROM {self._quote_identifier(table_name)} "
+            f"WHERE {where} GROUP BY {group_columns}"
+        )
 
-        count = cursor.fetchone()[0]
-        return count
+        # Execute SQL query and deserialize group values, the count is the last column
+        with self._read() as conn:
+            rows = conn.execute(select_sql, values).fetchall()
+        return tuple(
+            (
+                tuple(
+                    _DATA_SERIALIZER.deserialize(value, type_hint) if value is not None else None
+                    for value, type_hint in zip(row[:-1], group_by_type_hints)
+                ),
+                row[-1],
+            )
+            for row in rows
+        )
 
     def save_many(
         self,
@@ -380,9 +480,8 @@ class SqliteDb(Db):
         values_for_query = [tuple(data.get(col) for col in columns_for_query) for data in serialized_records]
 
         # Execute SQL query
-        conn = self._get_connection()
-        conn.executemany(insert_sql, values_for_query)
-        conn.commit()
+        with self._write() as conn:
+            conn.executemany(insert_sql, values_for_query)
 
     def delete_many(
         self,
@@ -418,8 +517,8 @@ class SqliteDb(Db):
         )
 
         # Execute SQL query
-        conn = self._get_connection()
-        conn.execute(select_sql, values)
+        with self._write() as conn:
+            conn.execute(select_sql, values)
 
     def delete_by_query(
         self,
@@ -448,12 +547,15 @@ class SqliteDb(Db):
         self._drop_db()
 
     def close_connection(self) -> None:
-        if (connection := _connection_dict.get(self.db_id, None)) is not None:
-            # Close connection
-            connection.close()
-
-            # Remove from dictionary so connection can be reopened on next access
-            del _connection_dict[self.db_id]
+        # Remove from dictionary so connections can be reopened on next access
+        with _POOL_LOCK:
+            pool = _POOL_DICT.pop(self.db_id, None)
+        if pool is not None:
+            # Close reader connections first, then the writer after pending writes complete
+            for reader in pool.readers.values():
+                reader.close()
+            with pool.write_lock:
+                pool.writer.close()
 
     def _get_db_file_path(self) -> str:
         """Get database file path from db_id, applying the appropriate formatting conventions."""
@@ -467,33 +569,88 @@ class SqliteDb(Db):
         result = os.path.join(db_dir, f"{self.db_id}.sqlite")
         return result
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get sqlite3 connection object."""
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager for the read-only connection of the current thread, use _write for writes.
+        When the pool is full, a short-lived read-only connection is opened and closed on exit.
+        """
+        pool = self._get_pool()
+        if (conn := pool.readers.get(thread_id := threading.get_ident())) is None:
+            with _POOL_LOCK:
+                if len(pool.readers) >= DbSettings.instance().db_sqlite_pool_size:
+                    # Close the connections of the threads that are no longer running
+                    running_ids = set(x.ident for x in threading.enumerate())
+                    for stopped_id in [x for x in pool.readers if x not in running_ids]:
+                        pool.readers.pop(stopped_id).close()
+                if len(pool.readers) < DbSettings.instance().db_sqlite_pool_size:
+                    conn = pool.readers[thread_id] = self._connect(read_only=True)
+
+        if conn is not None:
+            yield conn
+        else:
+            # The pool is full, never share the writer connection because it would see uncommitted writes
+            conn = self._connect(read_only=True)
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Context manager for the writer connection, commits on exit without exception and rolls back otherwise."""
+        pool = self._get_pool()
+        with pool.write_lock:
+            try:
+                yield pool.writer
+                pool.writer.commit()
+            except BaseException:
+                pool.writer.rollback()
+                raise
+
+    def _get_pool(self) -> _SqlitePool:
+        """Get connection pool for db_id, opening the writer connection on first access."""
+        if (result := _POOL_DICT.get(self.db_id, None)) is None:
+            with _POOL_LOCK:
+                if (result := _POOL_DICT.get(self.db_id, None)) is None:
+                    result = _POOL_DICT[self.db_id] = _SqlitePool(writer=self._connect(read_only=False))
+        return result
 
-        if (conn := _connection_dict.get(self.db_id, None)) is None:
-            db_file_path = self._get_db_file_path()
+    def _connect(self, *, read_only: bool) -> sqlite3.Connection:
+        """Open a new sqlite3 connection object, creating the database file if it does not exist."""
 
-            # Ensure the parent directory exists
-            os.makedirs(os.path.dirname(db_file_path), exist_ok=True)
+        db_file_path = self._get_db_file_path()
 
-            # Open a connection to the SQLite database at the given path.
-            # If the file does not exist, SQLite will create it (but not directory)
-            conn = sqlite3.connect(db_file_path, check_same_thread=False)
+        # Ensure the parent directory exists
+        os.makedirs(os.path.dirname(db_file_path), exist_ok=True)
+
+        # Open a connection to the SQLite database at the given path.
+        # If the file does not exist, SQLite will create it (but not directory).
+        # Wait up to busy timeout for the lock held by another connection, and
+        # cache prepared statements for the SQL text that is reused between calls
+        db_settings = DbSettings.instance()
+        conn = sqlite3.connect(
+            db_file_path,
+            timeout=db_settings.db_sqlite_busy_timeout,
+            check_same_thread=False,
+            cached_statements=db_settings.db_sqlite_cached_statements,
+        )
 
+        if read_only:
+            # Prevent writes using a reader connection
+            conn.execute("PRAGMA query_only=ON")
+        else:
             # Enable Write-Ahead Logging (WAL) mode.
-            # This improves concurrent read/write performance and reduces locking issues.
+            # This permits reads from other connections concurrently with writes.
             conn.execute("PRAGMA journal_mode=WAL")
 
-            # Set the synchronous mode to 'NORMAL' to balance performance and durability.
-            # It's faster than FULL, and still safe for most use cases.
-            conn.execute("PRAGMA synchronous=NORMAL")
-
-            # Set the row factory so that rows fetched from queries will be returned
-            # as sqlite3.Row objects, which act like dictionaries (column access by name).
-            conn.row_factory = sqlite3.Row
-
-            _connection_dict[self.db_id] = conn
+        # Set the synchronous mode to 'NORMAL' to balance performance and durability.
+        # It's faster than FULL, and still safe for most use cases.
+        conn.execute("PRAGMA synchronous=NORMAL")
 
+        # Set the row factory so that rows fetched from queries will be returned
+        # as sqlite3.Row objects, which act like dictionaries (column access by name).
+        conn.row_factory = sqlite3.Row
         return conn
 
     def _create_table(self, *, key_type: type[KeyMixin]) -> None:
@@ -502,6 +659,12 @@ class SqliteDb(Db):
         # Get table name from key type and check it has an acceptable format
         table_name = self._get_validated_table_name(key_type=key_type)
 
+        # Skip DDL if the table is known to exist and the indexes for index_query_types have been added
+        pool = self._get_pool()
+        indexed_id = (table_name, self.index_query_types) if self.index_query_types else None
+        if table_name in pool.existing_tables and (indexed_id is None or indexed_id in pool.indexed_tables):
+            return
+
         # List of columns that are present in the table by default
         column_defs = ["_key", "_type", "_tenant"]
 
@@ -518,16 +681,127 @@ class SqliteDb(Db):
             + f'({", ".join(column_defs)}, PRIMARY KEY (_key, _tenant));'
         )
 
-        conn = self._get_connection()
-        conn.execute(sql)
-        conn.commit()
+        if table_name not in pool.existing_tables:
+            with self._write() as conn:
+                conn.execute(sql)
+            pool.existing_tables.add(table_name)
+
+        # Add indexes on all fields of the pre-declared query types that target this table
+        if indexed_id is not None and indexed_id not in pool.indexed_tables:
+            for query_type_name in self.index_query_types:
+                query_type = TypeInfo.from_type_name(query_type_name)
+                query_key_type = query_type().get_target_type().get_key_type()
+                if self._get_validated_table_name(key_type=query_key_type) == table_name:
+                    self._add_index(table_name=table_name, query_type=query_type)
+            pool.indexed_tables.add(indexed_id)
+
+    def _iter_rows(self, select_sql: str, values: Sequence, *, batch_size: int) -> Iterator[sqlite3.Row]:
+        """Execute the query and fetch rows in batches of the specified size, closing the cursor when done."""
+        if batch_size < 1:
+            raise RuntimeError(f"Param batch_size={batch_size} must be a positive integer.")
+        with self._read() as conn:
+            cursor = conn.execute(select_sql, values)
+            try:
+                while rows := cursor.fetchmany(batch_size):
+                    yield from rows
+            finally:
+                cursor.close()
+
+    @classmethod
+    def _deserialize_row(cls, row: sqlite3.Row, *, project_to: type | None = None) -> RecordMixin:
+        """
+        Deserialize a record from the row, skipping the columns used by Db that are not part of record data.
+
+        Args:
+            row: Row with all columns, or only the columns for the fields of project_to if specified
+            project_to: Deserialize as this type instead of the stored record type if specified
+        """
+        serialized_record = {k: v for k in row.keys() if (v := row[k]) is not None and k != "_key"}
+        if project_to is not None:
+            serialized_record["_type"] = typename(project_to)
+        return _DATA_SERIALIZER.deserialize(serialized_record)
+
+    @classmethod
+    @cached
+    def _get_select_columns(cls, *, key_type: type[KeyMixin], project_to: type | None) -> str:
+        """Get quoted columns for the fields of project_to in SELECT clause, or all columns if not specified."""
+        if project_to is None:
+            return "*"
+        field_names = cls._get_projected_field_names(key_type, project_to)
+        return ", ".join(cls._quote_identifier(cls._get_validated_column_name(x)) for x in field_names)
+
+    def _add_index(self, *, table_name: str, query_type: type) -> None:
+        """
+        Add one composite index for the specified query_type, once per database.
+
+        Args:
+            table_name: Name of the table targeted by the query
+            query_type: Query type whose fields are indexed in the order of declaration
+        """
+        # Get index columns in the order of declaration, query types with the same columns share the index
+        pool = self._get_pool()
+        index_columns = self._get_index_columns(type_=query_type)
+        if (index_id := (table_name, index_columns)) not in pool.added_indexes:
+            if index_columns:
+                # Index name is unique for each combination of table and indexed columns, shared by query types
+                index_name = "_".join(("idx", table_name, *(f"{x}_desc" if y else x for x, y in index_columns)))
+
+                # Tenant is the first and key is the last column in the index to support sorting by key
+                column_defs = ", ".join(
+                    (
+                        self._quote_identifier("_tenant"),
+                        *(f"{self._quote_identifier(x)} {'DESC' if y else 'ASC'}" for x, y in index_columns),
+                        self._quote_identifier("_key"),
+                    )
+                )
+                sql = (
+                    f"CREATE INDEX IF NOT EXISTS {self._quote_identifier(index_name)} "
+                    f"ON {self._quote_identifier(table_name)} ({column_defs});"
+                )
+                with self._write() as conn:
+                    conn.execute(sql)
+
+            # Add to the set of indexes that have already been added
+            pool.added_indexes.add(index_id)
+
+    @classmethod
+    @cached
+    def _get_index_columns(cls, *, type_: type) -> tuple[tuple[str, bool], ...]:
+        """Get a tuple of (column_name, is_descending) for the fields of the specified query type."""
+        result = []
+        type_spec = CastUtil.cast(DataSpec, TypeSchema.for_type(type_))
+        for field_spec in type_spec.fields:
+            # Get type hint and ensure it is not a container
+            field_type_hint = field_spec.field_type_hint
+            if field_type_hint.remaining:
+                raise RuntimeError(
+                    f"Field {field_spec.field_name} in type {typename(type_)} is a container and cannot be queried."
+                )
+
+            # Add a column for each primitive, enum or key field, embedded data is stored as
+            # JSON in a single column and is not indexed because its fields cannot be queried
+            field_type = field_type_hint.schema_type
+            if is_primitive_type(field_type) or is_enum_type(field_type) or is_key_type(field_type):
+                column_name = cls._get_validated_column_name(field_spec.field_name)
+                result.append((column_name, bool(field_spec.descending)))
+            elif not is_data_key_or_record_type(field_type):
+                raise RuntimeError(f"Cannot create index for field type {typename(field_type)}.")
+        return tuple(result)
 
     def _table_exists(self, *, table_name: str) -> bool:
-        """Check if specified table exists in DB."""
+        """Check if specified table exists in DB, the result is remembered if the table exists."""
 
+        pool = self._get_pool()
+        if table_name in pool.existing_tables:
+            return True
+
+        # Do not remember if the table does not exist because it can be created by another process
         check_sql = "SELECT name FROM sqlite_master WHERE type='table' AND name=?"
-        conn = self._get_connection()
-        return conn.execute(check_sql, (table_name,)).fetchone()
+        with self._read() as conn:
+            result = conn.execute(check_sql, (table_name,)).fetchone() is not None
+        if result:
+            pool.existing_tables.add(table_name)
+        return result
 
     def _drop_db(self):
         """Delete db file."""
@@ -630,6 +904,49 @@ class SqliteDb(Db):
         escaped = identifier.replace('"', '""')
         return f'"{escaped}"'
 
+    def _get_count_where(
+        self, query: QueryMixin, *, table_name: str, tenant: str, restrict_to: type | None
+    ) -> tuple[str, list]:
+        """
+        Get SQL 'WHERE' clause with placeholders and the values for the placeholders for counting records
+        that match the query, including the tenant and restrict_to conditions.
+        """
+
+        # TODO (Roman): Use a specialized serializer for SQL query.
+        # Serialize the query
+        query_dict = BootstrapSerializers.FOR_SQLITE_QUERY.serialize(query)
+
+        # Add index based on the fields of the query type in the order of declaration if not already added
+        self._add_index(table_name=table_name, query_type=typeof(query))
+
+        # Validate restrict_to or use the query target type if not specified
+        if restrict_to is None:
+            # Default to the query target type
+            restrict_to = query.get_target_type()
+        elif not issubclass(restrict_to, (query_target_type := query.get_target_type())):
+            # Ensure restrict_to is a subclass of the query target type
+            raise RuntimeError(
+                f"In {typename(type(self))}.load_by_query, restrict_to={typename(restrict_to)} is not a subclass\n"
+                f"of the target type {typename(query_target_type)} for {typename(query)}."
+            )
+
+        # Convert query to SQL conditions, values start from tenant
+        where, values = self._convert_query_dict_to_sql_syntax(query_dict, tenant)
+
+        if restrict_to is not None:
+            # Add filter condition on type
+            subtype_names = TypeInfo.get_child_and_self_type_names(restrict_to, type_kind=TypeKind.RECORD)
+            placeholders = ",".join("?" for _ in subtype_names)
+
+            if where:
+                where += " AND "
+
+            where += f'"_type" IN ({placeholders})'
+            values += subtype_names
+
+        tenant_where = '"_tenant" = ?'
+        return (f"{tenant_where} AND {where}" if where else tenant_where), values
+
     @classmethod
     def _convert_query_dict_to_sql_syntax(cls, query_dict: dict, tenant: str) -> tuple[str, list]:
         """
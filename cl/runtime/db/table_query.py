@@ -0,0 +1,36 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from dataclasses import dataclass
+from cl.runtime.db.query_mixin import QueryMixin
+from cl.runtime.records.for_dataclasses.dataclass_mixin import DataclassMixin
+from cl.runtime.records.key_mixin import KeyMixin
+from cl.runtime.records.typename import typename
+
+
+@dataclass(slots=True, kw_only=True)
+class TableQuery(DataclassMixin, QueryMixin):
+    """Query without conditions that matches all records in the table for the key type, use restrict_to to filter."""
+
+    _key_type: type[KeyMixin] | None = None
+    """Key type that determines the table (private field, not included in the query conditions)."""
+
+    def __init(self) -> None:
+        """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
+        if self._key_type is None:
+            raise RuntimeError(f"Field {typename(type(self))}._key_type must be specified.")
+
+    def get_target_type(self) -> type[KeyMixin]:
+        return self._key_type
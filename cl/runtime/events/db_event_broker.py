@@ -14,27 +14,29 @@
 
 import asyncio
 import logging
-from collections import deque
 from dataclasses import dataclass
-from typing import AsyncGenerator
-from starlette.requests import Request
+from threading import Lock
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
 from cl.runtime.db.sort_order import SortOrder
 from cl.runtime.events.event import Event
-from cl.runtime.events.event_broker import EventBroker
+from cl.runtime.events.event_query import EventQuery
+from cl.runtime.events.local_event_broker import LocalEventBroker
 from cl.runtime.primitive.timestamp import Timestamp
-from cl.runtime.records.data_mixin import TDataDict
 from cl.runtime.records.for_dataclasses.extensions import required
-from cl.runtime.serializers.data_serializers import DataSerializers
+from cl.runtime.records.predicates import Gt
+from cl.runtime.settings.sse_settings import SseSettings
 
 _logger = logging.getLogger(__name__)
 
-_pull_events_delay = 3.0
-"""Delay in seconds to check new events in DB."""
+_pull_events_limit = 100
+"""Max number of events loaded from the DB in one query, the next query follows without delay if reached."""
 
-_event_buffer_maxlen = 100
-"""Max number of sent events in buffer."""
+_PULL_EVENTS_TASKS: dict[tuple[str, str, str], asyncio.Task] = {}
+"""Task pulling events from the DB for each (tenant_id, broker_id, topic) with subscribers in this process."""
+
+_PULL_EVENTS_TASKS_LOCK = Lock()
+"""Lock for the pull events tasks dictionary."""
 
 
 def _handle_async_task_exception(task: asyncio.Task):
@@ -49,41 +51,49 @@ def _handle_async_task_exception(task: asyncio.Task):
         _logger.error("DB SSE pull events task failed.", exc_info=True)
 
 
-async def _pull_events(queue: asyncio.Queue, data_source: DataSource):
+def _cancel_task(task: asyncio.Task):
+    """Cancel the task from any thread, the task may belong to the event loop of another thread."""
+    loop = task.get_loop()
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(task.cancel)
+
+
+async def _pull_events(event_broker: "DbEventBroker", topic: str):
+    """Deliver events saved to the DB by other processes, loading only the events after the last seen timestamp."""
+    pull_interval_sec = SseSettings.instance().sse_pull_interval_sec
+    last_timestamp = Timestamp.create()
     while True:
-        # Get unprocessed events from the DB, sorted by ascending timestamp
-        # load_all is enough as Event key field is timestamp
-        new_events = data_source.load_all(key_type=Event().get_key_type(), sort_order=SortOrder.DESC, limit=100)[::-1]
+        # Get events after the last seen timestamp sorted by ascending timestamp, Event key field is timestamp
+        query = EventQuery(timestamp=Gt(last_timestamp)).build()
+        new_events = await asyncio.to_thread(
+            event_broker.data_source.load_by_query, query, sort_order=SortOrder.ASC, limit=_pull_events_limit
+        )
 
-        # Put events to subscribed queues
+        # Deliver to subscribers in this process, events published by this process are skipped by the subscribers
         for event in new_events:
-            await queue.put(event)
+            event_broker._deliver(topic, event)  # noqa
+        if new_events:
+            last_timestamp = new_events[-1].timestamp
 
-        # Wait for delay
-        await asyncio.sleep(_pull_events_delay)
+        # Wait for delay unless the limit is reached and more events may be available
+        if len(new_events) < _pull_events_limit:
+            await asyncio.sleep(pull_interval_sec)
 
 
 @dataclass(slots=True, kw_only=True)
-class DbEventBroker(EventBroker):
+class DbEventBroker(LocalEventBroker):
     """
-    Event broker that uses current DataSource as transport for events.
-    Continuously checks if there are new events in the DB and sends them to the queue.
+    Event broker that uses current DataSource as transport for events between processes.
+
+    Notes:
+        - Events are saved to the DB and delivered immediately to the subscribers in the same process
+        - Events published by other processes are pulled from the DB incrementally after the last seen timestamp
+        - One pull task per topic is shared by all subscribers in the same process
+        - Events saved by other processes after a later event has been pulled are not delivered
     """
 
     data_source: DataSource = required()
-    """Data source used for pulling events."""
-
-    _sent_event_buffer: deque[str] | None = None
-    """Buffer queue for sent events."""
-
-    _from_timestamp: str | None = None
-    """Set start timestamp for filtering old events."""
-
-    _event_queue: asyncio.Queue[Event] | None = None
-    """Buffer queue for events."""
-
-    _pull_events_task: asyncio.Task | None = None
-    """Async Task for pulling Events from DB."""
+    """Data source used for saving and pulling events."""
 
     def __init(self):
 
@@ -92,57 +102,31 @@ class DbEventBroker(EventBroker):
         if self.data_source is None:
             self.data_source = active(DataSource)
 
-        if self._sent_event_buffer is None:
-            self._sent_event_buffer: deque[str] = deque(maxlen=100)
-
-        if self._from_timestamp is None:
-            self._from_timestamp = Timestamp.create()
-
-        if self._event_queue is None:
-            self._event_queue: asyncio.Queue[Event] = asyncio.Queue()
-
-        if self._pull_events_task is None:
-            self._pull_events_task: asyncio.Task | None = None
-
-    async def subscribe(self, topic: str, request: Request | None = None) -> AsyncGenerator[TDataDict, None]:
-
-        # Start pulling events from db in parallel async task
-        if self._pull_events_task is None:
-            pull_events_task = asyncio.create_task(_pull_events(self._event_queue, self.data_source))
-            pull_events_task.add_done_callback(_handle_async_task_exception)
-            self._pull_events_task = pull_events_task
-
-        while True:
-            if request and await request.is_disconnected():
-                _logger.debug("SSE: Client disconnected from SSE. Stop sending events.")
-                break
-
-            # Wait for the next event from the queue
-            yield await self._get_event()
-
-    async def _get_event(self) -> TDataDict:
-        # Await event in queue
-        while True:
-            event = await self._event_queue.get()
-
-            # Filter old or already sent events
-            if event.timestamp > self._from_timestamp and event.timestamp not in self._sent_event_buffer:
-                self._sent_event_buffer.append(event.timestamp)
-                event_data = DataSerializers.FOR_UI.serialize(event)
-                return event_data
-
-    async def publish(self, topic: str, event: Event) -> None:
-        return self.sync_publish(topic, event)
-
     def sync_publish(self, topic: str, event: Event) -> None:
-        # Publish event by just saving to DB
+        # Save to DB for the subscribers in other processes, then deliver to the subscribers in this process
         self.data_source.replace_one(event, commit=True)
-
-    async def close(self) -> None:
-        # Cancel pull events task
-        if self._pull_events_task is not None:
-            self._pull_events_task.cancel()
+        self._deliver(topic, event)
 
     def drop_test_broker(self) -> None:
-        # Do nothing. Rely on active Db teardown
-        self.check_drop_test_broker_preconditions()
+        # Stop pulling events for this broker and rely on active Db teardown for the saved events
+        LocalEventBroker.drop_test_broker(self)
+        with _PULL_EVENTS_TASKS_LOCK:
+            for channel in [x for x in _PULL_EVENTS_TASKS if x[:2] == (self.tenant.tenant_id, self.broker_id)]:
+                _cancel_task(_PULL_EVENTS_TASKS.pop(channel))
+
+    def _start_channel(self, topic: str) -> None:
+        # Start pulling events from db in parallel async task
+        channel = self._get_channel(topic)
+        with _PULL_EVENTS_TASKS_LOCK:
+            pull_events_task = _PULL_EVENTS_TASKS.get(channel)
+            if pull_events_task is None or pull_events_task.done():
+                pull_events_task = asyncio.create_task(_pull_events(self, topic))
+                pull_events_task.add_done_callback(_handle_async_task_exception)
+                _PULL_EVENTS_TASKS[channel] = pull_events_task
+
+    def _stop_channel(self, topic: str) -> None:
+        # Cancel pull events task when there are no subscribers left in this process
+        with _PULL_EVENTS_TASKS_LOCK:
+            pull_events_task = _PULL_EVENTS_TASKS.pop(self._get_channel(topic), None)
+        if pull_events_task is not None:
+            _cancel_task(pull_events_task)
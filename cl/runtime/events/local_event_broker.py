@@ -0,0 +1,123 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import AsyncGenerator
+from starlette.requests import Request
+from cl.runtime.events.event import Event
+from cl.runtime.events.event_broker import EventBroker
+from cl.runtime.records.data_mixin import TDataDict
+from cl.runtime.serializers.data_serializers import DataSerializers
+
+_logger = logging.getLogger(__name__)
+
+_sent_event_buffer_maxlen = 1000
+"""Max number of sent event timestamps remembered by each subscriber to skip duplicate events."""
+
+_SUBSCRIBERS: dict[tuple[str, str, str], list[tuple[asyncio.AbstractEventLoop, asyncio.Queue[Event]]]] = {}
+"""Event loop and queue of each subscriber in this process, indexed by (tenant_id, broker_id, topic)."""
+
+_SUBSCRIBERS_LOCK = Lock()
+"""Lock for the subscribers dictionary, events can be published from any thread."""
+
+
+@dataclass(slots=True, kw_only=True)
+class LocalEventBroker(EventBroker):
+    """
+    In-process event broker that delivers published events immediately to all subscribers in the same process.
+
+    Notes:
+        - Broker instances with the same broker_id and tenant share subscribers, including cloned instances
+        - Events can be published from any thread, they are passed to the event loop of each subscriber
+        - Events published by other processes are not delivered, use DbEventBroker for cross-process delivery
+    """
+
+    async def subscribe(self, topic: str, request: Request | None = None) -> AsyncGenerator[TDataDict, None]:
+
+        # Register the queue for this subscriber
+        channel = self._get_channel(topic)
+        queue: asyncio.Queue[Event] = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with _SUBSCRIBERS_LOCK:
+            subscribers = _SUBSCRIBERS.setdefault(channel, [])
+            subscribers.append(subscriber)
+            is_first = len(subscribers) == 1
+        if is_first:
+            self._start_channel(topic)
+
+        # Skip events already sent to this subscriber
+        sent_event_buffer: deque[str] = deque(maxlen=_sent_event_buffer_maxlen)
+        try:
+            while True:
+                if request and await request.is_disconnected():
+                    _logger.debug("SSE: Client disconnected from SSE. Stop sending events.")
+                    break
+
+                # Wait for the next event from the queue
+                event = await queue.get()
+                if event.timestamp not in sent_event_buffer:
+                    sent_event_buffer.append(event.timestamp)
+                    yield DataSerializers.FOR_UI.serialize(event)
+        finally:
+            # Unregister the queue for this subscriber
+            with _SUBSCRIBERS_LOCK:
+                subscribers = _SUBSCRIBERS.get(channel)
+                if subscribers is not None and subscriber in subscribers:
+                    subscribers.remove(subscriber)
+                is_last = not subscribers
+                if is_last:
+                    _SUBSCRIBERS.pop(channel, None)
+            if is_last:
+                self._stop_channel(topic)
+
+    async def publish(self, topic: str, event: Event) -> None:
+        return self.sync_publish(topic, event)
+
+    def sync_publish(self, topic: str, event: Event) -> None:
+        self._deliver(topic, event)
+
+    async def close(self) -> None:
+        # Subscriptions end when the generators returned by subscribe are closed
+        pass
+
+    def drop_test_broker(self) -> None:
+        self.check_drop_test_broker_preconditions()
+        with _SUBSCRIBERS_LOCK:
+            for channel in [x for x in _SUBSCRIBERS if x[:2] == (self.tenant.tenant_id, self.broker_id)]:
+                del _SUBSCRIBERS[channel]
+
+    def _deliver(self, topic: str, event: Event) -> None:
+        """Put the event into the queue of each subscriber to the topic in this process, callable from any thread."""
+        with _SUBSCRIBERS_LOCK:
+            subscribers = tuple(_SUBSCRIBERS.get(self._get_channel(topic), ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Event loop of the subscriber is closed, it will be removed when its generator is closed
+                pass
+
+    def _get_channel(self, topic: str) -> tuple[str, str, str]:
+        """Key in the subscribers dictionary for the topic."""
+        return self.tenant.tenant_id, self.broker_id, topic
+
+    def _start_channel(self, topic: str) -> None:
+        """Invoked from the event loop of the first subscriber when the topic has no other subscribers."""
+
+    def _stop_channel(self, topic: str) -> None:
+        """Invoked when the last subscriber to the topic disconnects."""
@@ -15,9 +15,12 @@
 import csv
 import os
 from dataclasses import dataclass
+from itertools import islice
+from threading import Lock
 from typing import Any
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
+from cl.runtime.db.db import DEFAULT_BATCH_SIZE
 from cl.runtime.file.reader import Reader
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.primitive.char_util import CharUtil
@@ -28,6 +31,9 @@ from cl.runtime.serializers.data_serializers import DataSerializers
 
 _SERIALIZER = DataSerializers.FOR_CSV
 
+_SAVE_LOCK = Lock()
+"""Serializes saving of batches when files are read in parallel, reading and deserialization are not locked."""
+
 
 @dataclass(slots=True, kw_only=True)
 class CsvFileReader(Reader):
@@ -36,55 +42,69 @@ class CsvFileReader(Reader):
     file_path: str
     """Absolute path to the CSV file including extension."""
 
-    def csv_to_db(self) -> None:
-        # Get current context
+    batch_size: int = DEFAULT_BATCH_SIZE
+    """Number of rows deserialized and saved to DB in one batch, limits memory use for large files."""
+
+    def csv_to_db(self) -> int:
+        """Read rows lazily and save them to DB in batches, return the number of rows."""
+
+        # Get record type name once per file
+        type_name = typename(self.get_record_type())
 
+        row_count = 0
         with open(self.file_path, mode="r", encoding="utf-8") as file:
             # The reader is an iterable of row dicts
             csv_reader = csv.DictReader(file)
-            row_dicts = [row_dict for row_dict in csv_reader]
-
-            invalid_rows = set(
-                index
-                for index, row_dict in enumerate(row_dicts)
-                for key in row_dict.keys()
-                if key is None or key == ""  # TODO: Add other checks for invalid keys
-            )
+            while row_dicts := list(islice(csv_reader, self.batch_size)):
 
-            if invalid_rows:
-                rows_str = "".join([f"Row: {invalid_row}\n" for invalid_row in invalid_rows])
-                raise RuntimeError(
-                    f"Misaligned values found in the following rows of CSV file: {self.file_path}\n"
-                    f"Check the placement of commas and double quotes.\n" + rows_str
+                invalid_rows = set(
+                    row_count + index
+                    for index, row_dict in enumerate(row_dicts)
+                    for key in row_dict.keys()
+                    if key is None or key == ""  # TODO: Add other checks for invalid keys
                 )
 
-            # Deserialize rows into records
-            records = [self._deserialize_row(row_dict) for row_dict in row_dicts]
+                if invalid_rows:
+                    rows_str = "".join([f"Row: {invalid_row}\n" for invalid_row in sorted(invalid_rows)])
+                    raise RuntimeError(
+                        f"Misaligned values found in the following rows of CSV file: {self.file_path}\n"
+                        f"Check the placement of commas and double quotes.\n" + rows_str
+                    )
 
-            # Save records to the specified database
-            if records:
-                active(DataSource).replace_many(records, commit=True)
+                # Deserialize rows into records
+                records = [self._deserialize_row(row_dict, type_name) for row_dict in row_dicts]
 
-    def _deserialize_row(self, row_dict: dict[str, Any]) -> RecordMixin:
-        """Deserialize row into a record."""
+                # Save records to the specified database
+                with _SAVE_LOCK:
+                    active(DataSource).replace_many(records, commit=True)
+                row_count += len(row_dicts)
+        return row_count
+
+    def get_record_type(self) -> type:
+        """Get record type from the filename."""
 
         # Record type is ClassName without extension in PascalCase
         filename = os.path.basename(self.file_path)
         filename_without_extension, _ = os.path.splitext(filename)
 
         if not CaseUtil.is_pascal_case(filename_without_extension):
-            dirname = os.path.dirname(filename)
+            dirname = os.path.dirname(self.file_path)
             raise RuntimeError(
                 f"Filename of a CSV preload file {filename} in directory {dirname} must be "
                 f"ClassName or its alias in PascalCase without module."
             )
 
         # Get record type
-        record_type = TypeInfo.from_type_name(filename_without_extension)
+        result = TypeInfo.from_type_name(filename_without_extension)
+        return result
+
+    @classmethod
+    def _deserialize_row(cls, row_dict: dict[str, Any], type_name: str) -> RecordMixin:
+        """Deserialize row into a record."""
 
         # Normalize chars and set None for empty strings
         row_dict = {CharUtil.normalize(k): CharUtil.normalize_or_none(v) for k, v in row_dict.items()}
-        row_dict["_type"] = typename(record_type)
+        row_dict["_type"] = type_name
 
         result = _SERIALIZER.deserialize(row_dict).build()
         return result
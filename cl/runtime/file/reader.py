@@ -27,5 +27,5 @@ class Reader(ReaderKey, RecordMixin, ABC):
         return ReaderKey(loader_id=self.loader_id).build().build()
 
     @abstractmethod
-    def csv_to_db(self) -> None:
-        """Read records from the specified files or directories and save them to the current context."""
+    def csv_to_db(self) -> int:
+        """Read records from the specified files or directories, save them to the current context and return count."""
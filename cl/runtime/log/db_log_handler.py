@@ -13,7 +13,10 @@
 # limitations under the License.
 
 import logging
+import threading
 import traceback
+import weakref
+from collections import deque
 from logging import LogRecord
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
@@ -21,10 +24,65 @@ from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.log.log_message import LogMessage
 from cl.runtime.log.user_log_message import UserLogMessage
 from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.settings.log_settings import LogSettings
+
+_HANDLERS: weakref.WeakSet["DbLogHandler"] = weakref.WeakSet()
+"""Handler instances created in this process, used to flush all of them on task completion."""
 
 
 class DbLogHandler(logging.Handler):
-    """Handler to save logs to db."""
+    """
+    Handler to save logs to db.
+
+    Notes:
+        - When batch_size is 1, each message is saved on the calling thread before returning from the logging call
+        - When batch_size > 1, messages are queued together with the data source active at emit time and saved
+          with replace_many on a background thread when batch_size messages are queued, flush_interval_sec
+          has elapsed, or when flush is called on task completion and shutdown
+        - Messages emitted when max_backlog messages are already queued are dropped and counted
+    """
+
+    def __init__(
+        self,
+        level: int | str = logging.NOTSET,
+        *,
+        batch_size: int | None = None,
+        flush_interval_sec: float | None = None,
+        max_backlog: int | None = None,
+    ):
+        """Parameters not specified explicitly are taken from LogSettings."""
+        super().__init__(level)
+        log_settings = LogSettings.instance()
+        self._batch_size = batch_size if batch_size is not None else log_settings.log_db_batch_size
+        self._flush_interval_sec = (
+            flush_interval_sec if flush_interval_sec is not None else log_settings.log_db_flush_interval_sec
+        )
+        self._max_backlog = max_backlog if max_backlog is not None else log_settings.log_db_max_backlog
+        if self._batch_size < 1:
+            raise RuntimeError(f"DbLogHandler batch_size={self._batch_size} must be positive.")
+
+        # Queue of (data source, log message) pairs and the condition used to wake up the flush thread
+        self._queue: deque[tuple[DataSource, LogMessage]] = deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._flush_thread: threading.Thread | None = None
+        self._closed = False
+        self._dropped_count = 0
+        _HANDLERS.add(self)
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """Save queued messages for all handler instances in this process, invoked on task completion."""
+        for handler in list(_HANDLERS):
+            handler.flush()
+
+    def get_backlog_count(self) -> int:
+        """Number of queued messages that are not yet saved to DB."""
+        return len(self._queue)
+
+    def get_dropped_count(self) -> int:
+        """Number of messages dropped because max_backlog was exceeded or saving them to DB has failed."""
+        return self._dropped_count
 
     @classmethod
     def _create_log_message(cls, record: LogRecord) -> LogMessage:
@@ -66,6 +124,71 @@ class DbLogHandler(logging.Handler):
         try:
             # Save LogMessage to current db context.
             log_message = self._create_log_message(record)
-            active(DataSource).replace_one(log_message, commit=True)
+            if self._batch_size == 1:
+                active(DataSource).replace_one(log_message, commit=True)
+                return
+
+            # Queue together with the data source active at emit time
+            with self._condition:
+                if self._closed or len(self._queue) >= self._max_backlog:
+                    self._dropped_count += 1
+                    return
+                self._queue.append((active(DataSource), log_message))
+                if self._flush_thread is None:
+                    self._flush_thread = threading.Thread(target=self._flush_loop, name="DbLogHandler", daemon=True)
+                    self._flush_thread.start()
+                elif len(self._queue) >= self._batch_size:
+                    self._condition.notify()
         except Exception:
             self.handleError(record)
+
+    def flush(self) -> None:
+        """Save all queued messages on the calling thread."""
+        while self._queue:
+            self._flush_batch()
+
+    def close(self) -> None:
+        """Save all queued messages and stop the flush thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+        self.flush()
+        _HANDLERS.discard(self)
+        super().close()
+
+    def _flush_loop(self) -> None:
+        """Save queued messages in batches until the handler is closed, runs on the flush thread."""
+        while True:
+            with self._condition:
+                if len(self._queue) < self._batch_size and not self._closed:
+                    self._condition.wait(self._flush_interval_sec)
+                if self._closed:
+                    return
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        """Save up to batch_size queued messages, one replace_many call for each data source."""
+        with self._flush_lock:
+            with self._condition:
+                batch = [self._queue.popleft() for _ in range(min(self._batch_size, len(self._queue)))]
+            if not batch:
+                return
+
+            # Group by data source preserving order, identity is used because data sources are not hashable
+            messages_by_data_source: dict[int, tuple[DataSource, list[LogMessage]]] = {}
+            for data_source, log_message in batch:
+                messages_by_data_source.setdefault(id(data_source), (data_source, []))[1].append(log_message)
+
+            for data_source, log_messages in messages_by_data_source.values():
+                try:
+                    # Use a separate data source with the same DB, dataset and tenant so that pending
+                    # operations of the data source captured at emit time are not committed by this thread
+                    batch_data_source = DataSource(
+                        db=data_source.db, dataset=data_source.dataset, tenant=data_source.tenant
+                    ).build()
+                    batch_data_source.replace_many(log_messages, commit=True)
+                except Exception:  # noqa
+                    # Logging errors must not propagate, count messages that could not be saved as dropped
+                    self._dropped_count += len(log_messages)
@@ -12,28 +12,75 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import io
+import multiprocessing
 import os
 from abc import ABC
 from abc import abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
 from dataclasses import dataclass
+from threading import Lock
+from threading import RLock
 import matplotlib
+import orjson
 from matplotlib import pyplot as plt
 from cl.runtime.contexts.context_manager import active_or_default
 from cl.runtime.plots.matplotlib_util import MatplotlibUtil
 from cl.runtime.plots.plot import Plot
 from cl.runtime.qa.qa_util import QaUtil
+from cl.runtime.serializers.data_serializers import DataSerializers
 from cl.runtime.server.env import Env
+from cl.runtime.settings.plot_settings import PlotSettings
 from cl.runtime.ui.ui_app_state import UiAppState
 from cl.runtime.views.png_view import PngView
 
 # Use non-UI matplotlib backend to prevent Tkl/Tk errors
 matplotlib.use("Agg")
 
+_PLOT_SERIALIZER = DataSerializers.FOR_JSON
+"""Serializer for the plot record used to compute the image cache key and to pass the plot to a worker process."""
+
+_PYPLOT_LOCK = RLock()
+"""Lock for creating and saving figures because pyplot state is not thread-safe."""
+
+_DARK_THEME: ContextVar[bool | None] = ContextVar("_DARK_THEME", default=None)
+"""Overrides is_dark_theme while rendering so the theme is the same as in the cache key, including worker processes."""
+
+_IMAGE_CACHE: OrderedDict[str, bytes] = OrderedDict()
+"""Rendered images in the order of use, indexed by the hash of the serialized plot and render parameters."""
+
+_IMAGE_CACHE_BYTES: int = 0
+"""Total size of the images in _IMAGE_CACHE."""
+
+_IMAGE_CACHE_LOCK = Lock()
+"""Lock for _IMAGE_CACHE and _IMAGE_CACHE_BYTES."""
+
+_PROCESS_POOL: ProcessPoolExecutor | None = None
+"""Worker processes for rendering plots, created on first use if PlotSettings.plot_render_max_workers is positive."""
+
+_PROCESS_POOL_LOCK = Lock()
+"""Lock for creating the process pool."""
+
+
+def _render_serialized(data: dict, format_: str, *, dark_theme: bool, transparent: bool, tight: bool) -> bytes:
+    """Deserialize the plot and render it, runs in a worker process."""
+    plot = _PLOT_SERIALIZER.deserialize(data).build()
+    return plot._render_image(format_, dark_theme=dark_theme, transparent=transparent, tight=tight)  # noqa
+
 
 @dataclass(slots=True, kw_only=True)
 class MatplotlibPlot(Plot, ABC):
-    """Base class for plot objects created using Matplotlib package."""
+    """
+    Base class for plot objects created using Matplotlib package.
+
+    Notes:
+        - Rendered images are cached by the hash of the plot fields (except plot_id), theme and render parameters
+        - Figures are closed after rendering, including when an error occurs
+        - Rendering is performed in worker processes if PlotSettings.plot_render_max_workers is positive
+    """
 
     @abstractmethod
     def _create_figure(self) -> plt.Figure:
@@ -43,19 +90,12 @@ class MatplotlibPlot(Plot, ABC):
         """Return a view object for the plot, implement using 'create_figure' method."""
         self.check_frozen()
 
-        # Create figure
-        fig = self._create_figure()
-
         # Check if transparency required
         is_dark_theme = UiAppState.get_current_user_app_theme() == "Dark"  # TODO: Move to PlotSettings
         transparent = is_dark_theme
 
-        # Save to bytes
-        png_buffer = io.BytesIO()
-        fig.savefig(png_buffer, format="png", transparent=transparent, metadata=MatplotlibUtil.no_png_metadata())
-
         # Get the PNG image bytes and wrap in PngView
-        png_bytes = png_buffer.getvalue()
+        png_bytes = self.render("png", transparent=transparent)
         result = PngView(png_bytes=png_bytes)
         return result
 
@@ -65,8 +105,6 @@ class MatplotlibPlot(Plot, ABC):
 
         if format_ not in ("png", "svg"):
             raise RuntimeError(f"Unsupported figure save format: {format_}.")
-        # Create figure
-        fig = self._create_figure()
 
         # Create directory if does not exist
         base_dir = QaUtil.get_test_dir_from_call_stack()  # TODO: This must also work outside tests
@@ -77,27 +115,65 @@ class MatplotlibPlot(Plot, ABC):
         if self.plot_id is None or self.plot_id == "":
             raise RuntimeError("Cannot save figure because 'plot_id' field is not set.")
 
-        # Transparent in dark theme
-        transparent = self.is_dark_theme()
-
-        # Save
+        # Render and save, transparent in dark theme
         file_path = os.path.join(base_dir, f"{self.plot_id}.{format_}")
-        metadata = MatplotlibUtil.no_svg_metadata() if format_ == "svg" else MatplotlibUtil.no_png_metadata()
-        matplotlib.rcParams["svg.hashsalt"] = ""  # prevent random hash on svg generation
-        fig.savefig(
-            file_path,
-            transparent=transparent,
-            metadata=metadata,
-            dpi=100,
-            format=format_,
-            bbox_inches="tight",
-            pad_inches=0.1,
-        )
+        image_bytes = self.render(format_, tight=True)
+        with open(file_path, "wb") as file:
+            file.write(image_bytes)
+
+    def render(self, format_: str = "png", *, transparent: bool | None = None, tight: bool = False) -> bytes:
+        """
+        Return image bytes in PNG or SVG format, use cached image if the same plot has already been rendered.
+
+        Args:
+            format_: Image format, 'png' or 'svg'
+            transparent: Transparent background, defaults to is_dark_theme()
+            tight: Use tight bounding box with padding and 100 dpi, otherwise use figure defaults
+        """
+        self.check_frozen()
+
+        if format_ not in ("png", "svg"):
+            raise RuntimeError(f"Unsupported figure save format: {format_}.")
+
+        # Cache key includes all fields except plot_id which does not affect the image
+        dark_theme = self.is_dark_theme()
+        if transparent is None:
+            transparent = dark_theme
+        data = _PLOT_SERIALIZER.serialize(self)
+        key_data = {k: v for k, v in data.items() if k != "plot_id"}
+        key_bytes = orjson.dumps([key_data, format_, dark_theme, transparent, tight])
+        key = hashlib.blake2b(key_bytes, digest_size=16).hexdigest()
+
+        if (result := self._get_cached_image(key)) is not None:
+            return result
+
+        if (max_workers := PlotSettings.instance().plot_render_max_workers) > 0:
+            # Render in a worker process from the serialized plot
+            future = self._get_process_pool(max_workers).submit(
+                _render_serialized, data, format_, dark_theme=dark_theme, transparent=transparent, tight=tight
+            )
+            result = future.result()
+        else:
+            result = self._render_image(format_, dark_theme=dark_theme, transparent=transparent, tight=tight)
+
+        self._add_cached_image(key, result)
+        return result
+
+    @classmethod
+    def clear_image_cache(cls) -> None:
+        """Remove all rendered images from cache."""
+        global _IMAGE_CACHE_BYTES
+        with _IMAGE_CACHE_LOCK:
+            _IMAGE_CACHE.clear()
+            _IMAGE_CACHE_BYTES = 0
 
     @classmethod
     def is_dark_theme(cls) -> bool:
         """True if dark UI theme when invoked from a process, and False inside tests."""
-        if active_or_default(Env).is_test():
+        if (result := _DARK_THEME.get()) is not None:
+            # Theme set during rendering
+            pass
+        elif active_or_default(Env).is_test():
             result = False
         else:
             result = UiAppState.get_current_user_app_theme() == "Dark"  # TODO: Move to PlotSettings
@@ -108,3 +184,63 @@ class MatplotlibPlot(Plot, ABC):
         """Get value to be set as matplotlib.pyplot theme."""
         theme = "dark_background" if cls.is_dark_theme() else "default"
         return theme
+
+    def _render_image(self, format_: str, *, dark_theme: bool, transparent: bool, tight: bool) -> bytes:
+        """Create figure, save it to bytes and close all figures created in the process."""
+        with _PYPLOT_LOCK:
+            token = _DARK_THEME.set(dark_theme)
+            fig_nums = set(plt.get_fignums())
+            try:
+                fig = self._create_figure()
+                if format_ == "svg":
+                    metadata = MatplotlibUtil.no_svg_metadata()
+                    matplotlib.rcParams["svg.hashsalt"] = ""  # prevent random hash on svg generation
+                else:
+                    metadata = MatplotlibUtil.no_png_metadata()
+                if tight:
+                    savefig_kwargs = {"dpi": 100, "bbox_inches": "tight", "pad_inches": 0.1}
+                else:
+                    savefig_kwargs = {}
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format=format_, transparent=transparent, metadata=metadata, **savefig_kwargs)
+                return buffer.getvalue()
+            finally:
+                # Close figures including those created before an error, figures are not released by pyplot otherwise
+                for fig_num in set(plt.get_fignums()) - fig_nums:
+                    plt.close(fig_num)
+                _DARK_THEME.reset(token)
+
+    @classmethod
+    def _get_cached_image(cls, key: str) -> bytes | None:
+        """Return cached image and move it to the end of LRU order, or None if not found."""
+        with _IMAGE_CACHE_LOCK:
+            if (result := _IMAGE_CACHE.get(key)) is not None:
+                _IMAGE_CACHE.move_to_end(key)
+            return result
+
+    @classmethod
+    def _add_cached_image(cls, key: str, image: bytes) -> None:
+        """Add image to cache, evicting the least recently used images if plot_cache_max_bytes is exceeded."""
+        global _IMAGE_CACHE_BYTES
+        max_bytes = PlotSettings.instance().plot_cache_max_bytes
+        if len(image) > max_bytes:
+            return
+        with _IMAGE_CACHE_LOCK:
+            if key in _IMAGE_CACHE:
+                return
+            _IMAGE_CACHE[key] = image
+            _IMAGE_CACHE_BYTES += len(image)
+            while _IMAGE_CACHE_BYTES > max_bytes:
+                _, evicted = _IMAGE_CACHE.popitem(last=False)
+                _IMAGE_CACHE_BYTES -= len(evicted)
+
+    @classmethod
+    def _get_process_pool(cls, max_workers: int) -> ProcessPoolExecutor:
+        """Return the process pool for rendering, created on first call using spawn to avoid forking threads."""
+        global _PROCESS_POOL
+        if (result := _PROCESS_POOL) is None:
+            with _PROCESS_POOL_LOCK:
+                if (result := _PROCESS_POOL) is None:
+                    mp_context = multiprocessing.get_context("spawn")
+                    result = _PROCESS_POOL = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context)
+        return result
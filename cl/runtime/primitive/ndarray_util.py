@@ -0,0 +1,79 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+import numpy as np
+
+_MAGIC = b"NDA1"
+"""Prefix identifying the binary ndarray format and its version."""
+
+_ALIGNMENT = 16
+"""Header is padded to a multiple of this number of bytes so the array buffer is aligned."""
+
+
+class NdarrayUtil:
+    """Binary encoding of NumPy arrays that preserves dtype and shape."""
+
+    @classmethod
+    def to_bytes(cls, data: np.ndarray) -> bytes:
+        """
+        Encode array as bytes in the form magic, dtype length, ndim, dtype string, shape, padding, raw C-order buffer.
+        The buffer is copied once into the result without conversion to Python objects.
+        """
+        if data.dtype.hasobject:
+            raise RuntimeError(f"Cannot encode ndarray with dtype={data.dtype} because it contains Python objects.")
+
+        # Header with dtype string (includes byte order, e.g. '<f8') and shape as unsigned 64-bit little-endian
+        dtype_str = data.dtype.str.encode("ascii")
+        header = b"".join(
+            (
+                _MAGIC,
+                struct.pack("<BB", len(dtype_str), data.ndim),
+                dtype_str,
+                struct.pack(f"<{data.ndim}Q", *data.shape),
+            )
+        )
+        header += b"\0" * (-len(header) % _ALIGNMENT)
+
+        # View the contiguous buffer as flat bytes, copying only if the array is not C-contiguous
+        buffer = np.ascontiguousarray(data).reshape(-1).view(np.uint8)
+        return b"".join((header, buffer))
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | memoryview) -> np.ndarray:
+        """
+        Decode bytes created by to_bytes without copying the array buffer,
+        the result is read-only when the argument is an immutable bytes object.
+        """
+        view = memoryview(data)
+        if bytes(view[: len(_MAGIC)]) != _MAGIC:
+            raise RuntimeError("Cannot decode ndarray because the data is not in binary ndarray format.")
+
+        offset = len(_MAGIC)
+        dtype_len, ndim = struct.unpack_from("<BB", view, offset)
+        offset += 2
+        dtype = np.dtype(bytes(view[offset : offset + dtype_len]).decode("ascii"))
+        offset += dtype_len
+        shape = struct.unpack_from(f"<{ndim}Q", view, offset)
+        offset += 8 * ndim
+        offset += -offset % _ALIGNMENT
+
+        # Check that buffer size matches dtype and shape before creating a view
+        expected_size = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        if (actual_size := len(view) - offset) != expected_size:
+            raise RuntimeError(
+                f"Cannot decode ndarray with dtype={dtype} and shape={shape} because\n"
+                f"buffer size {actual_size} does not match the expected size {expected_size}."
+            )
+        return np.frombuffer(view, dtype=dtype, offset=offset).reshape(shape)
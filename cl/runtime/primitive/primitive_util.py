@@ -52,12 +52,11 @@ class PrimitiveUtil(BuilderUtil):
 
         # To allow ABCMeta and other metaclasses derived from type to pass the check
         data_type = typeof(data)
-        data_type_name = typename(data_type)
 
         # Ensure there is no remaining component (type hint is not a sequence or mapping)
         if type_hint is not None and type_hint.remaining:
             raise RuntimeError(
-                f"Data is an instance of a primitive class {data_type_name} which is\n"
+                f"Data is an instance of a primitive class {typename(data_type)} which is\n"
                 f"incompatible with a composite type hint:\n"
                 f"{type_hint.to_str()}."
             )
@@ -100,7 +99,7 @@ class PrimitiveUtil(BuilderUtil):
                 location_str = cls._get_location_str(
                     typename(type(data)), type_hint, outer_type_name=outer_type_name, field_name=field_name
                 )
-                raise RuntimeError(f"Subtype {subtype} is not valid for data type {data_type_name}.{location_str}")
+                raise RuntimeError(f"Subtype {subtype} is not valid for data type {typename(data_type)}.{location_str}")
         elif schema_type is int:
             # Perform range check based on subtype
             if subtype is None:
@@ -115,7 +114,7 @@ class PrimitiveUtil(BuilderUtil):
                 location_str = cls._get_location_str(
                     typename(type(data)), type_hint, outer_type_name=outer_type_name, field_name=field_name
                 )
-                raise RuntimeError(f"Subtype {subtype} is not valid for data type {data_type_name}.{location_str}")
+                raise RuntimeError(f"Subtype {subtype} is not valid for data type {typename(data_type)}.{location_str}")
         elif schema_type is float:
             # Convert to float in case the argument is int
             return float(data)
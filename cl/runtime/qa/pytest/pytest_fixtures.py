@@ -24,6 +24,7 @@ from bson import Binary
 from cl.runtime.contexts.context_manager import activate
 from cl.runtime.db.data_source import DataSource
 from cl.runtime.db.db import Db
+from cl.runtime.db.local.local_cache import LocalCache
 from cl.runtime.db.mongo.basic_mongo_db import BasicMongoDb
 from cl.runtime.db.mongo.basic_mongo_mock_db import BasicMongoMockDb
 from cl.runtime.db.sql.sqlite_db import SqliteDb
@@ -94,6 +95,12 @@ def sqlite_db_fixture(request: FixtureRequest) -> Iterator[Db]:
     yield from _db_fixture(request, db_type=SqliteDb)
 
 
+@pytest.fixture(scope="function")
+def local_cache_fixture(request: FixtureRequest) -> Iterator[Db]:
+    """Pytest module fixture to setup and teardown temporary in-memory databases using LocalCache."""
+    yield from _db_fixture(request, db_type=LocalCache)
+
+
 @pytest.fixture(scope="function")
 def basic_mongo_db_fixture(request: FixtureRequest) -> Iterator[Db]:
     """
@@ -114,7 +121,8 @@ def basic_mongo_mock_db_fixture(request: FixtureRequest) -> Iterator[Db]:
         yield from _db_fixture(request, db_type=BasicMongoMockDb)
 
 
-@pytest.fixture(scope="function", params=[SqliteDb, BasicMongoMockDb])  # TODO: Load the list from settings instead
+# TODO: Load the list from settings instead
+@pytest.fixture(scope="function", params=[SqliteDb, BasicMongoMockDb, LocalCache])
 def multi_db_fixture(request) -> Iterator[Db]:
     """
     Pytest module fixture to setup and teardown temporary databases of all types
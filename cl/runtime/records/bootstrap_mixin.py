@@ -16,11 +16,11 @@ from abc import ABC
 from typing import Self
 from memoization import cached
 from cl.runtime.records.bootstrap_util import BootstrapUtil
-from cl.runtime.records.builder_mixin import BuilderMixin
+from cl.runtime.records.slots_builder_mixin import SlotsBuilderMixin
 from cl.runtime.serializers.slots_util import SlotsUtil
 
 
-class BootstrapMixin(BuilderMixin, ABC):
+class BootstrapMixin(SlotsBuilderMixin, ABC):
     """Dataclasses base for lightweight classes that do not require validation against the schema."""
 
     __slots__ = ()
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import weakref
 from abc import ABC
 from abc import abstractmethod
 from typing import Self
@@ -20,20 +19,23 @@ from cl.runtime.records.cast_util import CastUtil
 from cl.runtime.records.protocols import TObj
 from cl.runtime.records.typename import typename
 
-_FROZEN_IDS = set()
-"""Global registry to track frozen status of Python object id's."""
-
-_FROZEN_FINALIZERS = dict()
-"""Adding a finalizer to this global dictionary prevents it from being collected before it is executed."""
-
 
 # TODO: Consider renaming to BuilderMixin
 class BuilderMixin(ABC):
-    """Framework-neutral mixin for freezable fields and builder pattern support."""
+    """
+    Framework-neutral mixin for freezable fields and builder pattern support.
+
+    Notes:
+        Derived types must provide the protected attribute '_frozen' that is False before mark_frozen is called,
+        a slot in SlotsBuilderMixin or a private attribute for frameworks that do not permit additional slots.
+    """
 
     __slots__ = ("__weakref__",)
     """To prevent creation of __dict__ in derived types."""
 
+    _frozen: bool
+    """True once the instance has been frozen, declared here and provided by the derived type."""
+
     @classmethod
     def default(cls) -> Self:
         """Create a default instance of this type, derived types may override."""
@@ -45,17 +47,15 @@ class BuilderMixin(ABC):
 
     def is_frozen(self) -> bool:
         """Return True if the instance has been frozen. Once frozen, the instance cannot be unfrozen."""
-        return id(self) in _FROZEN_IDS
+        return self._frozen
 
     def mark_frozen(self) -> Self:
         """
         Mark the instance as frozen without actually freezing it, which is the responsibility of build method.
         The action of marking the instance frozen cannot be reversed. Can be called more than once.
         """
-        # Add Python object ID of self the global frozen ID registry
-        _FROZEN_IDS.add(oid := id(self))
-        # Register a finalizer to remove object ID from the registry when the object is finalized
-        _FROZEN_FINALIZERS[oid] = weakref.finalize(self, _FROZEN_IDS.discard, oid)
+        # Assignment to a protected field is permitted for a frozen instance and is atomic
+        self._frozen = True
         return self
 
     def check_frozen(self) -> None:
@@ -65,7 +65,7 @@ class BuilderMixin(ABC):
 
     def __setattr__(self, key, value):
         """Raise an error on attempt to modify a public field for a frozen instance."""
-        if self.is_frozen() and not key.startswith("_"):
+        if self._frozen and not key.startswith("_"):
             type_name = typename(type(self))
             raise RuntimeError(f"Cannot modify public field {type_name}.{key} because the instance is frozen.")
         object.__setattr__(self, key, value)
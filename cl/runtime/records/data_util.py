@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from dataclasses import dataclass
 from types import NoneType
 from typing import Any
+from typing import Callable
+import numpy as np
 from frozendict import frozendict
-from more_itertools import consume
 from cl.runtime.primitive.enum_util import EnumUtil
 from cl.runtime.primitive.primitive_util import PrimitiveUtil
 from cl.runtime.records.builder_util import BuilderUtil
@@ -34,6 +36,30 @@ from cl.runtime.records.typename import typename
 from cl.runtime.schema.type_hint import TypeHint
 
 
+@dataclass(slots=True, frozen=True)
+class _BuildPlan:
+    """Information about a data type used by build, computed once per type."""
+
+    init_methods: tuple[Callable[[Any], None], ...]
+    """Unique '__init' methods in the order of invocation from base to derived."""
+
+    type_name: str
+    """Name of the data type for error messages."""
+
+    fields: tuple[tuple[str, TypeHint], ...]
+    """Name and type hint of each field in the order of declaration."""
+
+
+_BUILD_PLAN_DICT: dict[type, _BuildPlan] = {}
+"""Build plan for each data type, added on first build of the type."""
+
+_FIELD_UTIL_DICT: dict[type, type[BuilderUtil] | None] = {}
+"""Helper class to build a non-empty field value for each value type, None for data, containers and arrays."""
+
+_TRUSTED_CONTAINER_TYPES = frozenset((list, tuple, dict, frozendict, np.ndarray))
+"""Types of field values that are made immutable by trusted build."""
+
+
 class DataUtil(BuilderUtil):
     """Helper methods for build functionality in DataMixin."""
 
@@ -97,19 +123,12 @@ class DataUtil(BuilderUtil):
                 # prevent repeat initialization of shared instances
                 return data
 
+            # Get the ordered '__init' methods and the fields of data_type, computed once per type
+            build_plan = cls._get_build_plan(data_type)
+
             # Invoke '__init' in the order from base to derived
-            # Keep track of which init methods in class hierarchy were already called
-            invoked = set()
-            # Reverse the MRO to start from base to derived
-            for type_ in reversed(data_type.__mro__):
-                # Remove leading underscores from the class name when generating mangling for __init
-                # to support classes that start from _ to mark them as protected
-                type_init = getattr(type_, f"_{type_.__name__.lstrip('_')}__init", None)
-                if type_init is not None and (qualname := type_init.__qualname__) not in invoked:
-                    # Add qualname to invoked to prevent executing the same method twice
-                    invoked.add(qualname)
-                    # Invoke '__init' method if it exists, otherwise do nothing
-                    type_init(data)
+            for type_init in build_plan.init_methods:
+                type_init(data)
 
             # Perform check against the schema if provided irrespective of the type inclusion setting
             if schema_type is not None and schema_type != data_type:
@@ -123,62 +142,109 @@ class DataUtil(BuilderUtil):
                     )
 
             # Freeze or make immutable all public fields, checking against the schema
-            data_type_spec = data.get_type_spec()
-            consume(
-                setattr(
-                    data,
-                    field_name := field_spec.field_name,
-                    (
-                        cls._checked_empty(  # Validates vs. the type hint while is_empty does not
-                            field_value,
-                            field_spec.field_type_hint,
-                            outer_type_name=typename(data_type),
-                            field_name=field_name,
-                        )
-                        if is_empty(field_value := getattr(data, field_name))
-                        else (
-                            PrimitiveUtil.build_(
-                                field_value,
-                                field_spec.field_type_hint,
-                                outer_type_name=typename(data_type),
-                                field_name=field_name,
-                            )
-                            if is_primitive_type(type(field_value))
-                            else (
-                                EnumUtil.build_(
-                                    field_value,
-                                    field_spec.field_type_hint,
-                                    outer_type_name=typename(data_type),
-                                    field_name=field_name,
-                                )
-                                if is_enum_type(type(field_value))
-                                else (
-                                    PredicateUtil.build_(
-                                        field_value,
-                                        field_spec.field_type_hint,
-                                        outer_type_name=typename(data_type),
-                                        field_name=field_name,
-                                    )
-                                    if is_predicate_type(type(field_value))
-                                    else cls.build_(
-                                        field_value,
-                                        field_spec.field_type_hint,
-                                        outer_type_name=typename(data_type),
-                                        field_name=field_name,
-                                    )
-                                )
-                            )
-                        )
-                    ),
-                )
-                for field_spec in data_type_spec.fields
-            )
+            outer_type_name = build_plan.type_name
+            for field_name, field_type_hint in build_plan.fields:
+                field_value = getattr(data, field_name)
+                if is_empty(field_value):
+                    # Validates vs. the type hint while is_empty does not
+                    field_value = cls._checked_empty(
+                        field_value, field_type_hint, outer_type_name=outer_type_name, field_name=field_name
+                    )
+                else:
+                    # Use the helper class for the type of field value, or this class if None
+                    field_util = cls._get_field_util(type(field_value)) or cls
+                    field_value = field_util.build_(
+                        field_value, field_type_hint, outer_type_name=outer_type_name, field_name=field_name
+                    )
+                setattr(data, field_name, field_value)
 
             # Mark as frozen and return
             return data.mark_frozen()
         else:
             raise cls._unsupported_object_error(data)
 
+    @classmethod
+    def trusted_build_(cls, data: Any) -> Any:
+        """
+        Build data constructed from field values that were already validated against the schema,
+        invoking '__init' methods and making containers immutable but skipping repeated validation.
+
+        Notes:
+            - Use only for the output of deserializers reading data written by a serializer such as DB records
+            - Field values of data, key or record types must already be frozen
+        """
+        if data.is_frozen():
+            # Stop further processing and return if the object has already been frozen
+            return data
+
+        # Invoke '__init' in the order from base to derived
+        build_plan = cls._get_build_plan(type(data))
+        for type_init in build_plan.init_methods:
+            type_init(data)
+
+        # Make containers immutable without validating their elements
+        for field_name, _ in build_plan.fields:
+            if type(field_value := getattr(data, field_name)) in _TRUSTED_CONTAINER_TYPES:
+                setattr(data, field_name, cls._trusted_freeze(field_value))
+
+        # Mark as frozen and return
+        return data.mark_frozen()
+
+    @classmethod
+    def _trusted_freeze(cls, data: Any) -> Any:
+        """Convert sequences to tuples, mappings to frozendicts and make arrays non-writeable, recursively."""
+        if (data_type := type(data)) in (list, tuple):
+            return tuple(cls._trusted_freeze(v) if type(v) in _TRUSTED_CONTAINER_TYPES else v for v in data)
+        elif data_type in (dict, frozendict):
+            return frozendict(
+                (k, cls._trusted_freeze(v) if type(v) in _TRUSTED_CONTAINER_TYPES else v)
+                for k, v in data.items()
+                if not is_empty(v)
+            )
+        else:
+            # Make non-writeable and return the same object
+            data.flags.writeable = False
+            return data
+
+    @classmethod
+    def _get_build_plan(cls, data_type: type) -> _BuildPlan:
+        """Get the ordered '__init' methods and the fields of data_type, computed on first call for each type."""
+        if (result := _BUILD_PLAN_DICT.get(data_type)) is None:
+            # Keep track of which init methods in class hierarchy were already added
+            init_methods = {}
+            # Reverse the MRO to start from base to derived
+            for type_ in reversed(data_type.__mro__):
+                # Remove leading underscores from the class name when generating mangling for __init
+                # to support classes that start from _ to mark them as protected
+                type_init = getattr(type_, f"_{type_.__name__.lstrip('_')}__init", None)
+                if type_init is not None:
+                    # Use qualname to prevent executing the same method twice
+                    init_methods.setdefault(type_init.__qualname__, type_init)
+            result = _BuildPlan(
+                init_methods=tuple(init_methods.values()),
+                type_name=typename(data_type),
+                fields=tuple((x.field_name, x.field_type_hint) for x in data_type.get_type_spec().fields),
+            )
+            _BUILD_PLAN_DICT[data_type] = result
+        return result
+
+    @classmethod
+    def _get_field_util(cls, value_type: type) -> type[BuilderUtil] | None:
+        """Get helper class to build a non-empty field value of value_type, or None for data, containers and arrays."""
+        try:
+            return _FIELD_UTIL_DICT[value_type]
+        except KeyError:
+            if is_primitive_type(value_type):
+                result = PrimitiveUtil
+            elif is_enum_type(value_type):
+                result = EnumUtil
+            elif is_predicate_type(value_type):
+                result = PredicateUtil
+            else:
+                result = None
+            _FIELD_UTIL_DICT[value_type] = result
+            return result
+
     @classmethod
     def _checked_empty(  # Move to NoneUtils
         cls,
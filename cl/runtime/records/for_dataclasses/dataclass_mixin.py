@@ -17,13 +17,14 @@ from abc import ABC
 from typing import Self
 from memoization import cached
 from cl.runtime.records.data_mixin import DataMixin
+from cl.runtime.records.slots_builder_mixin import SlotsBuilderMixin
 from cl.runtime.records.typename import typename
 from cl.runtime.schema.data_spec import DataSpec
 from cl.runtime.schema.field_spec import FieldSpec
 from cl.runtime.serializers.slots_util import SlotsUtil
 
 
-class DataclassMixin(DataMixin, ABC):
+class DataclassMixin(DataMixin, SlotsBuilderMixin, ABC):
     """Implements abstract methods in DataMixin for dataclass-based data, key or record classes."""
 
     __slots__ = ()
@@ -32,6 +32,9 @@ class PydanticMixin(BaseModel, DataMixin, ABC):
         arbitrary_types_allowed=True, alias_generator=CaseUtil.snake_to_pascal_case, populate_by_name=True
     )
 
+    _frozen: bool = False
+    """True once the instance has been frozen, a private attribute because BaseModel does not permit added slots."""
+
     def __init__(self, *args, **kwargs):
         # Support positional args in model __init__
         fields = list(self.model_fields.keys())
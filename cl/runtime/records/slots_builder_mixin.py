@@ -0,0 +1,30 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from abc import ABC
+from typing import Self
+from cl.runtime.records.builder_mixin import BuilderMixin
+
+
+class SlotsBuilderMixin(BuilderMixin, ABC):
+    """Builder pattern support for slots-based classes, stores the frozen state in a slot of each instance."""
+
+    __slots__ = ("_frozen",)
+
+    def __new__(cls, *args, **kwargs) -> Self:
+        # Initialize the frozen flag before __init__ assigns fields, which checks the flag in __setattr__
+        result = super().__new__(cls)
+        object.__setattr__(result, "_frozen", False)
+        return result
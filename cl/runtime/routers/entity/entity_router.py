@@ -23,6 +23,7 @@ from cl.runtime.routers.entity.panel_request import PanelRequest
 from cl.runtime.routers.entity.panel_response_util import PanelResponseUtil
 from cl.runtime.routers.entity.panels_request import PanelsRequest
 from cl.runtime.routers.entity.panels_response_item import PanelsResponseItem
+from cl.runtime.routers.executor_util import ExecutorUtil
 
 router = APIRouter()
 
@@ -34,14 +35,15 @@ async def get_panels(
     key: Annotated[str | None, Query(description="Primary key fields in semicolon-delimited format")] = None,
 ) -> list[PanelsResponseItem]:
     """List of panels for the specified record."""
-    return PanelsResponseItem.get_response(
+    return await ExecutorUtil.run_in_db_executor(
+        PanelsResponseItem.get_response,
         PanelsRequest(
             user=context_headers.user,
             env=context_headers.env,
             dataset=context_headers.dataset,
             type_name=type_name,
             key=key,
-        )
+        ),
     )
 
 
@@ -54,7 +56,8 @@ async def get_panel(
 ) -> Any:
     """Return panel content by its displayed name."""
 
-    return PanelResponseUtil.get_response(
+    return await ExecutorUtil.run_in_db_executor(
+        PanelResponseUtil.get_response,
         PanelRequest(
             user=context_headers.user,
             env=context_headers.env,
@@ -62,5 +65,5 @@ async def get_panel(
             type_name=type_name,
             panel_id=panel_id,
             key=key,
-        )
+        ),
     )
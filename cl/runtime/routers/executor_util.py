@@ -0,0 +1,78 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable
+from typing import ParamSpec
+from typing import TypeVar
+from cl.runtime.settings.api_settings import ApiSettings
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+_DB_EXECUTOR: ThreadPoolExecutor | None = None
+"""Thread pool for DB operations invoked by the REST API routes, created on first use."""
+
+_DB_EXECUTOR_LOCK = Lock()
+"""Lock for creating or replacing the DB executor."""
+
+
+class ExecutorUtil:
+    """Runs synchronous code invoked by the REST API routes without blocking the event loop."""
+
+    @classmethod
+    async def run_in_db_executor(cls, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        """
+        Run func(*args, **kwargs) in the DB executor thread pool and await the result.
+
+        Notes:
+            - The contextvars of the caller, including the active contexts, are copied to the executor thread
+            - The event loop continues to serve other requests while func is running
+            - The number of concurrent calls is bounded by ApiSettings.api_db_executor_max_workers
+        """
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.get_db_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+    @classmethod
+    def get_db_executor(cls) -> ThreadPoolExecutor:
+        """Return the DB executor, creating it on first call using ApiSettings.api_db_executor_max_workers."""
+        global _DB_EXECUTOR
+        if (result := _DB_EXECUTOR) is None:
+            with _DB_EXECUTOR_LOCK:
+                if (result := _DB_EXECUTOR) is None:
+                    max_workers = ApiSettings.instance().api_db_executor_max_workers
+                    result = _DB_EXECUTOR = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DbExecutor")
+        return result
+
+    @classmethod
+    def reset_db_executor(cls, *, max_workers: int | None = None) -> None:
+        """
+        Shut down the current DB executor after the pending calls complete and replace it by a new one.
+
+        Args:
+            max_workers: Maximum number of threads, use ApiSettings.api_db_executor_max_workers if not specified
+        """
+        global _DB_EXECUTOR
+        with _DB_EXECUTOR_LOCK:
+            previous = _DB_EXECUTOR
+            if max_workers is None:
+                max_workers = ApiSettings.instance().api_db_executor_max_workers
+            _DB_EXECUTOR = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DbExecutor")
+        if previous is not None:
+            previous.shutdown(wait=True)
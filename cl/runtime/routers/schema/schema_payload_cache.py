@@ -0,0 +1,138 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+import gzip
+import hashlib
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+import orjson
+from fastapi import Response
+from starlette import status
+from cl.runtime.records.typename import typename
+from cl.runtime.routers.schema.type_request import TypeRequest
+from cl.runtime.routers.schema.type_response_util import TypeResponseUtil
+from cl.runtime.routers.schema.types_response_item import TypesResponseItem
+from cl.runtime.schema.type_info import TypeInfo
+
+_MIN_GZIP_SIZE = 1024
+"""Payloads smaller than this number of bytes are not compressed."""
+
+_PAYLOAD_DICT: dict[tuple, SchemaPayload] = {}
+"""Payloads indexed by route-specific key, all payloads are for the TypeInfo version in _PAYLOAD_VERSION."""
+
+_PAYLOAD_VERSION: int | None = None
+"""TypeInfo version for the payloads in _PAYLOAD_DICT."""
+
+_PAYLOAD_LOCK = Lock()
+"""Lock for _PAYLOAD_DICT and _PAYLOAD_VERSION."""
+
+
+@dataclass(slots=True, frozen=True)
+class SchemaPayload:
+    """Immutable response of a /schema route serialized to JSON bytes."""
+
+    body: bytes
+    """JSON response body."""
+
+    gzip_body: bytes | None
+    """Response body compressed with gzip, None if the body is too small to benefit from compression."""
+
+    etag: str
+    """Strong ETag computed from the body."""
+
+    @classmethod
+    def from_data(cls, data: dict | list) -> SchemaPayload:
+        """Serialize data to JSON, compress and compute ETag."""
+        body = orjson.dumps(data)
+        gzip_body = gzip.compress(body, mtime=0) if len(body) >= _MIN_GZIP_SIZE else None
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        return SchemaPayload(body=body, gzip_body=gzip_body, etag=etag)
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Return True if the value of If-None-Match request header matches the ETag of this payload."""
+        if not if_none_match:
+            return False
+        etags = [x.strip().removeprefix("W/") for x in if_none_match.split(",")]
+        return "*" in etags or self.etag in etags
+
+    def to_response(self, *, if_none_match: str | None, accept_encoding: str | None) -> Response:
+        """Return 304 if the client has the current version, otherwise the body compressed if the client accepts."""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if self.matches(if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        elif self.gzip_body is not None and accept_encoding is not None and "gzip" in accept_encoding.lower():
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=self.gzip_body, media_type="application/json", headers=headers)
+        else:
+            return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class SchemaPayloadCache:
+    """
+    Cache of /schema route responses serialized to JSON.
+
+    Notes:
+        - Payloads are built on first request and then reused until TypeInfo version changes
+        - The cache is cleared when TypeInfo is rebuilt
+        - For a table name, the record type bound to the table is resolved on each request and included in the key
+    """
+
+    @classmethod
+    def get_types_payload(cls) -> SchemaPayload:
+        """Payload for the /schema/types route."""
+        return cls._get_or_create(
+            ("types",),
+            lambda: [x.model_dump(by_alias=True) for x in TypesResponseItem.get_types()],
+        )
+
+    @classmethod
+    def get_type_payload(cls, request: TypeRequest) -> SchemaPayload:
+        """Payload for the /schema/type route."""
+        type_name = request.type_name
+        record_type = TypeResponseUtil.get_record_type(type_name)
+        return cls._get_or_create(
+            ("type", type_name, typename(record_type)),
+            lambda: TypeResponseUtil.get_type_for_record_type(type_name, record_type),
+        )
+
+    @classmethod
+    def clear(cls) -> None:
+        """Remove all cached payloads."""
+        global _PAYLOAD_VERSION
+        with _PAYLOAD_LOCK:
+            _PAYLOAD_DICT.clear()
+            _PAYLOAD_VERSION = None
+
+    @classmethod
+    def _get_or_create(cls, key: tuple, data_func: Callable[[], dict | list]) -> SchemaPayload:
+        """Get cached payload for the current TypeInfo version or create it from the result of data_func."""
+        global _PAYLOAD_VERSION
+        version = TypeInfo.get_version()
+        with _PAYLOAD_LOCK:
+            if _PAYLOAD_VERSION != version:
+                # Types were rebuilt, discard the payloads for the previous version
+                _PAYLOAD_DICT.clear()
+                _PAYLOAD_VERSION = version
+            elif (result := _PAYLOAD_DICT.get(key)) is not None:
+                return result
+
+        # Build outside the lock, concurrent requests for the same key may build the same payload more than once
+        result = SchemaPayload.from_data(data_func())
+        with _PAYLOAD_LOCK:
+            if _PAYLOAD_VERSION == version:
+                result = _PAYLOAD_DICT.setdefault(key, result)
+        return result
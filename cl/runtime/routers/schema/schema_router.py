@@ -14,9 +14,12 @@
 
 from typing import Annotated
 from fastapi import APIRouter
+from fastapi import Header
 from fastapi import Query
+from fastapi import Response
+from cl.runtime.routers.executor_util import ExecutorUtil
+from cl.runtime.routers.schema.schema_payload_cache import SchemaPayloadCache
 from cl.runtime.routers.schema.type_request import TypeRequest
-from cl.runtime.routers.schema.type_response_util import TypeResponseUtil
 from cl.runtime.routers.schema.type_successors_response_item import TypeSuccessorsResponseItem
 from cl.runtime.routers.schema.type_tables_response_item import TypeTablesResponseItem
 from cl.runtime.routers.schema.types_response_item import TypesResponseItem
@@ -25,17 +28,26 @@ router = APIRouter()
 
 
 @router.get("/types", response_model=list[TypesResponseItem])
-async def get_types() -> list[TypesResponseItem]:
+async def get_types(
+    if_none_match: Annotated[str | None, Header(description="ETag of the cached response.")] = None,
+    accept_encoding: Annotated[str | None, Header(description="Accepted response encodings.")] = None,
+) -> Response:
     """Information about the record types."""
-    return TypesResponseItem.get_types()
+    payload = await ExecutorUtil.run_in_db_executor(SchemaPayloadCache.get_types_payload)
+    return payload.to_response(if_none_match=if_none_match, accept_encoding=accept_encoding)
 
 
 @router.get("/type", response_model=dict[str, dict])
 async def get_type(
     type_name: Annotated[str, Query(description="Type shortname.")],
-) -> dict[str, dict]:
+    if_none_match: Annotated[str | None, Header(description="ETag of the cached response.")] = None,
+    accept_encoding: Annotated[str | None, Header(description="Accepted response encodings.")] = None,
+) -> Response:
     """Schema for the specified type and its dependencies."""
-    return TypeResponseUtil.get_type(TypeRequest(type_name=type_name))
+    payload = await ExecutorUtil.run_in_db_executor(
+        SchemaPayloadCache.get_type_payload, TypeRequest(type_name=type_name)
+    )
+    return payload.to_response(if_none_match=if_none_match, accept_encoding=accept_encoding)
 
 
 @router.get("/type-successors", response_model=list[TypeSuccessorsResponseItem])
@@ -43,7 +55,9 @@ async def get_type_successors(
     type_name: Annotated[str, Query(description="Type shortname.")],
 ) -> list[TypeSuccessorsResponseItem]:
     """Return type class successors."""
-    return TypeSuccessorsResponseItem.get_type_successors(TypeRequest(type_name=type_name))
+    return await ExecutorUtil.run_in_db_executor(
+        TypeSuccessorsResponseItem.get_type_successors, TypeRequest(type_name=type_name)
+    )
 
 
 @router.get("/type-tables", response_model=list[TypeTablesResponseItem])
@@ -51,4 +65,6 @@ async def get_type_tables(
     type_name: Annotated[str, Query(description="Type shortname.")],
 ) -> list[TypeTablesResponseItem]:
     """Return type bound tables."""
-    return TypeTablesResponseItem.get_type_tables(TypeRequest(type_name=type_name))
+    return await ExecutorUtil.run_in_db_executor(
+        TypeTablesResponseItem.get_type_tables, TypeRequest(type_name=type_name)
+    )
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from __future__ import annotations
+import copy
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
 from cl.runtime.records.typename import typename
@@ -28,28 +29,38 @@ class TypeResponseUtil:
     @classmethod
     def get_type(cls, request: TypeRequest) -> dict[str, dict]:
         """Supports /schema/type route."""
+        record_type = cls.get_record_type(request.type_name)
+        return cls.get_type_for_record_type(request.type_name, record_type)
+
+    @classmethod
+    def get_record_type(cls, type_name: str) -> type:
+        """Record type for the type name, or the lowest common record type bound to the table for a key type name."""
 
         # TODO(Roman): !!! Implement separate methods for table and type
-        if TypeInfo.is_known_type_name(request.type_name):
+        if TypeInfo.is_known_type_name(type_name):
             # TODO: Check why empty module is passed, is module the short name prefix?
-            record_type_name = request.type_name
-            record_type = TypeInfo.from_type_name(record_type_name)
+            return TypeInfo.from_type_name(type_name)
         else:
             # Get lowest common type bound to the table
-            key_type = TypeInfo.from_type_name(request.type_name)
-            record_type = active(DataSource).get_common_base_record_type(key_type=key_type)
+            key_type = TypeInfo.from_type_name(type_name)
+            return active(DataSource).get_common_base_record_type(key_type=key_type)
+
+    @classmethod
+    def get_type_for_record_type(cls, type_name: str, record_type: type) -> dict[str, dict]:
+        """Schema for the type name and its dependencies where record_type is the result of get_record_type."""
 
+        # Copy because the result of as_dict_with_dependencies is cached and is modified below
         handler_args_elements = dict()
-        result = TypeDecl.as_dict_with_dependencies(record_type)
+        result = copy.deepcopy(TypeDecl.as_dict_with_dependencies(record_type))
 
         # Find an element in the results for a record type to use as the basis for a synthetic table item
         record_type_key_in_result = f"{ModuleDeclKey().build().module_name}.{typename(record_type)}"
         record_type_result = result.get(record_type_key_in_result)
 
         # Add synthetic table item to schema
-        table_type_key_in_result = f"{ModuleDeclKey().build().module_name}.{request.type_name}"
+        table_type_key_in_result = f"{ModuleDeclKey().build().module_name}.{type_name}"
         table_type_result = {k: v for k, v in record_type_result.items()}
-        table_type_result["Name"] = request.type_name
+        table_type_result["Name"] = type_name
         result[table_type_key_in_result] = table_type_result
 
         # TODO: Experimental patch to exclude generated fields from top grid and editor but not the record picker
@@ -57,7 +68,7 @@ class TypeResponseUtil:
         # - Top grid
         # - When a new record is created and the editor is opened
         # - When getting the schema for the picker, however this is excluded by endswith("Key")
-        if request.type_name is not None and not request.type_name.endswith("Key"):
+        if type_name is not None and not type_name.endswith("Key"):
             type_dict = list(result.values())[0] if len(result) > 0 else None
             if type_dict is not None:
                 elements = type_dict.get("Elements", None)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from cl.runtime.db.sort_order import SortOrder
 from cl.runtime.routers.context_request import ContextRequest
 
 
@@ -32,3 +33,6 @@ class SelectRequest(ContextRequest):
 
     table_format: bool = True
     """If true, response will be returned in the table format."""
+
+    sort_order: SortOrder = SortOrder.ASC
+    """Sort by key fields in the specified order."""
@@ -15,9 +15,13 @@
 from __future__ import annotations
 from enum import Enum
 from typing import Any
+from memoization import cached
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
+from cl.runtime.db.query_mixin import QueryMixin
+from cl.runtime.db.table_query import TableQuery
 from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.records.key_mixin import KeyMixin
 from cl.runtime.records.protocols import is_key_type
 from cl.runtime.records.protocols import is_primitive_type
 from cl.runtime.records.record_mixin import RecordMixin
@@ -25,58 +29,96 @@ from cl.runtime.records.typename import typename
 from cl.runtime.records.typename import typeof
 from cl.runtime.routers.storage.records_with_schema_response import RecordsWithSchemaResponse
 from cl.runtime.routers.storage.select_request import SelectRequest
+from cl.runtime.schema.type_hint import TypeHint
 from cl.runtime.schema.type_info import TypeInfo
 from cl.runtime.schema.type_kind import TypeKind
 from cl.runtime.serializers.data_serializers import DataSerializers
+from cl.runtime.serializers.enum_serializers import EnumSerializers
 from cl.runtime.serializers.key_serializers import KeySerializers
+from cl.runtime.serializers.primitive_serializers import PrimitiveSerializers
+
+_PRIMITIVE_SERIALIZER = PrimitiveSerializers.FOR_UI
+"""Serializer for primitive fields in table format, the same as used by DataSerializers.FOR_UI."""
+
+_ENUM_SERIALIZER = EnumSerializers.DEFAULT
+"""Serializer for enum fields in table format, the same as used by DataSerializers.FOR_UI."""
+
+_KEY_SERIALIZER = KeySerializers.DELIMITED
+"""Serializer for key fields and the record key in table format, the same as used by DataSerializers.FOR_UI."""
 
 
 class SelectResponse(RecordsWithSchemaResponse):
     """Response data type for the /storage/select route."""
 
+    total_count: int
+    """Total number of records that match the request, irrespective of limit and skip."""
+
     @classmethod
     def get_response(cls, request: SelectRequest) -> SelectResponse:
         """Implements /storage/select route."""
 
-        if request.query_dict:
-            raise RuntimeError("Select with 'query_dict' currently is not supported.")
-
-        if request.table_format is False:
-            raise RuntimeError("Select with 'table_format=False' currently is not supported.")
-
-        if request.skip != 0:
-            raise RuntimeError("Select with 'skip != 0' currently is not supported.")
-
-        if request.limit is not None:
-            raise RuntimeError("Select with 'limit' currently is not supported.")
-
         ds = active(DataSource)
 
         # TODO(Roman): !!! Implement separate methods for table and type
         if (type_kind := TypeInfo.get_type_name_info(type_name=request.type_).type_kind) == TypeKind.RECORD:
             # Get records for a type
-            record_type_name = request.type_
-            record_type = TypeInfo.from_type_name(record_type_name)
-            # Load records for the type
-            records = ds.load_by_type(record_type)
+            record_type = TypeInfo.from_type_name(request.type_)
+            key_type = record_type.get_key_type()
+            restrict_to = record_type
             common_base_record_type = record_type
         elif type_kind == TypeKind.KEY:
             # Get records for a table
-            key_type_name = request.type_
-            key_type = TypeInfo.from_type_name(key_type_name)
-            records = ds.load_all(key_type)
+            key_type = TypeInfo.from_type_name(request.type_)
+            restrict_to = None
             # Get lowest common type to the records stored in the table
             common_base_record_type = ds.get_common_base_record_type(key_type=key_type)
         else:
             raise RuntimeError(f"Type {request.type_} is neither a record nor a key.")
 
-        # Serialize records for table.
-        serialized_records = [cls._serialize_record_for_table(record) for record in records]
+        # Use the query from the request if specified, otherwise select all records in the table
+        query = cls._get_query(request.query_dict, key_type=key_type)
+
+        # Load only the requested page, sorting and filtering is performed by the database
+        records = ds.load_by_query(
+            query,
+            restrict_to=restrict_to,
+            sort_order=request.sort_order,
+            limit=request.limit,
+            skip=request.skip if request.skip else None,
+        )
+
+        # Count the records that match the request irrespective of limit and skip
+        if request.limit is None and not request.skip:
+            total_count = len(records)
+        else:
+            total_count = ds.count_by_query(query, restrict_to=restrict_to)
+
+        # Serialize records for table or in full
+        if request.table_format:
+            serialized_records = [cls._serialize_record_for_table(record) for record in records]
+        else:
+            serialized_records = [DataSerializers.FOR_UI.serialize(record) for record in records]
 
         # Get schema dict for type.
         schema_dict = cls._get_schema_dict(common_base_record_type)
 
-        return SelectResponse(schema_=schema_dict, data=serialized_records)  # noqa
+        return SelectResponse(schema_=schema_dict, data=serialized_records, total_count=total_count)  # noqa
+
+    @classmethod
+    def _get_query(cls, query_dict: dict | None, *, key_type: type[KeyMixin]) -> QueryMixin:
+        """Deserialize query from query_dict and check it targets the table for key_type, or select all if None."""
+        if not query_dict:
+            return TableQuery(_key_type=key_type).build()
+
+        query = DataSerializers.FOR_UI.deserialize(query_dict)
+        if not isinstance(query, QueryMixin):
+            raise RuntimeError(f"Select 'query_dict' has type {typename(type(query))} which is not a query.")
+        if (query_key_type := query.get_target_type().get_key_type()) is not key_type:
+            raise RuntimeError(
+                f"Select 'query_dict' has type {typename(type(query))} which targets the table for\n"
+                f"{typename(query_key_type)} rather than {typename(key_type)}."
+            )
+        return query.build()
 
     @classmethod
     def _serialize_record_for_table(cls, record: RecordMixin) -> dict[str, Any]:
@@ -85,27 +127,37 @@ class SelectResponse(RecordsWithSchemaResponse):
         Contains only fields of supported types, _key and _t will be added based on record.
         """
 
-        all_slots = record.get_field_names()
-
-        # Get subset of slots which supported in table format.
-        table_fields = {
-            CaseUtil.snake_to_pascal_case_keep_trailing_underscore(slot)
-            for slot in all_slots
-            if (slot_v := getattr(record, slot))
-            and (
-                # TODO (Roman): Consider adding other types to table format.
-                # Check if field is primitive, key or enum.
-                is_primitive_type(typeof(slot_v))
-                or is_key_type(type(slot_v))
-                or isinstance(slot_v, Enum)
-            )
-        }
-
-        # Serialize record to ui format and filter table fields
-        table_dict = {k: v for k, v in DataSerializers.FOR_UI.serialize(record).items() if k in table_fields}
+        # Serialize only non-empty fields of the types supported in table format
+        table_dict = {}
+        for field_name, serialized_key, field_type_hint in cls._get_table_fields(type(record)):
+            if not (field_value := getattr(record, field_name)):
+                continue
+            # TODO (Roman): Consider adding other types to table format.
+            # Check if field is primitive, key or enum.
+            if is_primitive_type(typeof(field_value)):
+                table_dict[serialized_key] = _PRIMITIVE_SERIALIZER.serialize(field_value, field_type_hint)
+            elif is_key_type(type(field_value)):
+                table_dict[serialized_key] = _KEY_SERIALIZER.serialize(field_value, field_type_hint)
+            elif isinstance(field_value, Enum):
+                table_dict[serialized_key] = _ENUM_SERIALIZER.serialize(field_value, field_type_hint)
 
         # Add "_t" and "_key" attributes
         table_dict["_t"] = typename(type(record))
-        table_dict["_key"] = KeySerializers.DELIMITED.serialize(record.get_key())
+        table_dict["_key"] = _KEY_SERIALIZER.serialize(record.get_key())
 
         return table_dict
+
+    @classmethod
+    @cached
+    def _get_table_fields(cls, record_type: type) -> tuple[tuple[str, str, TypeHint], ...]:
+        """Tuple of (field_name, serialized_key, field_type_hint) for the fields that may be included in the table."""
+        return tuple(
+            (
+                field_spec.field_name,
+                CaseUtil.snake_to_pascal_case_keep_trailing_underscore(field_spec.field_name),
+                field_spec.field_type_hint,
+            )
+            for field_spec in record_type.get_type_spec().fields
+            # Sequences and mappings are not included in the table
+            if field_spec.field_type_hint.remaining is None
+        )
@@ -18,8 +18,10 @@ from fastapi import Body
 from fastapi import Depends
 from fastapi import Header
 from fastapi import Query
+from cl.runtime.db.sort_order import SortOrder
 from cl.runtime.routers.dependencies.context_headers import ContextHeaders
 from cl.runtime.routers.dependencies.context_headers import get_context_headers
+from cl.runtime.routers.executor_util import ExecutorUtil
 from cl.runtime.routers.storage.datasets_request import DatasetsRequest
 from cl.runtime.routers.storage.datasets_response_item import DatasetsResponseItem
 from cl.runtime.routers.storage.delete_request import DeleteRequest
@@ -51,7 +53,9 @@ async def get_datasets(
     environment: Annotated[str, Header(description="Name of the environment (database).")] = None,
 ) -> list[DatasetsResponseItem]:
     """Information about the environments."""
-    return DatasetsResponseItem.get_datasets(DatasetsRequest(env=environment, type_name=type_name))
+    return await ExecutorUtil.run_in_db_executor(
+        DatasetsResponseItem.get_datasets, DatasetsRequest(env=environment, type_name=type_name)
+    )
 
 
 @router.post("/load", response_model=LoadResponse)
@@ -64,14 +68,15 @@ async def post_load(
 ) -> LoadResponse:
     """Bulk load records by list of keys."""
 
-    return LoadResponse.get_response(
+    return await ExecutorUtil.run_in_db_executor(
+        LoadResponse.get_response,
         LoadRequest(
             user=context_headers.user,
             env=context_headers.env,
             dataset=context_headers.dataset,
             load_keys=load_keys,
             ignore_not_found=ignore_not_found,
-        )
+        ),
     )
 
 
@@ -84,13 +89,11 @@ async def post_select(
     ] = None,
     skip: Annotated[int, Query(description="Number of skipped records from the beginning of the list.")] = 0,
     table_format: Annotated[bool, Query(description="If true, response will be returned in the table format.")] = True,
+    descending: Annotated[bool, Query(description="If true, records are sorted by key in descending order.")] = False,
 ) -> SelectResponse:
     """Select records by query."""
-
-    # TODO (Roman): Support select with 'limit'.
-    limit = None
-
-    return SelectResponse.get_response(
+    return await ExecutorUtil.run_in_db_executor(
+        SelectResponse.get_response,
         SelectRequest(
             user=context_headers.user,
             env=context_headers.env,
@@ -100,7 +103,8 @@ async def post_select(
             limit=limit,
             skip=skip,
             table_format=table_format,
-        )
+            sort_order=SortOrder.DESC if descending else SortOrder.ASC,
+        ),
     )
 
 
@@ -111,10 +115,11 @@ async def post_delete(
 ) -> list[KeyRequestItem]:
     """Bulk delete records by list of keys."""
 
-    return DeleteResponseUtil.delete_records(
+    return await ExecutorUtil.run_in_db_executor(
+        DeleteResponseUtil.delete_records,
         DeleteRequest(
             user=context_headers.user, env=context_headers.env, dataset=context_headers.dataset, delete_keys=delete_keys
-        )
+        ),
     )
 
 
@@ -125,10 +130,11 @@ async def post_save(
 ) -> list[KeyRequestItem]:
     """Bulk save records to DB. Don't check if the record already exists."""
 
-    return SaveResponseUtil.save_records(
+    return await ExecutorUtil.run_in_db_executor(
+        SaveResponseUtil.save_records,
         SaveRequest(
             user=context_headers.user, env=context_headers.env, dataset=context_headers.dataset, records=records
-        )
+        ),
     )
 
 
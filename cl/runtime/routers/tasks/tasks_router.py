@@ -18,6 +18,7 @@ from fastapi import Body
 from fastapi import Depends
 from cl.runtime.routers.dependencies.context_headers import ContextHeaders
 from cl.runtime.routers.dependencies.context_headers import get_context_headers
+from cl.runtime.routers.executor_util import ExecutorUtil
 from cl.runtime.routers.tasks.result_request import ResultRequest
 from cl.runtime.routers.tasks.result_response_item import ResultResponseItem
 from cl.runtime.routers.tasks.status_request import StatusRequest
@@ -37,7 +38,8 @@ async def post_submit(
 ) -> list[SubmitResponseItem]:
     """Submit run handler in Celery task."""
 
-    return SubmitResponseItem.get_response(
+    return await ExecutorUtil.run_in_db_executor(
+        SubmitResponseItem.get_response,
         SubmitRequest(
             user=context_headers.user,
             env=context_headers.env,
@@ -46,7 +48,7 @@ async def post_submit(
             method=submit_body.method,
             keys=submit_body.keys,
             arguments=submit_body.arguments,
-        )
+        ),
     )
 
 
@@ -74,13 +76,14 @@ async def post_status(
 ) -> list[StatusResponseItem]:
     """Bulk request task statuses by run ids."""
 
-    return StatusResponseItem.get_response(
+    return await ExecutorUtil.run_in_db_executor(
+        StatusResponseItem.get_response,
         StatusRequest(
             user=context_headers.user,
             env=context_headers.env,
             dataset=context_headers.dataset,
             task_run_ids=task_run_ids.task_run_ids,
-        )
+        ),
     )
 
 
@@ -91,11 +94,12 @@ async def post_result(
 ) -> list[ResultResponseItem]:
     """Bulk request task results by run ids."""
 
-    return ResultResponseItem.get_response(
+    return await ExecutorUtil.run_in_db_executor(
+        ResultResponseItem.get_response,
         ResultRequest(
             user=context_headers.user,
             env=context_headers.env,
             dataset=context_headers.dataset,
             task_run_ids=task_run_ids.task_run_ids,
-        )
+        ),
     )
@@ -20,6 +20,7 @@ from importlib import import_module
 from inspect import getmembers
 from inspect import isclass
 from pkgutil import walk_packages
+from threading import RLock
 from types import ModuleType
 from typing import ClassVar
 from typing import Collection
@@ -28,6 +29,7 @@ from typing import Sequence
 from memoization import cached
 from more_itertools import consume
 from cl.runtime.exceptions.error_util import ErrorUtil
+from cl.runtime.primitive.bool_util import BoolUtil
 from cl.runtime.primitive.enum_util import EnumUtil
 from cl.runtime.records.bootstrap_mixin import BootstrapMixin
 from cl.runtime.records.for_dataclasses.extensions import required
@@ -44,11 +46,16 @@ from cl.runtime.schema.type_kind import TypeKind
 from cl.runtime.settings.env_settings import EnvSettings
 from cl.runtime.settings.project_settings import ProjectSettings
 
+_LOAD_LOCK = RLock()
+"""Lock for loading TypeInfo.csv so that other threads do not see a partially loaded dictionary."""
+
 _TYPE_INFO_HEADERS = (
     "TypeName",
     "TypeKind",
     "QualName",
     "Subtype",
+    "IsMixin",
+    "ParentNames",
 )
 """Headers of TypeInfo preload file."""
 
@@ -77,9 +84,21 @@ class TypeInfo(BootstrapMixin):
     subtype: str | None = None
     """Subtype for primitive types only (optional)."""
 
+    is_mixin: bool = False
+    """True for mixin types which are excluded from child lookup because it follows single inheritance."""
+
+    parent_names: tuple[str, ...] | None = None
+    """Type names of data, key or record parent classes (excluding self) used for child lookup without import."""
+
     _type_info_dict: ClassVar[dict[str, Self] | None] = None
     """Dictionary of TypeInfo indexed by type name."""
 
+    _is_loaded: ClassVar[bool] = False
+    """True after the dictionary of TypeInfo is fully loaded or rebuilt."""
+
+    _version: ClassVar[int] = 0
+    """Incremented each time the dictionary of TypeInfo is cleared before loading or rebuilding."""
+
     _module_dict: ClassVar[dict[str, ModuleType] | None] = None
     """Dictionary of modules indexed by module name in dot-delimited format."""
 
@@ -207,8 +226,8 @@ class TypeInfo(BootstrapMixin):
             packages_str = "\n".join(f"  - {package}" for package in cls._get_packages())
             raise RuntimeError(f"Type name {type_name} is not found in the imported package list:\n{packages_str}\n")
 
-        # Invoking build imports the class and updates type_info.type_ in cache so it does not have to be imported again
-        return result.build()
+        # Import the class on first use and update type_info.type_ in cache so it does not have to be imported again
+        return cls._build_type_info(result)
 
     @classmethod
     @cached
@@ -223,8 +242,8 @@ class TypeInfo(BootstrapMixin):
 
         # Next, try using cached qual name to avoid enumerating types in all packages
         if (type_info := cls._type_info_dict.get(type_name, None)) is not None:
-            # Invoking build imports the class and updates type_info.type_ in cache so it does not have to be imported again
-            return type_info.build().type_
+            # Import the class on first use and update type_info.type_ in cache so it does not have to be imported again
+            return cls._build_type_info(type_info).type_
         else:
             raise cls._type_name_not_found_error(type_name)
 
@@ -241,11 +260,11 @@ class TypeInfo(BootstrapMixin):
         # Ensure the type cache is loaded from TypeInfo.csv, will not reload if already loaded
         cls._ensure_loaded()
 
-        # Filter by type_kind if specified
-        type_info_objects = cls._type_info_dict.values()
+        # Filter by type_kind if specified, use a snapshot because importing a type may add to the dictionary
+        type_info_objects = tuple(cls._type_info_dict.values())
         if type_kind is not None:
             type_info_objects = [type_info for type_info in type_info_objects if type_info.type_kind == type_kind]
-        result = tuple(x.build().type_ for x in type_info_objects)
+        result = tuple(cls._build_type_info(x).type_ for x in type_info_objects)
         return result
 
     @classmethod
@@ -290,7 +309,7 @@ class TypeInfo(BootstrapMixin):
     def get_child_and_self_type_names(cls, type_: type, *, type_kind: TypeKind | None = None) -> tuple[str, ...]:
         """
         Return a tuple of type names for child types (inclusive of self) that match the predicate.
-        Result is sorted by depth in hierarchy.
+        Result is sorted by type name, child types are not imported when the type is found in TypeInfo.csv.
 
         Args:
             type_: Type for which the result is returned
@@ -300,17 +319,34 @@ class TypeInfo(BootstrapMixin):
         # Ensure the type cache is loaded from TypeInfo.csv, will not reload if already loaded
         cls._ensure_loaded()
 
-        # Get types
-        result_types = cls.get_child_and_self_types(type_, type_kind=type_kind)
-        # Convert to names and sort
-        return tuple(sorted(typename(x) for x in result_types))
+        type_name = typename(type_)
+        if type_name in cls._type_info_dict:
+            # Type kinds to include in the result, error if not DATA, KEY, RECORD or None
+            type_kinds = cls._get_data_key_or_record_type_kinds(type_kind)
+
+            # Use parent names and mixin flags from TypeInfo.csv to avoid importing the modules of all types
+            # in the packages, exclude mixin types because this method follows single inheritance
+            result = tuple(
+                sorted(
+                    x.type_name
+                    for x in tuple(cls._type_info_dict.values())
+                    if x.type_kind in type_kinds
+                    and not x.is_mixin
+                    and (x.type_name == type_name or (x.parent_names is not None and type_name in x.parent_names))
+                )
+            )
+        else:
+            # Type is not in TypeInfo.csv, get child types from subclasses of the imported type
+            result_types = cls.get_child_and_self_types(type_, type_kind=type_kind)
+            result = tuple(typename(x) for x in result_types)
+        return result
 
     @classmethod
     @cached
     def get_child_and_self_types(cls, type_: type, *, type_kind: TypeKind | None = None) -> tuple[type, ...]:
         """
-        Return a tuple of type names for child types (inclusive of self) that match the predicate.
-        Result is sorted by depth in hierarchy.
+        Return a tuple of child types (inclusive of self) that match the predicate.
+        Result is sorted by type name, only the child types are imported.
 
         Args:
             type_: Type for which the result is returned
@@ -320,10 +356,15 @@ class TypeInfo(BootstrapMixin):
         # Ensure the type cache is loaded from TypeInfo.csv, will not reload if already loaded
         cls._ensure_loaded()
 
-        # Recursively load subtypes without filtering, because filter may apply to child but not parent
-        subtypes_set = tuple(cls._get_unfiltered_child_types_set(type_))
-        # Filter and sort
-        result = cls._get_data_key_or_record_types(subtypes_set, type_kind=type_kind)
+        if typename(type_) in cls._type_info_dict:
+            # Get type names from TypeInfo.csv and import only the types in the result
+            type_names = cls.get_child_and_self_type_names(type_, type_kind=type_kind)
+            result = tuple(cls.from_type_name(x) for x in type_names)
+        else:
+            # Recursively load subtypes without filtering, because filter may apply to child but not parent
+            subtypes_set = tuple(cls._get_unfiltered_child_types_set(type_))
+            # Filter and sort
+            result = cls._get_data_key_or_record_types(subtypes_set, type_kind=type_kind)
         return result
 
     @classmethod
@@ -362,15 +403,23 @@ class TypeInfo(BootstrapMixin):
             record_type_names_str = "\n".join(typename(x) for x in types)
             raise RuntimeError(f"No common base is found for the following records:\n{record_type_names_str}")
 
+    @classmethod
+    def get_version(cls) -> int:
+        """Version of the loaded types, changes when the types are rebuilt and may be used to invalidate caches."""
+        cls._ensure_loaded()
+        return cls._version
+
     @classmethod
     def rebuild(cls) -> None:
         """Reload types from packages and save a new TypeInfo.csv file to the bootstrap resources directory."""
 
-        # Clear the existing data
-        cls._clear()
+        with _LOAD_LOCK:
+            # Clear the existing data
+            cls._clear()
 
-        # Add each class after performing checks for duplicates
-        consume(cls._add_type(type_) for type_ in cls._get_package_types())
+            # Add each class after performing checks for duplicates
+            consume(cls._add_type(type_) for type_ in cls._get_package_types())
+            cls._is_loaded = True
 
         # Overwrite the cache file on disk with the new data
         cls._save()
@@ -473,13 +522,24 @@ class TypeInfo(BootstrapMixin):
                     f"Only primitive types can have subtypes."
                 )
 
-        # Get type info without subclass names (which will be done on second pass after all types are loaded)
+        # Get mixin flag and parent type names for data, key or record types to look up child types
+        # without importing them, using the same mixin check as _get_data_key_or_record_types
+        if type_kind in (TypeKind.DATA, TypeKind.KEY, TypeKind.RECORD):
+            is_mixin = is_mixin_type(type_)
+            parent_names = tuple(typename(x) for x in type_.__mro__[1:] if is_data_key_or_record_type(x))
+        else:
+            is_mixin = False
+            parent_names = None
+
+        # Get type info, the class is already imported
         type_info = TypeInfo(
             type_name=type_name,
             type_kind=type_kind,
             qual_name=qualname(type_),
             type_=type_,
             subtype=subtype,
+            is_mixin=is_mixin,
+            parent_names=parent_names,
         ).build()
 
         # Populate the dictionary
@@ -498,10 +558,27 @@ class TypeInfo(BootstrapMixin):
     def _ensure_loaded(cls):
         """Load the data from TypeInfo.csv if not already loaded, do not reload."""
 
-        if cls._type_info_dict is not None:
+        if cls._is_loaded:
             # Already loaded, exit early
             return
 
+        with _LOAD_LOCK:
+            # Another thread may have completed loading while this thread was waiting for the lock,
+            # and the dictionary is partially loaded when called by the import of a type during loading
+            if cls._is_loaded or cls._type_info_dict is not None:
+                return
+            try:
+                cls._load()
+            except BaseException:
+                # Load again on the next call
+                cls._type_info_dict = None
+                raise
+            cls._is_loaded = True
+
+    @classmethod
+    def _load(cls) -> None:
+        """Load the data from TypeInfo.csv, invoked by _ensure_loaded under lock."""
+
         # Clear cache before loading
         cls._clear()
 
@@ -536,25 +613,27 @@ class TypeInfo(BootstrapMixin):
                 # Parse a type info row
                 if len(row_tokens) == len(_TYPE_INFO_HEADERS):
                     # Extract the type name and qual name from the tokens
-                    type_name, type_kind, qual_name, subtype = row_tokens
+                    type_name, type_kind, qual_name, subtype, is_mixin, parent_names = row_tokens
                 else:
                     expected_num_tokens = len(_TYPE_INFO_HEADERS)
                     actual_num_tokens = len(row_tokens)
                     raise RuntimeError(
                         f"Invalid number of comma-delimited tokens {actual_num_tokens} in TypeInfo, "
                         f"should be {expected_num_tokens}.\n"
-                        f"Sample row: TypeName,TypeKind,module.ClassName,subtype\n"
+                        f"Sample row: TypeName,TypeKind,module.ClassName,subtype,false,ParentName1;ParentName2\n"
                         f"Invalid row: {row.strip()}\n"
                     )
 
-                # Create type info object without child class names
-                # Invoking build imports the class and updates type_info.type_ in cache so it does not have to be imported again
+                # Create type info object without invoking build, the class is imported on first use
+                # by _build_type_info so that loading TypeInfo.csv does not import every module in the packages
                 type_info = TypeInfo(
                     type_name=type_name,
                     type_kind=EnumUtil.from_str(TypeKind, type_kind),
                     qual_name=qual_name,
                     subtype=subtype,
-                ).build()
+                    is_mixin=BoolUtil.from_str(is_mixin),
+                    parent_names=tuple(x for x in parent_names.split(";") if x),
+                )
 
                 # Add to the type info dictionary
                 existing_info = cls._type_info_dict.setdefault(type_info.type_name, type_info)
@@ -587,15 +666,19 @@ class TypeInfo(BootstrapMixin):
                 type_kind_str = EnumUtil.to_str(type_info.type_kind)
                 qual_name = type_info.qual_name
                 subtype = type_info.subtype
+                is_mixin_str = BoolUtil.to_str(type_info.is_mixin)
+                parent_names = ";".join(type_info.parent_names) if type_info.parent_names else ""
 
                 # Write comma-separated values for each token, with semicolons-separated lists
-                file.write(f"{type_name},{type_kind_str},{qual_name},{subtype}\n")
+                file.write(f"{type_name},{type_kind_str},{qual_name},{subtype},{is_mixin_str},{parent_names}\n")
 
     @classmethod
     def _clear(cls) -> None:
         """Clear cache before loading or rebuilding."""
         cls._type_info_dict = {}
         cls._module_dict = {}
+        cls._is_loaded = False
+        cls._version += 1
 
     @classmethod
     def _get_preload_filename(cls) -> str:
@@ -619,6 +702,33 @@ class TypeInfo(BootstrapMixin):
             )
         return result
 
+    @classmethod
+    def _build_type_info(cls, type_info: Self) -> Self:
+        """Import the class on first use and build type info loaded from TypeInfo.csv, pass through if already built."""
+        if type_info.is_frozen():
+            # Already built, exit early
+            return type_info
+
+        # Import outside the lock to avoid a deadlock with the import lock when the imported module uses TypeInfo
+        type_ = cls._import_type(qual_name=type_info.qual_name)
+
+        with _LOAD_LOCK:
+            # Another thread may have completed the build while this thread was waiting for the lock
+            if not type_info.is_frozen():
+                type_info.type_ = type_
+                type_info.build()
+        return type_info
+
+    @classmethod
+    def _get_data_key_or_record_type_kinds(cls, type_kind: TypeKind | None) -> tuple[TypeKind, ...]:
+        """Return the specified type kind or DATA, KEY and RECORD if None, error for other type kinds."""
+        if type_kind is None:
+            return TypeKind.DATA, TypeKind.KEY, TypeKind.RECORD
+        elif type_kind in (TypeKind.DATA, TypeKind.KEY, TypeKind.RECORD):
+            return (type_kind,)
+        else:
+            raise ErrorUtil.enum_value_error(type_kind, TypeKind)
+
     @classmethod
     def _get_data_key_or_record_types(cls, types_: Collection[type], *, type_kind: TypeKind | None) -> tuple[type, ...]:
         """
@@ -19,6 +19,8 @@ import numpy as np
 from frozendict import frozendict
 from cl.runtime.exceptions.error_util import ErrorUtil
 from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.primitive.ndarray_util import NdarrayUtil
+from cl.runtime.records.data_util import DataUtil
 from cl.runtime.records.for_dataclasses.extensions import required
 from cl.runtime.records.protocols import is_data_key_or_record_type
 from cl.runtime.records.protocols import is_empty
@@ -35,10 +37,15 @@ from cl.runtime.schema.type_hint import TypeHint
 from cl.runtime.schema.type_info import TypeInfo
 from cl.runtime.schema.type_schema import TypeSchema
 from cl.runtime.serializers.encoder import Encoder
+from cl.runtime.serializers.ndarray_format import NdarrayFormat
 from cl.runtime.serializers.serializer import Serializer
 from cl.runtime.serializers.type_format import TypeFormat
 from cl.runtime.serializers.type_inclusion import TypeInclusion
 from cl.runtime.serializers.type_placement import TypePlacement
+from cl.runtime.settings.db_settings import DbSettings
+
+_PLAN_MAPPING_TYPES = (dict, frozendict)
+"""Classes of serialized data for which deserialization may use a compiled plan."""
 
 
 @dataclass(slots=True, kw_only=True)
@@ -75,6 +82,27 @@ class DataSerializer(Serializer):
     pascalize_keys: bool | None = None
     """Pascalize keys during serialization if set."""
 
+    ndarray_format: NdarrayFormat = NdarrayFormat.DEFAULT
+    """Serialization format for NumPy arrays, BINARY arrays bypass inner_serializer and inner_encoder."""
+
+    interpreted: bool | None = None
+    """Dispatch on every call without using compiled per-type plans if set (for debugging and benchmarks)."""
+
+    trusted: bool | None = None
+    """
+    Skip repeated validation of deserialized objects if set, use only for data written by a serializer (e.g., DB).
+    Objects are validated as usual when db_trusted_build in settings is False.
+    """
+
+    _serialization_plans: dict[type, tuple | bool] | None = None
+    """Compiled serialization plans indexed by data type, False for types that do not use a plan."""
+
+    _deserialization_plans: dict[type, tuple | bool] | None = None
+    """Compiled deserialization plans indexed by data type, False for types that do not use a plan."""
+
+    _deserialization_plans_by_name: dict[str, tuple | bool] | None = None
+    """Compiled deserialization plans indexed by the type name stored in serialized data."""
+
     def __validate(self) -> None:
         """Perform checks without changing the data."""
         if (self.inner_serializer is not None) ^ (self.inner_encoder is not None):
@@ -85,6 +113,10 @@ class DataSerializer(Serializer):
     def serialize(self, data: Any, type_hint: TypeHint | None = None) -> Any:
         """Serialize the argument to a dictionary type_hint and schema."""
 
+        # Use compiled plan for data, key and record types unless interpreted flag is set
+        if not self.interpreted and (plan := self._get_serialization_plan(type(data))):
+            return self._serialize_with_plan(data, type_hint, plan)
+
         if self.type_inclusion not in [TypeInclusion.AS_NEEDED, TypeInclusion.ALWAYS, TypeInclusion.OMIT]:
             raise ErrorUtil.enum_value_error(self.type_inclusion, TypeInclusion)
 
@@ -138,26 +170,10 @@ class DataSerializer(Serializer):
                 if not is_empty(dict_value)
             )
         elif is_ndarray_type(type(data)):
-            # Deserialize ndarray into ndarray, remaining_chain must be None
-            values = tuple(float(x) for x in data.flatten())
+            # Serialize ndarray, remaining_chain must be None
             if type_hint is not None:
                 type_hint.validate_for_ndarray()
-                # Type hint is present, do not specify _type
-                return frozendict(
-                    {
-                        "shape": tuple(data.shape),
-                        "values": values,
-                    }
-                )
-            else:
-                # Specify _type when type hint is None
-                return frozendict(
-                    {
-                        "_type": "ndarray",
-                        "shape": tuple(data.shape),
-                        "values": tuple(float(x) for x in data.flatten()),
-                    }
-                )
+            return self._serialize_ndarray(data, type_hint)
         elif is_data_key_or_record_type(type(data)):
             # Use key serializer for key types if specified
             if self.key_serializer is not None and is_key_type(type(data)):
@@ -219,18 +235,8 @@ class DataSerializer(Serializer):
             data_type_spec = data.get_type_spec()
             result.update(
                 {
-                    self._serialize_key(field_name): (
-                        self.primitive_serializer.serialize(field_value, field_spec.field_type_hint)
-                        if is_primitive_type(typeof(field_value))
-                        else (
-                            self.enum_serializer.serialize(field_value, field_spec.field_type_hint)
-                            if is_enum_type(type(field_value))
-                            else (
-                                key_serializer.serialize(field_value, field_spec.field_type_hint)
-                                if is_key_type(type(field_value))
-                                else self._serialize_inner(field_value, field_spec.field_type_hint)
-                            )
-                        )
+                    self._serialize_key(field_name): self._serialize_field(
+                        field_value, field_spec.field_type_hint, key_serializer=key_serializer
                     )
                     for field_spec in data_type_spec.fields
                     if not is_empty(field_value := getattr(data, field_name := field_spec.field_name))
@@ -247,6 +253,14 @@ class DataSerializer(Serializer):
     def deserialize(self, data: Any, type_hint: TypeHint | None = None) -> Any:
         """Deserialize data using type_hint and schema."""
 
+        # Use compiled plan for a mapping with data, key or record type unless interpreted flag is set
+        if (
+            not self.interpreted
+            and type(data) in _PLAN_MAPPING_TYPES
+            and (plan := self._get_deserialization_plan_for_data(data, type_hint))
+        ):
+            return self._deserialize_with_plan(data, plan)
+
         if self.type_inclusion == TypeInclusion.OMIT:
             raise RuntimeError("Deserialization is not supported when type_inclusion=OMIT.")
         elif self.type_inclusion not in [TypeInclusion.AS_NEEDED, TypeInclusion.ALWAYS]:
@@ -321,15 +335,7 @@ class DataSerializer(Serializer):
             )
         elif is_ndarray_type(schema_type):
             type_hint.validate_for_ndarray()
-            if not is_mapping_type(type(data)):
-                raise RuntimeError(
-                    f"Cannot deserialize because schema type {typename(schema_type)} is an ndarray\n"
-                    f"but data type {type(data).__name__} is not a mapping."
-                )
-            # Deserialize mapping into ndarray
-            shape = data["shape"]
-            values = data["values"]
-            return np.array(values, dtype=float).reshape(shape)  # TODO: !!! Support any dtype
+            return self._deserialize_ndarray(data, type_hint)
         elif isinstance(
             data, str
         ):  # TODO: !! Refactor to use if/else on schema type only like the new PrimitiveSerializer
@@ -432,7 +438,7 @@ class DataSerializer(Serializer):
             result = schema_class(**result_dict)
 
             # Invoke build and return
-            return result.build()
+            return self._build_deserialized(result)
         else:
             raise RuntimeError(
                 f"Cannot deserialize the following data using type hint '{type_hint.to_str()}':\n"
@@ -469,6 +475,293 @@ class DataSerializer(Serializer):
             # If inner serializer is not specified, use the current serializer
             return self.deserialize(data, type_hint)
 
+    def _serialize_ndarray(self, data: np.ndarray, type_hint: TypeHint | None = None) -> Any:
+        """Serialize ndarray according to the ndarray_format setting."""
+        if (value_format := self.ndarray_format) == NdarrayFormat.BINARY:
+            # Bytes include dtype and shape, no conversion of individual elements
+            return NdarrayUtil.to_bytes(data)
+        elif value_format == NdarrayFormat.DEFAULT:
+            # Flat sequence of Python values, flatten once and convert in C
+            result = {
+                "shape": tuple(data.shape),
+                "values": tuple(data.ravel().tolist()),
+            }
+            if type_hint is None:
+                # Specify _type when type hint is None
+                result = {"_type": "ndarray", **result}
+            return frozendict(result)
+        else:
+            raise ErrorUtil.enum_value_error(value_format, NdarrayFormat)
+
+    def _deserialize_ndarray(self, data: Any, type_hint: TypeHint) -> np.ndarray:
+        """Deserialize ndarray from either format irrespective of the ndarray_format setting."""
+        dtype = np.dtype(type_hint.remaining.schema_type)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            # Binary format preserves dtype, convert only if it is different from the type hint
+            result = NdarrayUtil.from_bytes(data)
+            return result if result.dtype == dtype else result.astype(dtype)
+        elif is_mapping_type(type(data)):
+            # Mapping with shape and a flat sequence of values
+            return np.array(data["values"], dtype=dtype).reshape(data["shape"])
+        else:
+            raise RuntimeError(
+                f"Cannot deserialize because schema type {typename(type_hint.schema_type)} is an ndarray\n"
+                f"but data type {type(data).__name__} is neither bytes nor a mapping."
+            )
+
     def _key_error(self, *, type_name: str, field_key: str) -> None:
         """Report an error."""
         raise RuntimeError(f"Type {type_name} does not have a field '{field_key}'.")
+
+    def _serialize_field(self, field_value: Any, field_type_hint: TypeHint, *, key_serializer: Serializer) -> Any:
+        """Serialize a non-empty field value by dispatching on its type."""
+        if is_primitive_type(typeof(field_value)):
+            return self.primitive_serializer.serialize(field_value, field_type_hint)
+        elif is_enum_type(type(field_value)):
+            return self.enum_serializer.serialize(field_value, field_type_hint)
+        elif is_key_type(type(field_value)):
+            return key_serializer.serialize(field_value, field_type_hint)
+        elif self.ndarray_format == NdarrayFormat.BINARY and is_ndarray_type(type(field_value)):
+            # Binary ndarray is stored directly rather than encoded by inner_encoder
+            return self.serialize(field_value, field_type_hint)
+        else:
+            return self._serialize_inner(field_value, field_type_hint)
+
+    def _get_serialization_plan(self, data_type: type) -> tuple | bool:
+        """Get or compile the serialization plan for data_type, return False if the type does not use a plan."""
+        if self._serialization_plans is None:
+            self._serialization_plans = {}
+        if (plan := self._serialization_plans.get(data_type)) is None:
+            plan = self._create_serialization_plan(data_type)
+            self._serialization_plans[data_type] = plan
+        return plan
+
+    def _create_serialization_plan(self, data_type: type) -> tuple | bool:
+        """
+        Compile serialization plan for data_type in the form (type_value, type_first, type_last, fields)
+        where each element of fields is (field_name, serialized_key, field_type_hint, fast_types, fast_method).
+        Return False for the types that are not serialized by the data branch of the interpreted path.
+        """
+        if not is_data_key_or_record_type(data_type):
+            return False
+        if self.key_serializer is not None and is_key_type(data_type):
+            # Keys are delegated to key_serializer
+            return False
+        if not isinstance(type_spec := data_type.get_type_spec(), DataSpec):
+            return False
+
+        # Parse type_inclusion, type_format and type_placement once per type,
+        # type_always=None indicates AS_NEEDED which is resolved during serialization
+        if self.type_inclusion == TypeInclusion.OMIT:
+            type_value = None
+            type_always = False
+        else:
+            if self.type_inclusion == TypeInclusion.ALWAYS:
+                type_always = True
+            elif self.type_inclusion == TypeInclusion.AS_NEEDED:
+                type_always = None
+            else:
+                raise ErrorUtil.enum_value_error(self.type_inclusion, TypeInclusion)
+            if self.type_format == TypeFormat.PASSTHROUGH:
+                type_value = data_type
+            elif self.type_format == TypeFormat.DEFAULT:
+                type_value = typename(data_type)
+            else:
+                raise ErrorUtil.enum_value_error(self.type_format, TypeFormat)
+            if self.type_placement not in (TypePlacement.FIRST, TypePlacement.LAST):
+                raise ErrorUtil.enum_value_error(self.type_placement, TypePlacement)
+        type_first = self.type_placement == TypePlacement.FIRST
+
+        # Use self to serialize keys unless a key serializer is specified
+        key_serializer = self.key_serializer if self.key_serializer is not None else self
+
+        # Select the method for each field based on the schema, the method is used when
+        # the type of field value is in fast_types, otherwise _serialize_field is invoked
+        fields = []
+        for field_spec in type_spec.fields:
+            field_type_hint = field_spec.field_type_hint
+            field_type = field_type_hint.schema_type
+            if field_type_hint.remaining is None and is_primitive_type(field_type):
+                fast_types, fast_method = frozenset((field_type,)), self.primitive_serializer.serialize
+            elif field_type_hint.remaining is None and is_enum_type(field_type):
+                fast_types, fast_method = frozenset((field_type,)), self.enum_serializer.serialize
+            elif field_type_hint.remaining is None and is_key_type(field_type):
+                fast_types, fast_method = frozenset((field_type,)), key_serializer.serialize
+            elif field_type_hint.remaining is None and is_data_key_or_record_type(field_type):
+                fast_types, fast_method = frozenset((field_type,)), self._serialize_inner
+            elif is_sequence_type(field_type):
+                fast_types, fast_method = frozenset((list, tuple)), self._serialize_inner
+            elif is_mapping_type(field_type):
+                fast_types, fast_method = frozenset(_PLAN_MAPPING_TYPES), self._serialize_inner
+            elif is_ndarray_type(field_type) and self.ndarray_format == NdarrayFormat.BINARY:
+                fast_types, fast_method = frozenset((np.ndarray,)), self._serialize_ndarray
+            elif is_ndarray_type(field_type):
+                fast_types, fast_method = frozenset((np.ndarray,)), self._serialize_inner
+            else:
+                fast_types, fast_method = frozenset(), None
+            field_name = field_spec.field_name
+            fields.append((field_name, self._serialize_key(field_name), field_type_hint, fast_types, fast_method))
+
+        return type_value, type_always, type_first, tuple(fields)
+
+    def _serialize_with_plan(self, data: Any, type_hint: TypeHint | None, plan: tuple) -> Any:
+        """Serialize data, key or record using the compiled plan, the result is the same as for interpreted path."""
+        type_value, type_always, type_first, fields = plan
+
+        # Perform check against the schema if provided irrespective of the type_inclusion setting
+        if type_hint is not None and (schema_type := type_hint.schema_type) is not None:
+            if not is_data_key_or_record_type(schema_type):
+                raise RuntimeError(f"Type '{typename(schema_type)}' is not a slotted class.")
+            if not isinstance(data, schema_type):
+                raise RuntimeError(
+                    f"Type {typename(type(data))} is not the same or a subclass of "
+                    f"the type {typename(schema_type)} specified in schema."
+                )
+        else:
+            schema_type = None
+
+        # Include type if schema type is not provided or not the same as data type when type_always is None
+        include_type = type_always if type_always is not None else schema_type is not type(data)
+
+        # Include type information first based on include_type and type_first flags
+        result = {self.type_field: type_value} if include_type and type_first else {}
+
+        # Serialize slot values in the order of declaration except those that are None
+        for field_name, serialized_key, field_type_hint, fast_types, fast_method in fields:
+            if is_empty(field_value := getattr(data, field_name)):
+                continue
+            elif type(field_value) in fast_types:
+                result[serialized_key] = fast_method(field_value, field_type_hint)
+            else:
+                key_serializer = self.key_serializer if self.key_serializer is not None else self
+                result[serialized_key] = self._serialize_field(
+                    field_value, field_type_hint, key_serializer=key_serializer
+                )
+
+        if include_type and not type_first:
+            # Include type information last based on include_type and type_first flags
+            result[self.type_field] = type_value
+        return result
+
+    def _get_deserialization_plan_for_data(self, data: Any, type_hint: TypeHint | None) -> tuple | bool:
+        """Get the deserialization plan for mapping data and type hint, return False to use the interpreted path."""
+        if self.type_inclusion == TypeInclusion.OMIT:
+            return False
+        type_name = data.get(self.type_field)
+        if type_hint is None:
+            # Type is determined by _type field, use interpreted path to report an error if not present
+            return self._get_deserialization_plan_by_name(type_name) if type_name is not None else False
+        elif type_hint.remaining is not None:
+            return False
+        elif not (plan := self._get_deserialization_plan(type_hint.schema_type)):
+            return False
+        elif type_name is None or type_name == plan[1]:
+            return plan
+        elif subtype_plan := self._get_deserialization_plan_by_name(type_name):
+            # If _type field is present, it must be a subclass of schema_type
+            if not issubclass(subtype_plan[0], type_hint.schema_type):
+                raise RuntimeError(
+                    f"Field _type={type_name} in serialized data\n"
+                    f"is not a subclass of schema type {typename(type_hint.schema_type)}."
+                )
+            return subtype_plan
+        else:
+            return False
+
+    def _get_deserialization_plan_by_name(self, type_name: str) -> tuple | bool:
+        """Get or compile the deserialization plan for the type name stored in serialized data."""
+        if self._deserialization_plans_by_name is None:
+            self._deserialization_plans_by_name = {}
+        if (plan := self._deserialization_plans_by_name.get(type_name)) is None:
+            plan = self._get_deserialization_plan(TypeSchema.for_type_name(type_name).type_)
+            self._deserialization_plans_by_name[type_name] = plan
+        return plan
+
+    def _get_deserialization_plan(self, schema_type: type) -> tuple | bool:
+        """Get or compile the deserialization plan for schema_type, return False if the type does not use a plan."""
+        if self._deserialization_plans is None:
+            self._deserialization_plans = {}
+        if (plan := self._deserialization_plans.get(schema_type)) is None:
+            plan = self._create_deserialization_plan(schema_type)
+            self._deserialization_plans[schema_type] = plan
+        return plan
+
+    def _create_deserialization_plan(self, schema_type: type) -> tuple | bool:
+        """
+        Compile deserialization plan for schema_type in the form (schema_class, type_name, fields)
+        where fields is a dict of (field_name, field_type_hint, check_inner, fast_types, fast_method)
+        indexed by serialized key. Return False for types that are not deserialized from a mapping.
+        """
+        if not isinstance(schema_type, type) or not is_data_key_or_record_type(schema_type):
+            return False
+        if not isinstance(type_spec := TypeSchema.for_type(schema_type), DataSpec):
+            return False
+
+        fields = {}
+        for field_spec in type_spec.fields or ():
+            field_type_hint = field_spec.field_type_hint
+            field_type = field_type_hint.schema_type
+
+            # Check for embedded encoded data if the field is not a string and inner_encoder is specified
+            check_inner = field_type is not str and self.inner_encoder is not None
+
+            # Select the method for each field based on the schema, the method is used when fast_types
+            # is None or the type of field value is in fast_types, otherwise deserialize is invoked
+            if field_type_hint.remaining is None and is_primitive_type(field_type):
+                fast_types, fast_method = None, self.primitive_serializer.deserialize
+            elif field_type_hint.remaining is None and is_enum_type(field_type):
+                fast_types, fast_method = frozenset((str, field_type)), self.enum_serializer.deserialize
+            elif field_type_hint.remaining is None and self.key_serializer is not None and is_key_type(field_type):
+                fast_types, fast_method = frozenset((str,)), self.key_serializer.deserialize
+            else:
+                fast_types, fast_method = None, self.deserialize
+
+            field_name = field_spec.field_name
+            fields[self._serialize_key(field_name)] = (
+                field_name,
+                field_type_hint,
+                check_inner,
+                fast_types,
+                fast_method,
+            )
+
+        return type_spec.type_, typename(schema_type), fields
+
+    def _deserialize_with_plan(self, data: Any, plan: tuple) -> Any:
+        """Deserialize mapping using the compiled plan, the result is the same as for interpreted path."""
+        schema_class, type_name, fields = plan
+
+        # Deserialize into a dict
+        result_dict = {}
+        for field_key, field_value in data.items():
+            if is_empty(field_value) or field_key.startswith("_"):
+                continue
+            elif (field_plan := fields.get(field_key)) is None:
+                self._key_error(type_name=type_name, field_key=field_key)
+            field_name, field_type_hint, check_inner, fast_types, fast_method = field_plan
+            if (
+                check_inner
+                and isinstance(field_value, str)
+                # TODO: Improve detection of embedded JSON
+                and (field_value.startswith('{"') or field_value.startswith("["))
+            ):
+                result_dict[field_name] = self.inner_serializer.deserialize(
+                    self.inner_encoder.decode(field_value), field_type_hint
+                )
+            elif fast_types is None or type(field_value) in fast_types:
+                result_dict[field_name] = fast_method(field_value, field_type_hint)
+            else:
+                result_dict[field_name] = self.deserialize(field_value, field_type_hint)
+
+        # Construct an instance of the target type
+        result = schema_class(**result_dict)
+
+        # Invoke build and return
+        return self._build_deserialized(result)
+
+    def _build_deserialized(self, data: Any) -> Any:
+        """Build deserialized data, key or record, skipping repeated validation for trusted data if enabled."""
+        if self.trusted and DbSettings.instance().db_trusted_build:
+            return DataUtil.trusted_build_(data)
+        else:
+            return data.build()
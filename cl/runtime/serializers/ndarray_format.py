@@ -0,0 +1,26 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import IntEnum
+from enum import auto
+
+
+class NdarrayFormat(IntEnum):
+    """Format used to serialize and deserialize NumPy arrays."""
+
+    DEFAULT = auto()
+    """Mapping with shape and a flat sequence of values, dtype is specified by the type hint."""
+
+    BINARY = auto()
+    """Bytes with a header specifying dtype and shape followed by the raw array buffer, see NdarrayUtil."""
@@ -56,6 +56,9 @@ class ApiSettings(Settings):
     api_max_age: int | None = None
     """Maximum time in seconds for browsers to cache the CORS response."""
 
+    api_db_executor_max_workers: int | None = None
+    """Maximum number of threads for DB operations invoked by REST API routes, ThreadPoolExecutor default if None."""
+
     def __init(self) -> None:
         """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
 
@@ -121,3 +124,10 @@ class ApiSettings(Settings):
 
         if self.api_max_age is not None and not isinstance(self.api_max_age, int):
             raise RuntimeError(f"{typename(type(self))} field 'max_age' must be an int or None.")
+
+        if self.api_db_executor_max_workers is not None and (
+            not isinstance(self.api_db_executor_max_workers, int) or self.api_db_executor_max_workers < 1
+        ):
+            raise RuntimeError(
+                f"{typename(type(self))} field 'db_executor_max_workers' must be a positive int or None."
+            )
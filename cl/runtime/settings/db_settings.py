@@ -56,6 +56,21 @@ class DbSettings(Settings):
     db_dir: str | None = None
     """Directory for database files (optional, defaults to '{project_root}/databases')."""
 
+    db_trusted_build: bool = True
+    """
+    Construct records loaded from DB without repeating the validation performed during deserialization,
+    set to False to validate every loaded record for debugging.
+    """
+
+    db_sqlite_pool_size: int = 16
+    """Maximum number of read-only connections for each SQLite database, one for each reading thread."""
+
+    db_sqlite_busy_timeout: float = 5.0
+    """Time in seconds an SQLite connection waits for a lock held by another connection before raising an error."""
+
+    db_sqlite_cached_statements: int = 256
+    """Number of prepared statements cached by each SQLite connection."""
+
     def __init(self) -> None:
         """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
 
@@ -50,6 +50,20 @@ class LogSettings(Settings):
     log_dir: str | None = None
     """Directory for log files (optional, defaults to '{project_root}/logs')."""
 
+    log_db_batch_size: int = 1
+    """
+    Number of log messages saved to DB in one batch by DbLogHandler, the choices are:
+    - 1: Save each message on the calling thread before returning from the logging call
+    - N > 1: Queue messages and save them on a background thread when N messages are queued,
+      log_db_flush_interval_sec has elapsed, or on task completion and shutdown
+    """
+
+    log_db_flush_interval_sec: float = 1.0
+    """Maximum time in seconds a queued log message waits before it is saved to DB when log_db_batch_size > 1."""
+
+    log_db_max_backlog: int = 10000
+    """Maximum number of queued log messages when log_db_batch_size > 1, new messages are dropped when exceeded."""
+
     def __init(self) -> None:
         """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
 
@@ -65,6 +79,15 @@ class LogSettings(Settings):
                 f"Lower, upper or mixed case can be used."
             )
 
+        if self.log_db_batch_size < 1:
+            raise RuntimeError(f"{typename(type(self))} field 'log_db_batch_size' must be positive.")
+        if self.log_db_flush_interval_sec <= 0:
+            raise RuntimeError(f"{typename(type(self))} field 'log_db_flush_interval_sec' must be positive.")
+        if self.log_db_max_backlog < self.log_db_batch_size:
+            raise RuntimeError(
+                f"{typename(type(self))} field 'log_db_max_backlog' must not be less than 'log_db_batch_size'."
+            )
+
     @classmethod
     def get_log_dir(cls) -> str:
         """Get database directory (optional, defaults to '{project_root}/logs')."""
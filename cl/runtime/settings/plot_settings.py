@@ -0,0 +1,35 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from dataclasses import dataclass
+from cl.runtime.settings.settings import Settings
+
+
+@dataclass(slots=True, kw_only=True)
+class PlotSettings(Settings):
+    """Settings for rendering plots."""
+
+    plot_cache_max_bytes: int = 64 * 1024 * 1024
+    """Maximum total size of rendered images in cache, least recently used images are evicted when exceeded."""
+
+    plot_render_max_workers: int = 0
+    """Number of worker processes for rendering plots, render in the calling thread under a lock if zero."""
+
+    def __init(self) -> None:
+        """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
+        if self.plot_cache_max_bytes < 0:
+            raise RuntimeError(f"Field plot_cache_max_bytes={self.plot_cache_max_bytes} must not be negative.")
+        if self.plot_render_max_workers < 0:
+            raise RuntimeError(f"Field plot_render_max_workers={self.plot_render_max_workers} must not be negative.")
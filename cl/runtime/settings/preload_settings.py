@@ -12,7 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextvars
+import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import final
 from typing_extensions import final
@@ -24,6 +28,8 @@ from cl.runtime.records.typename import typename
 from cl.runtime.settings.project_settings import ProjectSettings
 from cl.runtime.settings.settings import Settings
 
+_logger = logging.getLogger(__name__)
+
 
 @dataclass(slots=True, kw_only=True)
 @final
@@ -41,6 +47,12 @@ class PreloadSettings(Settings):
         - For JSON, the data is in json/ClassName/.../KeyToken1;KeyToken2.json where ... is optional dataset
     """
 
+    preload_max_workers: int | None = None
+    """Maximum number of CSV files read in parallel, defaults to the number of CPUs."""
+
+    preload_batch_size: int | None = None
+    """Number of CSV rows deserialized and saved to DB in one batch, defaults to CsvFileReader default."""
+
     def __init(self) -> None:
         """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
 
@@ -59,8 +71,22 @@ class PreloadSettings(Settings):
                 csv_file for csv_file in csv_files if os.path.basename(csv_file).split(".")[0] in record_type_names
             ]
 
-        # Preload from CSV
-        [CsvFileReader(file_path=csv_file).csv_to_db() for csv_file in csv_files]
+        # Preload from CSV, reading files in parallel and copying the active contexts into each worker thread
+        if csv_files:
+            # Files for record types that share a key type are read one after another by the same worker in the order
+            # of preload_dirs, so that a later file replaces the records with the same key from an earlier file
+            csv_file_groups = {}
+            for csv_file in csv_files:
+                key_type = CsvFileReader(file_path=csv_file).get_record_type().get_key_type()
+                csv_file_groups.setdefault(key_type, []).append(csv_file)
+            max_workers = min(len(csv_file_groups), self.preload_max_workers or os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Preload") as executor:
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self._preload_csv_files, csv_file_group)
+                    for csv_file_group in csv_file_groups.values()
+                ]
+                row_counts = [future.result() for future in futures]
+            _logger.info(f"Preloaded {sum(row_counts)} rows from {len(csv_files)} CSV files.")
 
         # TODO: Process YAML and JSON preloads
 
@@ -68,6 +94,21 @@ class PreloadSettings(Settings):
         config_records = active(DataSource).load_by_type(Config)
         tuple(config_record.run_configure() for config_record in config_records)
 
+    def _preload_csv_files(self, csv_files: list[str]) -> int:
+        """Save records from CSV files to DB one file after another, return the total number of rows."""
+        return sum(self._preload_csv_file(csv_file) for csv_file in csv_files)
+
+    def _preload_csv_file(self, csv_file: str) -> int:
+        """Save records from a single CSV file to DB, log and return the number of rows."""
+        start_time = time.perf_counter()
+        if self.preload_batch_size is not None:
+            reader = CsvFileReader(file_path=csv_file, batch_size=self.preload_batch_size)
+        else:
+            reader = CsvFileReader(file_path=csv_file)
+        result = reader.csv_to_db()
+        _logger.info(f"Preloaded {result} rows from {csv_file} in {time.perf_counter() - start_time:.3f}s.")
+        return result
+
     def _get_files(self, ext: str) -> list[str]:
         # Return empty list if no dirs are specified in settings
         if self.preload_dirs is None or len(self.preload_dirs) == 0:
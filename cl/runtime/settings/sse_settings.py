@@ -30,6 +30,9 @@ class SseSettings(Settings):
     sse_broker_uri: str | None = None
     """Event broker URI."""
 
+    sse_pull_interval_sec: float = 1.0
+    """Interval in seconds between checks for events published by other processes (for brokers that pull events)."""
+
     sse_test_prefix: str = "test_"
     """
     Prefix for unit test Event Broker that are created and deleted automatically.
@@ -42,3 +45,5 @@ class SseSettings(Settings):
     def __init(self) -> None:
         if not self.sse_broker_type:
             raise RuntimeError("Event broker is not specified in settings.")
+        if self.sse_pull_interval_sec <= 0:
+            raise RuntimeError(f"Field sse_pull_interval_sec={self.sse_pull_interval_sec} must be positive.")
@@ -40,17 +40,19 @@ class BinaryExperiment(Experiment, ABC):
         bar_labels = []
         values = []
 
-        # Get trials for all conditions
+        # Count trials for all conditions grouped by condition and outcome
         trial_query = TrialQuery(experiment=self.get_key()).build()
-        all_trials = active(DataSource).load_by_query(trial_query, cast_to=BinaryTrial)
+        group_counts = active(DataSource).count_by_group(
+            trial_query, group_by=("param", "outcome"), restrict_to=BinaryTrial
+        )
 
         params = active(DataSource).load_many(self.params, cast_to=Param)
         for param in params:
-            # Get trials for the condition
-            trials = tuple(trial for trial in all_trials if KeyUtil.is_equal(trial.param, param))
-            total = len(trials)
+            # Get counts for the condition
+            outcome_counts = [(outcome, n) for (x, outcome), n in group_counts if KeyUtil.is_equal(x, param)]
+            total = sum(n for _, n in outcome_counts)
 
-            true_trials = sum(trial.outcome for trial in trials)
+            true_trials = sum(n for outcome, n in outcome_counts if outcome)
             false_trials = total - true_trials
 
             group_labels.extend([param.label] * 2)
@@ -47,17 +47,21 @@ class ClassifierExperiment(Experiment, ABC):
 
         param_counts = []
 
-        # Get trials for all conditions
+        # Count trials for all conditions grouped by condition and label
         trial_query = TrialQuery(experiment=self.get_key()).build()
-        all_trials = active(DataSource).load_by_query(trial_query, cast_to=ClassifierTrial)
+        group_counts = active(DataSource).count_by_group(
+            trial_query, group_by=("param", "label"), restrict_to=ClassifierTrial
+        )
 
         params = active(DataSource).load_many(self.params, cast_to=Param)
         for param in params:
-            # Get trials for the condition
-            trials = tuple(trial for trial in all_trials if KeyUtil.is_equal(trial.param, param))
+            # Get counts for the condition
+            class_counts = Counter()
+            for (x, label), n in group_counts:
+                if KeyUtil.is_equal(x, param):
+                    class_counts[label] += n
 
-            total = len(trials)
-            class_counts = Counter(trial.label for trial in trials)
+            total = class_counts.total()
             param_counts.append((param.label, class_counts, total))
 
         for param_id, counts, total in param_counts:
@@ -12,17 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextvars
+import threading
 from abc import ABC
 from abc import abstractmethod
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from dataclasses import dataclass
+from typing import Sequence
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
 from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.plots.plot import Plot
 from cl.runtime.records.for_dataclasses.extensions import required
 from cl.runtime.records.key_util import KeyUtil
+from cl.runtime.records.protocols import is_record_type
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.records.typename import typename
+from cl.runtime.serializers.key_serializers import KeySerializers
 from cl.runtime.params.param import Param
 from cl.runtime.params.param_key import ParamKey
 from cl.runtime.stat.experiment_key import ExperimentKey
@@ -31,6 +40,15 @@ from cl.runtime.stat.trial_key import TrialKey
 from cl.runtime.stat.trial_query import TrialQuery
 from cl.runtime.views.png_view import PngView
 
+_KEY_SERIALIZER = KeySerializers.DELIMITED
+"""Serializer for experiment and condition keys in the dictionary of trials in flight."""
+
+_IN_FLIGHT_TRIALS: dict[tuple[str, str], int] = defaultdict(int)
+"""Number of trials started but not yet saved in this process, indexed by serialized experiment and condition keys."""
+
+_IN_FLIGHT_TRIALS_LOCK = threading.RLock()
+"""Reentrant lock for checking and updating _IN_FLIGHT_TRIALS."""
+
 
 @dataclass(slots=True, kw_only=True)
 class Experiment(ExperimentKey, RecordMixin, ABC):
@@ -43,7 +61,7 @@ class Experiment(ExperimentKey, RecordMixin, ABC):
     """Maximum number of trials to run per condition (optional)."""
 
     max_parallel: int | None = None
-    """Maximum number of trials to run in parallel across all conditions (optional, do not restrict if not set)."""
+    """Maximum number of trials to run in parallel across all conditions (optional, run sequentially if not set)."""
 
     def get_key(self) -> ExperimentKey:
         return ExperimentKey(experiment_id=self.experiment_id).build()
@@ -72,9 +90,7 @@ class Experiment(ExperimentKey, RecordMixin, ABC):
     def view_trials(self) -> tuple[TrialKey, ...]:
         """View trials of the experiment."""
         trial_query = TrialQuery(experiment=self.get_key()).build()
-        trials = active(DataSource).load_by_query(trial_query, cast_to=Trial)
-        trial_keys = [x.get_key() for x in trials]  # TODO: Use project_to instead of get_key
-        return trial_keys
+        return active(DataSource).load_by_query(trial_query, project_to=TrialKey)
 
     @abstractmethod
     def get_plot(self, plot_id: str) -> Plot:
@@ -90,28 +106,35 @@ class Experiment(ExperimentKey, RecordMixin, ABC):
 
     def run_launch_one_trial(self) -> None:
         """Run one trial for each condition, error if max_trials is already reached or exceeded."""
-        if self.max_parallel is not None and self.max_parallel != 1:
-            raise RuntimeError(f"Parallel trial execution is not yet supported.")
         num_completed_trials = self.calc_num_completed_trials()
-        if self.max_trials is not None and any(x >= self.max_trials for x in num_completed_trials):
-            raise UserError(
-                f"For at least one condition, the number of completed trials {max(num_completed_trials)}\n"
-                f"has already reached or exceeded max_trials={self.max_trials}."
-            )
-        for param in self.params:  # TODO: !! Make parallel
-            # Run one additional trial for each condition
-            self.save_trial(param)
+        with _IN_FLIGHT_TRIALS_LOCK:
+            # Include trials in flight in the check and reserve a trial for each condition in the same lock
+            num_trials = tuple(x + y for x, y in zip(num_completed_trials, self._get_num_in_flight_trials()))
+            if self.max_trials is not None and any(x >= self.max_trials for x in num_trials):
+                raise UserError(
+                    f"For at least one condition, the number of completed and running trials {max(num_trials)}\n"
+                    f"has already reached or exceeded max_trials={self.max_trials}."
+                )
+            conditions = list(self.params)
+            self._add_in_flight_trials(conditions, 1)
+        self._run_trials(conditions)
 
     def run_launch_many_trials(self, *, max_trials: int) -> None:
         """Run to reach the specified maximum number of trials for each condition."""
-        if self.max_parallel is not None and self.max_parallel != 1:
-            raise RuntimeError(f"Parallel trial execution is not yet supported.")
         num_additional_trials = self.calc_num_additional_trials(max_trials)
-        for trial_idx in range(max(num_additional_trials)):
-            for param_idx, param in enumerate(self.params):  # TODO: !! Make parallel
-                # Run up to num_additional_trials for the current condition
-                if trial_idx < num_additional_trials[param_idx]:
-                    self.save_trial(param)
+        with _IN_FLIGHT_TRIALS_LOCK:
+            # Exclude trials in flight and reserve the remaining trials in the same lock
+            num_additional_trials = tuple(
+                max(x - y, 0) for x, y in zip(num_additional_trials, self._get_num_in_flight_trials())
+            )
+            conditions = [
+                param
+                for trial_idx in range(max(num_additional_trials, default=0))
+                for param_idx, param in enumerate(self.params)
+                if trial_idx < num_additional_trials[param_idx]
+            ]
+            self._add_in_flight_trials(conditions, 1)
+        self._run_trials(conditions)
 
     def run_launch_all_trials(self) -> None:
         """Run trials until Experiment.max_trials is reached or exceeded."""
@@ -126,14 +149,14 @@ class Experiment(ExperimentKey, RecordMixin, ABC):
 
     def calc_num_completed_trials(self) -> tuple[int, ...]:
         """
-        Get the number of completed trials for each condition by running a query.
+        Get the number of completed trials for each condition by running a grouped count query.
 
         Notes:
-            Requires a DB query and may be slow, cache the result if possible.
+            Requires a DB query, cache the result if possible.
         """
         trial_query = TrialQuery(experiment=self.get_key()).build()
-        trials = active(DataSource).load_by_query(trial_query)  # TODO: Use project_to=Trial to reduce data transfer
-        counts = tuple(sum(1 for t in trials if KeyUtil.is_equal(t.param, c)) for c in self.params)
+        group_counts = active(DataSource).count_by_group(trial_query, group_by=("param",), restrict_to=Trial)
+        counts = tuple(sum(n for (param,), n in group_counts if KeyUtil.is_equal(param, c)) for c in self.params)
         return counts
 
     def calc_num_additional_trials(self, max_trials: int) -> tuple[int, ...]:
@@ -160,3 +183,81 @@ class Experiment(ExperimentKey, RecordMixin, ABC):
         # Because of the preceding check, the tuple will have non-negative elements
         num_additional_trials = tuple(max_trials - x for x in num_completed_trials)
         return num_additional_trials
+
+    def _run_trials(self, conditions: Sequence[ParamKey]) -> None:
+        """
+        Create and save one trial for each element of conditions, which must already be added to trials in flight.
+
+        Notes:
+            - If max_parallel is greater than one, create_trial runs concurrently in a thread pool with the active
+              contexts of the caller, and the finished trials are saved in batches of up to max_parallel records
+            - Conditions are removed from trials in flight when their trials are saved or the run fails
+        """
+        if self.max_parallel is None or self.max_parallel == 1 or len(conditions) <= 1:
+            # Run sequentially in the calling thread
+            num_saved = 0
+            try:
+                for condition in conditions:
+                    self.save_trial(condition)
+                    self._add_in_flight_trials([condition], -1)
+                    num_saved += 1
+            finally:
+                self._add_in_flight_trials(conditions[num_saved:], -1)
+            return
+
+        # Each worker runs in a copy of the caller's contextvars, which carries the active contexts without
+        # invoking their __enter__ and __exit__ methods concurrently from multiple threads
+        executor = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix=typename(type(self)))
+        unsaved_futures = {
+            executor.submit(contextvars.copy_context().run, self.create_trial, condition): condition
+            for condition in conditions
+        }
+        try:
+            not_done = set(unsaved_futures)
+            while not_done:
+                done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+                finished = [x for x in unsaved_futures if x.done()]
+                if len(finished) >= self.max_parallel or not not_done:
+                    self._save_trials([x.result() for x in finished], [unsaved_futures.pop(x) for x in finished])
+        except Exception:
+            # Cancel trials that are not yet started, wait for running trials to complete and save the successful
+            # trials before propagating the error
+            executor.shutdown(wait=True, cancel_futures=True)
+            succeeded = [x for x in unsaved_futures if not x.cancelled() and x.exception() is None]
+            self._save_trials([x.result() for x in succeeded], [unsaved_futures.pop(x) for x in succeeded])
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            self._add_in_flight_trials(list(unsaved_futures.values()), -1)
+
+    def _save_trials(self, trials: Sequence[Trial], conditions: Sequence[ParamKey]) -> None:
+        """Save trials in one batch and remove their conditions from trials in flight."""
+        try:
+            if trials:
+                active(DataSource).replace_many(trials, commit=True)
+        finally:
+            self._add_in_flight_trials(conditions, -1)
+
+    def _get_num_in_flight_trials(self) -> tuple[int, ...]:
+        """Get the number of trials in flight in this process for each condition, must be called under lock."""
+        experiment_key = _KEY_SERIALIZER.serialize(self.get_key())
+        return tuple(
+            _IN_FLIGHT_TRIALS.get((experiment_key, _KEY_SERIALIZER.serialize(self._get_condition_key(x))), 0)
+            for x in self.params
+        )
+
+    def _add_in_flight_trials(self, conditions: Sequence[ParamKey], increment: int) -> None:
+        """Add increment to the number of trials in flight for each element of conditions."""
+        experiment_key = _KEY_SERIALIZER.serialize(self.get_key())
+        with _IN_FLIGHT_TRIALS_LOCK:
+            for condition in conditions:
+                in_flight_key = (experiment_key, _KEY_SERIALIZER.serialize(self._get_condition_key(condition)))
+                if (count := _IN_FLIGHT_TRIALS[in_flight_key] + increment) > 0:
+                    _IN_FLIGHT_TRIALS[in_flight_key] = count
+                else:
+                    del _IN_FLIGHT_TRIALS[in_flight_key]
+
+    @classmethod
+    def _get_condition_key(cls, condition: ParamKey) -> ParamKey:
+        """Return the key of condition which may be a key or a record."""
+        return condition.get_key() if is_record_type(type(condition)) else condition
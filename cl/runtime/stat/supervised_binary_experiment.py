@@ -39,27 +39,29 @@ class SupervisedBinaryExperiment(BinaryExperiment, ABC):
         bar_labels = []
         values = []
 
-        # Get trials for all conditions
+        # Count trials for all conditions grouped by condition, actual and expected outcome
         trial_query = TrialQuery(experiment=self.get_key()).build()
-        all_trials = active(DataSource).load_by_query(trial_query, cast_to=SupervisedBinaryTrial)
+        group_counts = active(DataSource).count_by_group(
+            trial_query, group_by=("param", "outcome", "expected_outcome"), restrict_to=SupervisedBinaryTrial
+        )
 
         params = active(DataSource).load_many(self.params, cast_to=Param)
         for param in params:
-            # Get trials for the condition
-            trials = tuple(trial for trial in all_trials if KeyUtil.is_equal(trial.param, param))
-            total = len(trials)
+            # Get counts for the condition
+            outcome_counts = [(x[1:], n) for x, n in group_counts if KeyUtil.is_equal(x[0], param)]
+            total = sum(n for _, n in outcome_counts)
 
             tp = tn = fp = fn = 0
 
-            for trial in trials:
-                if trial.outcome and trial.expected_outcome:
-                    tp += 1
-                elif not trial.outcome and not trial.expected_outcome:
-                    tn += 1
-                elif trial.outcome and not trial.expected_outcome:
-                    fp += 1
-                elif not trial.outcome and trial.expected_outcome:
-                    fn += 1
+            for (outcome, expected_outcome), n in outcome_counts:
+                if outcome and expected_outcome:
+                    tp += n
+                elif not outcome and not expected_outcome:
+                    tn += n
+                elif outcome and not expected_outcome:
+                    fp += n
+                elif not outcome and expected_outcome:
+                    fn += n
 
             group_labels.extend([param.label] * 4)
             bar_labels.extend(["TP", "TN", "FP", "FN"])
@@ -39,25 +39,22 @@ class SupervisedClassifierExperiment(ClassifierExperiment, ABC):
         plots = []
         num_labels = len(self.class_labels)
 
-        # Get trials for all conditions
+        # Count trials for all conditions grouped by condition, actual and expected label
         trial_query = TrialQuery(experiment=self.get_key()).build()
-        all_trials = active(DataSource).load_by_query(trial_query, cast_to=SupervisedClassifierTrial)
+        group_counts = active(DataSource).count_by_group(
+            trial_query, group_by=("param", "label", "expected_label"), restrict_to=SupervisedClassifierTrial
+        )
 
         params = active(DataSource).load_many(self.params, cast_to=Param)
         for param in params:
-            # Get trials for the condition
-            trials = tuple(trial for trial in all_trials if KeyUtil.is_equal(trial.param, param))
-
-            y_true = [trial.label for trial in trials]
-            y_pred = [trial.expected_label for trial in trials]
-
             matrix = np.zeros((num_labels, num_labels), dtype=int)
             label_to_index = {label: i for i, label in enumerate(self.class_labels)}
 
-            for true, pred in zip(y_true, y_pred):
-                i = label_to_index[true]
-                j = label_to_index[pred]
-                matrix[i, j] += 1
+            for (x, true, pred), n in group_counts:
+                if KeyUtil.is_equal(x, param):
+                    i = label_to_index[true]
+                    j = label_to_index[pred]
+                    matrix[i, j] += n
 
             row_labels = np.repeat(self.class_labels, len(self.class_labels)).tolist()
             col_labels = self.class_labels * num_labels
@@ -25,6 +25,7 @@ from cl.runtime.events.event_broker import EventBroker
 from cl.runtime.events.event_kind import EventKind
 from cl.runtime.events.task_event import TaskEvent
 from cl.runtime.events.task_finished_event import TaskFinishedEvent
+from cl.runtime.log.db_log_handler import DbLogHandler
 from cl.runtime.log.task_log import TaskLog
 from cl.runtime.primitive.datetime_util import DatetimeUtil
 from cl.runtime.primitive.timestamp import Timestamp
@@ -153,6 +154,9 @@ class Task(TaskKey, RecordMixin, ABC):
                 update.remaining_sec = 0.0
                 active(DataSource).replace_one(update.build(), commit=True)
 
+            # Save log messages queued for this task if batched logging to DB is enabled
+            DbLogHandler.flush_all()
+
     def run_task_in_process(self):
         return self._execute()
 
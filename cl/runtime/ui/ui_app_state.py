@@ -83,7 +83,7 @@ class UiAppState(UiAppStateKey, RecordMixin):
             user=UserKey(username="root")
         ).build()  # TODO: Review the use of root default
 
-        default_app_state = active(DataSource).load_one(default_app_state_key, cast_to=UiAppState)
+        default_app_state = active(DataSource).load_one_or_none(default_app_state_key, cast_to=UiAppState)
         if default_app_state is not None and default_app_state.application_theme is not None:
             return default_app_state.application_theme
 
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from memoization import cached
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
 from cl.runtime.log.exceptions.user_error import UserError
@@ -20,7 +21,6 @@ from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.records.for_dataclasses.extensions import required
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.view.dag.dag import Dag
-from cl.runtime.view.dag.dag_edge import DagEdge
 from cl.runtime.view.dag.dag_layout import DagLayout
 from cl.runtime.view.dag.dag_node_data import DagNodeData
 from cl.runtime.view.dag.nodes.dag_node import DagNode
@@ -88,6 +88,9 @@ class SuccessorDagNode(SuccessorDagNodeKey, RecordMixin):
         node: "SuccessorDagNode",
         layout_mode: DagLayout = DagLayout.PLANAR,
         ignore_fields: list[str] | None = None,
+        *,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
     ) -> Dag:
         """Build the DAG for the given node.
 
@@ -95,102 +98,58 @@ class SuccessorDagNode(SuccessorDagNodeKey, RecordMixin):
             node: The root node to start the DAG from.
             layout_mode: Layout mode for arranging the DAG. Defaults to DagLayout.PLANAR.
             ignore_fields: Fields to ignore during traversal. Defaults to an empty list.
+            max_depth: Optional maximum number of edges from the root node, for incremental expansion in the UI.
+            max_nodes: Optional maximum number of nodes, nodes beyond the limit and their edges are not included.
 
         Returns:
             Dag: The constructed directed acyclic graph (DAG).
         """
         ignore_fields = ignore_fields or []
-        nodes, edges = [node.to_dag_node()], []
-
-        def traverse_graph_from_node(node_record: SuccessorDagNode, source_node: DagNode):
-            """Recursively traverse the graph starting from the given node.
-
-            Args:
-                node_record (SuccessorDagNode): The node to start traversal from.
-                source_node (DagNode): The corresponding DAG node.
-            """
-            slots = getattr(node_record, "__slots__", None)
-            if not slots:
-                return
-
-            node_fields = {
-                field_name: field_value
-                for field_name in slots
-                if (
-                    isinstance((field_value := getattr(node_record, field_name)), SuccessorDagNodeKey)
-                    # TODO (Yauheni): Use declarations instead of isinstance
-                    # TODO: (Yauheni): Current filtration filters out the empty lists, which should be processed
-                    or (
-                        field_value
-                        and hasattr(field_value, "__iter__")
-                        and isinstance(field_value[0], SuccessorDagNodeKey)
-                    )
-                    and field_name not in ignore_fields
-                )
-            }
-
-            for field_name, field_value in node_fields.items():
-                if isinstance(field_value, SuccessorDagNodeKey):
-                    loaded_node = active(DataSource).load_one(field_value, cast_to=SuccessorDagNodeKey)
-                    if loaded_node is None:
-                        SuccessorDagNode.__append_empty_node(
-                            source_node=source_node,
-                            node_id=field_value.node_id,
-                            edge_label=CaseUtil.snake_to_title_case(field_name),
-                            nodes=nodes,
-                            edges=edges,
-                        )
-                        continue
 
-                    tree_node = loaded_node.to_dag_node()
-                    edges.append(
-                        Dag.build_edge_between_nodes(
-                            source=source_node,
-                            target=tree_node,
-                            label=CaseUtil.snake_to_title_case(field_name),
-                        )
-                    )
-                    if tree_node not in nodes:
-                        nodes.append(tree_node)
-                        traverse_graph_from_node(node_record=loaded_node, source_node=tree_node)
-                else:
-                    if not field_value:
-                        continue
+        # DAG nodes indexed by node_id in the order of breadth-first traversal
+        nodes = {node.node_id: node.to_dag_node()}
+        edges = []
+
+        # Traverse breadth-first, loading the successors of all nodes at the same depth in one call
+        frontier = [node]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+
+            # Collect (source node, successor key, edge label) for each successor of the frontier nodes
+            links = [
+                (nodes[node_record.node_id], successor_key, edge_label)
+                for node_record in frontier
+                for successor_key, edge_label in node_record._get_successors(ignore_fields)
+            ]
 
-                    for index, node_key in enumerate(field_value, start=1):
-                        edge_label = f"{CaseUtil.snake_to_title_case(field_name)}[{index}]"
-
-                        if field_name.endswith("nodes"):
-                            edges_names_field_name = field_name.rstrip("nodes") + "edges"
-                            edges_names = getattr(node_record, edges_names_field_name, None)
-                            if edges_names and len(edges_names) == len(field_value):
-                                edge_label = edges_names[index - 1]
-
-                        loaded_node = active(DataSource).load_one(node_key, cast_to=SuccessorDagNodeKey)
-                        if loaded_node is None:
-                            SuccessorDagNode.__append_empty_node(
-                                source_node=source_node,
-                                node_id=node_key.node_id,
-                                edge_label=edge_label,
-                                nodes=nodes,
-                                edges=edges,
-                            )
-                            continue
-
-                        tree_node = loaded_node.to_dag_node()
-                        edges.append(
-                            Dag.build_edge_between_nodes(
-                                source=source_node,
-                                target=tree_node,
-                                label=edge_label,
-                            )
-                        )
-                        if tree_node not in nodes:
-                            nodes.append(tree_node)
-                            traverse_graph_from_node(node_record=loaded_node, source_node=tree_node)
-
-        traverse_graph_from_node(node, nodes[0])
-        dag = Dag(name=f"DAG from `{node.node_id}` node", nodes=nodes, edges=edges)
+            # Load the successors that are not yet visited, a record in place of a key is used without DB lookup
+            keys_to_load = {}
+            for _, successor_key, _ in links:
+                if successor_key.node_id not in nodes:
+                    keys_to_load.setdefault(successor_key.node_id, successor_key)
+            loaded_records = active(DataSource).load_many_or_none(
+                tuple(keys_to_load.values()), cast_to=SuccessorDagNode
+            )
+            records_dict = dict(zip(keys_to_load, loaded_records))
+
+            frontier = []
+            for source_node, successor_key, edge_label in links:
+                node_id = successor_key.node_id
+                if (target_node := nodes.get(node_id)) is None:
+                    if max_nodes is not None and len(nodes) >= max_nodes:
+                        # Skip nodes beyond the limit together with their edges
+                        continue
+                    if (loaded_record := records_dict[node_id]) is not None:
+                        target_node = loaded_record.to_dag_node()
+                        frontier.append(loaded_record)
+                    else:
+                        # TODO (Yauheni): Add color information to the node with entry, which doesn't exist
+                        target_node = DagNode(id_=node_id, data=DagNodeData(label=node_id))
+                    nodes[node_id] = target_node
+                edges.append(Dag.build_edge_between_nodes(source=source_node, target=target_node, label=edge_label))
+
+        dag = Dag(name=f"DAG from `{node.node_id}` node", nodes=list(nodes.values()), edges=edges)
         return Dag.auto_layout_dag(dag, layout_mode)
 
     def to_dag_node(self) -> DagNode:
@@ -199,19 +158,42 @@ class SuccessorDagNode(SuccessorDagNodeKey, RecordMixin):
         node_data.node_data = {"title": self.node_id, "data": self.node_yaml}
         return DagNode(id_=self.node_id, data=node_data)
 
-    @staticmethod
-    def __append_empty_node(
-        source_node: DagNode,
-        node_id: str,
-        edge_label: str,
-        nodes: list[DagNode],
-        edges: list[DagEdge],
-    ) -> None:
-        """Append empty node to the list of nodes and edge to the list of edges."""
-        # TODO (Yauheni): Add color information to the node with entry, which doesn't exist
-        empty_node = DagNode(id_=node_id, data=DagNodeData(label=node_id))
-        if empty_node not in nodes:
-            nodes.append(empty_node)
-        edges.append(
-            Dag.build_edge_between_nodes(source=source_node, target=empty_node, label=edge_label),
-        )
+    def _get_successors(self, ignore_fields: list[str]) -> list[tuple[SuccessorDagNodeKey, str]]:
+        """Return (successor key, edge label) for each successor in the order of fields and their elements."""
+        result = []
+        for field_name, is_sequence in self._get_successor_fields():
+            if field_name in ignore_fields or not (field_value := getattr(self, field_name)):
+                continue
+            field_label = CaseUtil.snake_to_title_case(field_name)
+            if not is_sequence:
+                result.append((field_value, field_label))
+                continue
+
+            # Use edge names from the matching edges field if specified and has the same size
+            edge_names = None
+            if field_name.endswith("nodes"):
+                edge_names = getattr(self, field_name.removesuffix("nodes") + "edges", None)
+                if edge_names and len(edge_names) != len(field_value):
+                    edge_names = None
+            result.extend(
+                (node_key, edge_names[index] if edge_names else f"{field_label}[{index + 1}]")
+                for index, node_key in enumerate(field_value)
+            )
+        return result
+
+    @classmethod
+    @cached
+    def _get_successor_fields(cls) -> tuple[tuple[str, bool], ...]:
+        """Return (field name, True if a sequence) for the fields of this type that hold successor keys."""
+        result = []
+        for field_spec in cls.get_type_spec().fields:
+            type_hint = field_spec.field_type_hint
+            if type_hint.remaining is not None:
+                # Sequence of successors
+                type_hint = type_hint.remaining
+                is_sequence = True
+            else:
+                is_sequence = False
+            if isinstance(type_hint.schema_type, type) and issubclass(type_hint.schema_type, SuccessorDagNodeKey):
+                result.append((field_spec.field_name, is_sequence))
+        return tuple(result)
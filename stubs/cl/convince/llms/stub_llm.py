@@ -0,0 +1,90 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from types import SimpleNamespace
+from typing import Optional
+from cl.convince.llms.llm import Llm
+
+
+class StubRateLimitError(Exception):
+    """Simulates the rate limit error returned by LLM provider SDKs."""
+
+    status_code = 429
+    """HTTP status code for rate limit errors."""
+
+    response = SimpleNamespace(headers={"retry-after": "0.01"})
+    """Response with the Retry-After header in seconds."""
+
+
+@dataclass(slots=True, kw_only=True)
+class StubLlm(Llm):
+    """Local LLM stub that simulates provider latency and rate limit errors."""
+
+    latency: float = 0.0
+    """Delay in seconds before each call returns."""
+
+    rate_limit_count: int = 0
+    """Number of initial calls that raise a rate limit error."""
+
+    error_query: str | None = None
+    """Query for which each call raises an error that is not retried."""
+
+    _lock: Optional[Lock] = None
+    """Lock for updating the call counters from multiple threads."""
+
+    _call_count: int = 0
+    """Number of calls to uncached_completion including those that raised an error."""
+
+    _active_count: int = 0
+    """Number of calls in progress."""
+
+    _max_active_count: int = 0
+    """Maximum number of calls in progress at the same time."""
+
+    def __init(self) -> None:
+        """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
+        self._lock = Lock()
+
+    @classmethod
+    def get_max_concurrency(cls) -> int:
+        return 4
+
+    def get_call_count(self) -> int:
+        """Number of calls to uncached_completion including those that raised an error."""
+        return self._call_count
+
+    def get_max_active_count(self) -> int:
+        """Maximum number of calls in progress at the same time."""
+        return self._max_active_count
+
+    def uncached_completion(self, request_id: str, query: str) -> str:
+        with self._lock:
+            self._call_count += 1
+            is_rate_limited = self._call_count <= self.rate_limit_count
+            self._active_count += 1
+            self._max_active_count = max(self._max_active_count, self._active_count)
+        try:
+            time.sleep(self.latency)
+            if is_rate_limited:
+                raise StubRateLimitError("Rate limit exceeded.")
+            if query == self.error_query:
+                raise RuntimeError(f"Completion failed for: {query}")
+            return f"Completion for: {query}"
+        finally:
+            with self._lock:
+                self._active_count -= 1
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from typing import Any
 import numpy as np
 from cl.runtime.records.for_dataclasses.extensions import required
 from cl.runtime.records.protocols import FloatArray
@@ -45,5 +46,11 @@ class StubDataclassNumpyFields(StubDataclass):
     )
     """3D ndarray."""
 
+    single_array: np.ndarray[Any, np.dtype[np.float32]] | None = None
+    """NumPy array with dtype=np.float32 and any number of dimensions."""
+
+    int_array: np.ndarray[Any, np.dtype[np.int64]] | None = None
+    """NumPy array with dtype=np.int64 and any number of dimensions."""
+
     # untyped_ndarray: np.ndarray | None = None  # noqa Not a valid type hint, this is an invalid sample
     # """Stub field."""
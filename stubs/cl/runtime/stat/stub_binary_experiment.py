@@ -13,20 +13,53 @@
 # limitations under the License.
 
 import random
+import time
 from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+from cl.runtime.contexts.context_manager import active
+from cl.runtime.db.data_source import DataSource
+from cl.runtime.params.param_key import ParamKey
 from cl.runtime.stat.binary_experiment import BinaryExperiment
 from cl.runtime.stat.binary_trial import BinaryTrial
-from cl.runtime.params.param_key import ParamKey
 
 
 @dataclass(slots=True, kw_only=True)
 class StubBinaryExperiment(BinaryExperiment):
     """Stub implementation of BinaryExperiment."""
 
+    trial_duration_sec: float | None = None
+    """Sleep for this duration in create_trial to simulate an I/O bound trial (optional)."""
+
+    _lock: Optional[Lock] = None
+    """Lock for updating the trial counters from multiple threads."""
+
+    _active_count: int = 0
+    """Number of simulated trials in progress."""
+
+    _max_active_count: int = 0
+    """Maximum number of simulated trials in progress at the same time."""
+
     def __init(self) -> None:
         """Use instead of __init__ in the builder pattern, invoked by the build method in base to derived order."""
+        self._lock = Lock()
+
+    def get_max_active_count(self) -> int:
+        """Maximum number of simulated trials in progress at the same time."""
+        return self._max_active_count
 
     def create_trial(self, condition: ParamKey) -> BinaryTrial:
+        if self.trial_duration_sec is not None:
+            # Simulate an I/O bound trial that requires the active data source and count concurrent trials
+            with self._lock:
+                self._active_count += 1
+                self._max_active_count = max(self._max_active_count, self._active_count)
+            try:
+                active(DataSource)
+                time.sleep(self.trial_duration_sec)
+            finally:
+                with self._lock:
+                    self._active_count -= 1
         outcome = random.choice([True, False])
         return BinaryTrial(
             experiment=self.get_key(),
@@ -17,6 +17,9 @@ import os
 from cl.runtime.primitive.timestamp import Timestamp
 from cl.runtime.qa.qa_util import QaUtil
 from cl.convince.llms.completion_cache import CompletionCache
+from cl.convince.llms.completion_cache import _CompletionStore
+from cl.convince.llms.completion_key_gen import CompletionKeyGen
+from cl.convince.llms.llm_key import LlmKey
 
 module_path = __file__.removesuffix(".py")
 
@@ -60,6 +63,11 @@ def _get_request_id() -> str:
     return request_id
 
 
+def _get_completion_id(channel: str, query: str) -> str:
+    """Get completion_id for the channel and query."""
+    return CompletionKeyGen(llm=LlmKey(llm_id=channel), query=query).build().completion_id
+
+
 def _perform_testing(base_dir: str):
     """Stub test function without a class."""
 
@@ -142,6 +150,100 @@ def _perform_testing(base_dir: str):
     _delete_cache_files(base_dir, channels)
 
 
+def test_store(default_db_fixture):
+    """Test process-wide completion store shared by instances with the same channel."""
+
+    base_dir = QaUtil.get_test_dir_from_call_stack()
+    channels = ["store.1", "store.2"]
+    _delete_cache_files(base_dir, channels)
+
+    # Instances with the same channel share the store
+    caches = [CompletionCache(channel=channel).build() for channel in channels + channels[:1]]
+    assert caches[0]._store is caches[2]._store
+    assert caches[0]._store is not caches[1]._store
+    assert all(cache.get("a") is None for cache in caches)
+
+    # Rows appended to the file are read incrementally on lookup miss
+    caches[0].add(_get_request_id(), "a", "b")
+    offset = caches[0]._store.offset
+    caches[2].add(_get_request_id(), "c", "multiline \n value")
+    assert caches[2].get("c") == "multiline \n value"
+    assert caches[0]._store.offset > offset
+    assert caches[0].get("a") == "b"
+    assert caches[1].get("a") is None
+
+    # The latest row takes precedence, the offset is advanced past the rows added by the same process
+    offset = caches[0]._store.offset
+    caches[0].add(_get_request_id(), "a", "bb")
+    assert caches[0].get("a") == "bb"
+    assert caches[0]._store.offset == os.path.getsize(caches[0].output_path) > offset
+    new_cache = CompletionCache(channel=channels[0]).build()
+    assert new_cache._store is caches[0]._store
+    assert new_cache.get("c") == "multiline \n value"
+    assert new_cache.get("a") == "bb"
+    assert new_cache.get("e") is None
+
+    # Rows appended by another process before an add are read rather than skipped
+    other_cache = CompletionCache(channel=channels[0]).build()
+    other_cache._store = _CompletionStore()  # Simulate another process with its own store
+    other_cache.add(_get_request_id(), "g", "h")
+    caches[0].add(_get_request_id(), "a", "bbb")
+    assert caches[0]._store.completions[_get_completion_id(channels[0], "g")] == "h"
+    assert caches[0].get("a") == "bbb"
+    assert caches[0]._store.offset == os.path.getsize(caches[0].output_path)
+
+    # The file is read again from the beginning after it is recreated
+    _delete_cache_files(base_dir, channels)
+    caches[0].add(_get_request_id(), "e", "f")
+    assert caches[0].get("e") == "f"
+    assert caches[0]._store.completions.keys() == {_get_completion_id(channels[0], "e")}
+
+    # Check cache files eol format and delete the generated test cache files to prevent git diff
+    _check_cache_files_eol(base_dir, channels)
+    _delete_cache_files(base_dir, channels)
+
+
+def test_partial_row(default_db_fixture):
+    """Test that a multiline row partially written by another process is read after it is complete."""
+
+    base_dir = QaUtil.get_test_dir_from_call_stack()
+    channels = ["partial.1"]
+    _delete_cache_files(base_dir, channels)
+
+    cache = CompletionCache(channel=channels[0]).build()
+    cache.add(_get_request_id(), "a", "b")
+    offset = os.path.getsize(cache.output_path)
+    assert cache._store.offset == offset
+
+    # Get the bytes of a multiline row written by another process, then remove them
+    other_cache = CompletionCache(channel=channels[0]).build()
+    other_cache._store = _CompletionStore()  # Simulate another process with its own store
+    other_cache.add(_get_request_id(), "c", "line 1\nline 2\nline 3")
+    with open(cache.output_path, mode="rb+") as file:
+        file.seek(offset)
+        row_bytes = file.read()
+        file.truncate(offset)
+
+    # Append the row up to and including the first EOL inside the quoted completion
+    cut = row_bytes.index(b"\n") + 1
+    with open(cache.output_path, mode="ab") as file:
+        file.write(row_bytes[:cut])
+    cache._read_rows()  # noqa
+    assert _get_completion_id(channels[0], "c") not in cache._store.completions
+    assert cache._store.offset == offset
+
+    # Append the rest of the row
+    with open(cache.output_path, mode="ab") as file:
+        file.write(row_bytes[cut:])
+    cache._read_rows()  # noqa
+    assert cache._store.completions[_get_completion_id(channels[0], "c")] == "line 1\nline 2\nline 3"
+    assert cache._store.offset == os.path.getsize(cache.output_path)
+
+    # Delete the generated test cache files to prevent git diff
+    _check_cache_files_eol(base_dir, channels)
+    _delete_cache_files(base_dir, channels)
+
+
 @pytest.mark.skip("Test requires update after CompletionCache refactoring.")
 def test_function():
     """Stub test function without a class."""
@@ -0,0 +1,110 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+import asyncio
+import os
+import time
+from cl.convince.llms.completion_cache import CompletionCache
+from stubs.cl.convince.llms.stub_llm import StubLlm
+
+
+def _delete_cache_file(llm: StubLlm) -> None:
+    """Delete the cache file to prevent git diff."""
+    output_path = CompletionCache(channel=llm.llm_id).build().output_path
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+
+def test_completion_many(default_db_fixture):
+    """Test batched completion with deduplication, caching and concurrency limit."""
+    llm = StubLlm(llm_id="stub-completion-many", latency=0.2).build()
+    _delete_cache_file(llm)
+    try:
+        # Identical queries after formatting are sent once, calls run concurrently up to the limit
+        queries = [f"query{i % 8}" for i in range(16)] + [" query0 "]
+        start_time = time.time()
+        results = llm.completion_many(queries)
+        duration = time.time() - start_time
+        assert results == [f"Completion for: {x.strip()}" for x in queries]
+        assert llm.get_call_count() == 8
+        assert llm.get_max_active_count() == StubLlm.get_max_concurrency()
+        assert duration < 8 * llm.latency
+
+        # Cached completions are returned without calls, including to single query completion
+        assert llm.completion_many(queries[:4] + ["query8"]) == [f"Completion for: query{i}" for i in range(4)] + [
+            "Completion for: query8"
+        ]
+        assert llm.completion("query1") == "Completion for: query1"
+        assert llm.get_call_count() == 9
+
+        # Another instance uses the cache file
+        other_llm = StubLlm(llm_id=llm.llm_id).build()
+        assert other_llm.completion_many(queries) == results
+        assert other_llm.get_call_count() == 0
+    finally:
+        _delete_cache_file(llm)
+
+
+def test_completion_many_async(default_db_fixture):
+    """Test async batched completion."""
+    llm = StubLlm(llm_id="stub-completion-many-async", latency=0.2).build()
+    _delete_cache_file(llm)
+    try:
+        queries = [f"query{i % 8}" for i in range(16)]
+        results = asyncio.run(llm.completion_many_async(queries))
+        assert results == [f"Completion for: {x}" for x in queries]
+        assert llm.get_call_count() == 8
+        assert llm.get_max_active_count() == StubLlm.get_max_concurrency()
+        assert asyncio.run(llm.completion_many_async(queries[:2])) == results[:2]
+        assert llm.get_call_count() == 8
+    finally:
+        _delete_cache_file(llm)
+
+
+def test_rate_limit(default_db_fixture):
+    """Test retry after rate limit errors."""
+    llm = StubLlm(llm_id="stub-rate-limit", rate_limit_count=3).build()
+    _delete_cache_file(llm)
+    try:
+        assert llm.completion_many(["a", "b"]) == ["Completion for: a", "Completion for: b"]
+        assert llm.get_call_count() == 5
+    finally:
+        _delete_cache_file(llm)
+
+
+def test_partial_failure(default_db_fixture):
+    """Test that completions returned before an error are cached and the error is raised."""
+    llm = StubLlm(llm_id="stub-partial-failure", error_query="query1").build()
+    _delete_cache_file(llm)
+    try:
+        queries = [f"query{i}" for i in range(4)]
+        with pytest.raises(RuntimeError, match="Completion failed for: query1"):
+            llm.completion_many(queries)
+        assert llm.get_call_count() == 4
+        with pytest.raises(RuntimeError, match="Completion failed for: query1"):
+            asyncio.run(llm.completion_many_async(queries))
+        assert llm.get_call_count() == 5
+
+        # Successful completions are read from the cache file by another instance
+        other_llm = StubLlm(llm_id=llm.llm_id).build()
+        assert other_llm.completion_many(queries) == [f"Completion for: {x}" for x in queries]
+        assert other_llm.get_call_count() == 1
+    finally:
+        _delete_cache_file(llm)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,133 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from unittest import mock
+from cl.runtime.db.data_source import DataSource
+from cl.runtime.db.local.caching_db import CachingDb
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from stubs.cl.runtime import StubDataclass
+from stubs.cl.runtime import StubDataclassDerived
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_derived_query import StubDataclassDerivedQuery
+
+
+def test_read_through(sqlite_db_fixture):
+    """Test cache hits and misses when loading by key."""
+    caching_db = CachingDb(db=sqlite_db_fixture).build()
+    assert caching_db.db_id == sqlite_db_fixture.db_id
+    with DataSource(db=caching_db).build() as data_source:
+        records = [StubDataclass(id=f"abc{i}").build() for i in range(3)]
+        data_source.insert_many(records, commit=True)
+        keys = [x.get_key() for x in records]
+
+        # First load is a miss, the second is a hit that returns the same object
+        loaded = data_source.load_many(keys)
+        assert [x.id for x in loaded] == ["abc0", "abc1", "abc2"]
+        assert (caching_db.get_hit_count(), caching_db.get_miss_count()) == (0, 3)
+        reloaded = data_source.load_many(keys)
+        assert all(x is y for x, y in zip(loaded, reloaded))
+        assert (caching_db.get_hit_count(), caching_db.get_miss_count()) == (3, 3)
+
+        # Records that are not found are not cached
+        assert data_source.load_one_or_none(StubDataclass(id="xyz").get_key()) is None
+        assert data_source.load_one_or_none(StubDataclass(id="xyz").get_key()) is None
+        assert (caching_db.get_hit_count(), caching_db.get_miss_count()) == (3, 5)
+
+        # Clearing the cache resets the counters
+        caching_db.clear_cache()
+        assert data_source.load_one(keys[0]).id == "abc0"
+        assert (caching_db.get_hit_count(), caching_db.get_miss_count()) == (0, 1)
+
+
+def test_invalidation(sqlite_db_fixture):
+    """Test that cache entries are invalidated on writes and deletions."""
+    caching_db = CachingDb(db=sqlite_db_fixture).build()
+    with DataSource(db=caching_db).build() as data_source:
+        record = StubDataclassDerived(id="abc", derived_str_field="old").build()
+        data_source.insert_many([record], commit=True)
+        key = record.get_key()
+        assert data_source.load_one(key).derived_str_field == "old"
+
+        # Replace invalidates the entry
+        data_source.replace_many([StubDataclassDerived(id="abc", derived_str_field="new").build()], commit=True)
+        assert data_source.load_one(key).derived_str_field == "new"
+
+        # Delete by key invalidates the entry
+        data_source.delete_many([key], commit=True)
+        assert data_source.load_one_or_none(key) is None
+
+        # Queries are forwarded to the backend
+        data_source.insert_many([record], commit=True)
+        assert data_source.count_by_query(StubDataclassDerivedQuery(derived_str_field="old").build()) == 1
+
+
+def test_concurrent_write(sqlite_db_fixture):
+    """Test that a record loaded by a read that overlaps with a write to the same key is not cached."""
+    caching_db = CachingDb(db=sqlite_db_fixture).build()
+    with DataSource(db=caching_db).build() as data_source:
+        record = StubDataclassDerived(id="abc", derived_str_field="old").build()
+        data_source.insert_many([record], commit=True)
+        key = record.get_key()
+        new_record = StubDataclassDerived(id="abc", derived_str_field="new").build()
+        backend_load_many = SqliteDb.load_many
+
+        def _load_many_then_write(self, *args, **kwargs):
+            # The write completes after the backend returned the old record but before it is cached
+            result = backend_load_many(self, *args, **kwargs)
+            data_source.replace_many([new_record], commit=True)
+            return result
+
+        with mock.patch.object(SqliteDb, "load_many", _load_many_then_write):
+            assert data_source.load_one(key).derived_str_field == "old"
+
+        # The old record is not cached
+        assert data_source.load_one(key).derived_str_field == "new"
+        assert (caching_db.get_hit_count(), caching_db.get_miss_count()) == (0, 2)
+
+
+def test_delete_by_query(basic_mongo_mock_db_fixture):
+    """Test that delete by query invalidates all cache entries for the key type."""
+    caching_db = CachingDb(db=basic_mongo_mock_db_fixture).build()
+    with DataSource(db=caching_db).build() as data_source:
+        record = StubDataclassDerived(id="abc", derived_str_field="old").build()
+        data_source.insert_many([record], commit=True)
+        key = record.get_key()
+        assert data_source.load_one(key).derived_str_field == "old"
+        data_source.delete_by_query(StubDataclassDerivedQuery(derived_str_field="old").build())
+        assert data_source.load_one_or_none(key) is None
+
+
+def test_eviction(sqlite_db_fixture):
+    """Test that the least recently used records are evicted when max_size is exceeded."""
+    caching_db = CachingDb(db=sqlite_db_fixture, max_size=2).build()
+    with DataSource(db=caching_db).build() as data_source:
+        records = [StubDataclass(id=f"abc{i}").build() for i in range(3)]
+        data_source.insert_many(records, commit=True)
+        keys = [x.get_key() for x in records]
+
+        # Load abc0 and abc1, then use abc0 so that abc1 becomes the least recently used
+        data_source.load_many(keys[:2])
+        data_source.load_one(keys[0])
+        data_source.load_one(keys[2])
+        assert (caching_db.get_hit_count(), caching_db.get_miss_count()) == (1, 3)
+
+        # abc0 and abc2 are cached and abc1 is evicted
+        data_source.load_many([keys[0], keys[2]])
+        assert (caching_db.get_hit_count(), caching_db.get_miss_count()) == (3, 3)
+        data_source.load_one(keys[1])
+        assert (caching_db.get_hit_count(), caching_db.get_miss_count()) == (3, 4)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -16,8 +16,24 @@ import pytest
 from cl.runtime.contexts.context_manager import activate
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
+from cl.runtime.db.local.local_cache import _TABLES_DICT
 from cl.runtime.db.local.local_cache import LocalCache
+from cl.runtime.records.predicates import And
+from cl.runtime.records.predicates import Exists
+from cl.runtime.records.predicates import Gt
+from cl.runtime.records.predicates import Gte
+from cl.runtime.records.predicates import In
+from cl.runtime.records.predicates import Lt
+from cl.runtime.records.predicates import Not
+from cl.runtime.records.predicates import NotIn
+from cl.runtime.records.predicates import Or
+from cl.runtime.records.predicates import Range
+from stubs.cl.runtime import StubDataclassPrimitiveFields
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass import StubDataclass
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_primitive_fields_key import StubDataclassPrimitiveFieldsKey
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_primitive_fields_query import (
+    StubDataclassPrimitiveFieldsQuery,
+)
 
 
 def test_smoke():
@@ -38,5 +54,75 @@ def test_smoke():
         assert loaded_records[2] is None
 
 
+def test_predicates(local_cache_fixture):
+    """Test evaluation of query predicates."""
+    records = [
+        StubDataclassPrimitiveFields(key_str_field=f"abc{i}", obj_int_field=i, obj_str_field=None if i == 2 else "x")
+        for i in range(6)
+    ]
+    active(DataSource).insert_many([x.build() for x in records], commit=True)
+
+    def load(**kwargs) -> list[int]:
+        query = StubDataclassPrimitiveFieldsQuery(**kwargs).build()
+        return [x.obj_int_field for x in active(DataSource).load_by_query(query)]
+
+    assert load(obj_int_field=3) == [3]
+    assert load(obj_int_field=Gt(3)) == [4, 5]
+    assert load(obj_int_field=Gte(3)) == [3, 4, 5]
+    assert load(obj_int_field=Lt(2)) == [0, 1]
+    assert load(obj_int_field=Range(gt=1, lte=3)) == [2, 3]
+    assert load(obj_int_field=In([1, 4, 7])) == [1, 4]
+    assert load(obj_int_field=NotIn([1, 4])) == [0, 2, 3, 5]
+    assert load(obj_int_field=And(Gt(0), Lt(5), Not(3))) == [1, 2, 4]
+    assert load(obj_int_field=Or(0, Gte(5))) == [0, 5]
+    assert load(obj_str_field=Exists(False)) == [2]
+    assert load(obj_str_field=Exists(True), obj_int_field=Lt(3)) == [0, 1]
+    assert load(key_str_field="abc1", obj_int_field=1) == [1]
+    assert load(key_str_field="abc1", obj_int_field=2) == []
+
+
+def test_indexes(local_cache_fixture):
+    """Test that indexes are added on the first query and updated on write."""
+    records = [StubDataclassPrimitiveFields(key_str_field=f"abc{i}", obj_int_field=i).build() for i in range(5)]
+    active(DataSource).insert_many(records, commit=True)
+    key_type = StubDataclassPrimitiveFieldsKey
+    table = next(v for k, v in _TABLES_DICT[local_cache_fixture.db_id].items() if k[2] is key_type)
+    assert table.hash_indexes == {}
+
+    # Hash index for the fields of equality conditions in the order of declaration
+    query = StubDataclassPrimitiveFieldsQuery(obj_int_field=2).build()
+    assert active(DataSource).count_by_query(query) == 1
+    assert ("obj_int_field",) in table.hash_indexes
+
+    # Sorted index for range conditions
+    range_query = StubDataclassPrimitiveFieldsQuery(obj_int_field=Gte(3)).build()
+    assert active(DataSource).count_by_query(range_query) == 2
+    assert "obj_int_field" in table.sorted_indexes
+
+    # Indexes reflect replaced and deleted records
+    active(DataSource).replace_many(
+        [StubDataclassPrimitiveFields(key_str_field="abc0", obj_int_field=2).build()], commit=True
+    )
+    active(DataSource).delete_many([records[4].get_key()], commit=True)
+    assert active(DataSource).count_by_query(query) == 2
+    assert active(DataSource).count_by_query(range_query) == 1
+    assert [x.key_str_field for x in active(DataSource).load_by_query(query)] == ["abc0", "abc2"]
+
+
+def test_invalid_enum_values(local_cache_fixture):
+    """Test that invalid sort order and save policy are reported."""
+    record = StubDataclassPrimitiveFields().build()
+    active(DataSource).insert_many([record], commit=True)
+    query = StubDataclassPrimitiveFieldsQuery(obj_int_field=Gte(0)).build()
+    dataset = active(DataSource).dataset.dataset_id
+    tenant = active(DataSource).tenant.tenant_id
+    with pytest.raises(RuntimeError, match="enum value"):
+        local_cache_fixture.load_by_query(query, dataset=dataset, tenant=tenant, sort_order="invalid")
+    with pytest.raises(RuntimeError, match="enum value"):
+        local_cache_fixture.save_many(
+            StubDataclassPrimitiveFieldsKey, [record], dataset=dataset, tenant=tenant, save_policy="invalid"
+        )
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -13,12 +13,20 @@
 # limitations under the License.
 
 import pytest
+import time
+from unittest import mock
+from mongomock.collection import Collection as MongomockCollection
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+from cl.runtime.db.data_source import DataSource
 from cl.runtime.db.mongo.basic_mongo_db import BasicMongoDb
+from cl.runtime.db.mongo.basic_mongo_mock_db import BasicMongoMockDb
 from cl.runtime.qa.regression_guard import RegressionGuard
 from cl.runtime.records.typename import typename
 from cl.runtime.stat.experiment_key_query import ExperimentKeyQuery
 from stubs.cl.runtime import StubDataclassPrimitiveFields
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_nested_fields_query import StubDataclassNestedFieldsQuery
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_primitive_fields_key import StubDataclassPrimitiveFieldsKey
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_primitive_fields_query import (
     StubDataclassPrimitiveFieldsQuery,
 )
@@ -85,5 +93,86 @@ def test_populate_index_dict():
     RegressionGuard().verify_all()
 
 
+def test_save_many(basic_mongo_mock_db_fixture):
+    """Test batched bulk writes in save_many and reporting of the failed keys."""
+    records = [StubDataclassPrimitiveFields(key_str_field=f"abc{i}").build() for i in range(7)]
+    db = BasicMongoMockDb(db_id=basic_mongo_mock_db_fixture.db_id, save_batch_size=3).build()
+    with DataSource(db=db).build() as data_source:
+
+        # Insert and replace in three batches
+        data_source.insert_many(records, commit=True)
+        assert [x.key_str_field for x in data_source.load_all(StubDataclassPrimitiveFieldsKey)] == [
+            f"abc{i}" for i in range(7)
+        ]
+        replaced_records = [
+            StubDataclassPrimitiveFields(key_str_field=f"abc{i}", obj_str_field="xyz").build() for i in range(7)
+        ]
+        data_source.replace_many(replaced_records, commit=True)
+        assert all(x.obj_str_field == "xyz" for x in data_source.load_all(StubDataclassPrimitiveFieldsKey))
+
+        # Ordered insert stops at the first failed record
+        ordered_records = [StubDataclassPrimitiveFields(key_str_field=f"def{i}").build() for i in range(5)]
+        ordered_records[3] = records[3]
+        with pytest.raises(RuntimeError, match=r"Records 3 to 4 failed for keys: abc3;.*\n.*\nThe records following"):
+            data_source.insert_many(ordered_records, commit=True)
+        assert len(data_source.load_all(StubDataclassPrimitiveFieldsKey)) == 10
+
+    db = BasicMongoMockDb(db_id=basic_mongo_mock_db_fixture.db_id, save_batch_size=3, save_ordered=False).build()
+    with DataSource(db=db).build() as data_source:
+
+        # Unordered insert reports the failed records in each batch and saves the remaining records
+        unordered_records = [StubDataclassPrimitiveFields(key_str_field=f"xyz{i}").build() for i in range(6)]
+        unordered_records[1] = records[1]
+        unordered_records[5] = records[5]
+        with pytest.raises(RuntimeError) as exc_info:
+            data_source.insert_many(unordered_records, commit=True)
+        assert "Records 0 to 2 failed for keys: abc1;" in str(exc_info.value)
+        assert "Records 3 to 5 failed for keys: abc5;" in str(exc_info.value)
+        assert len(data_source.load_all(StubDataclassPrimitiveFieldsKey)) == 14
+
+
+def test_bulk_write_error(basic_mongo_mock_db_fixture):
+    """Test that write errors from collection.bulk_write in base _bulk_write are mapped to the failed keys."""
+    records = [StubDataclassPrimitiveFields(key_str_field=f"abc{i}").build() for i in range(5)]
+    db = BasicMongoMockDb(db_id=basic_mongo_mock_db_fixture.db_id, save_batch_size=3, save_ordered=False).build()
+    requests_list = []
+
+    def _bulk_write_with_error(self, requests, ordered):
+        """Record the requests and report a write error for the second record in each batch."""
+        requests_list.append((requests, ordered))
+        raise BulkWriteError({"writeErrors": [{"index": 1, "code": 11000, "errmsg": "Synthetic error"}]})
+
+    # Use base _bulk_write for replace which the mock overrides and collection.bulk_write that raises
+    with (
+        mock.patch.object(BasicMongoMockDb, "_bulk_write", BasicMongoDb._bulk_write),
+        mock.patch.object(MongomockCollection, "bulk_write", _bulk_write_with_error),
+        DataSource(db=db).build() as data_source,
+    ):
+        with pytest.raises(RuntimeError) as exc_info:
+            data_source.replace_many(records, commit=True)
+
+    assert "Records 0 to 2 failed for keys: abc1;" in str(exc_info.value)
+    assert "Records 3 to 4 failed for keys: abc4;" in str(exc_info.value)
+    assert "Reason: Synthetic error" in str(exc_info.value)
+    assert "The remaining records were saved." in str(exc_info.value)
+    assert [len(requests) for requests, _ in requests_list] == [3, 2]
+    assert all(isinstance(request, ReplaceOne) for requests, _ in requests_list for request in requests)
+    assert all(not ordered for _, ordered in requests_list)
+
+
+@pytest.mark.skip("Performance test.")
+def test_save_many_performance(basic_mongo_db_fixture):
+    """Compare save_many throughput for bulk write batches of different size."""
+    for n in (10**4, 10**5, 10**6):
+        records = [StubDataclassPrimitiveFields(key_str_field=f"key{i}").build() for i in range(n)]
+        for save_batch_size in (1, 100, 1000, 10000):
+            db = BasicMongoDb(db_id=basic_mongo_db_fixture.db_id, save_batch_size=save_batch_size).build()
+            with DataSource(db=db).build() as data_source:
+                start_time = time.perf_counter()
+                data_source.replace_many(records, commit=True)
+                duration = time.perf_counter() - start_time
+            print(f"{n=} {save_batch_size=} Records/sec: {n / duration:.0f}")
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
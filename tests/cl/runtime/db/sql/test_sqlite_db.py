@@ -0,0 +1,190 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import contextvars
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from cl.runtime.contexts.context_manager import active
+from cl.runtime.db.data_source import DataSource
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.records.predicates import Gte
+from cl.runtime.records.predicates import In
+from cl.runtime.records.typename import typename
+from cl.runtime.schema.type_info import TypeInfo
+from cl.runtime.settings.db_settings import DbSettings
+from stubs.cl.runtime import StubDataclassPrimitiveFields
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_nested_fields_query import StubDataclassNestedFieldsQuery
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_primitive_fields_query import (
+    StubDataclassPrimitiveFieldsQuery,
+)
+
+
+def _get_index_names(db: SqliteDb, table_name: str) -> list[str]:
+    """Get sorted names of the indexes added to the table, excluding the automatic primary key index."""
+    sql = "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL ORDER BY name"
+    with db._read() as conn:
+        return [row[0] for row in conn.execute(sql, (table_name,)).fetchall()]
+
+
+def test_get_index_columns():
+    """Test SqliteDb._get_index_columns method."""
+    # All fields in the order of declaration, descending flag is taken from the field metadata
+    index_columns = SqliteDb._get_index_columns(type_=StubDataclassPrimitiveFieldsQuery)
+    assert index_columns[:3] == (("key_str_field", False), ("key_float_field", True), ("key_bool_field", False))
+    assert len(index_columns) == len(StubDataclassPrimitiveFieldsQuery.get_field_names())
+
+    # Embedded data is stored as JSON in a single column and is not indexed
+    assert SqliteDb._get_index_columns(type_=StubDataclassNestedFieldsQuery) == (
+        ("id", False),
+        ("key_field", False),
+        ("record_as_key_field", False),
+    )
+
+
+def test_query_index(sqlite_db_fixture):
+    """Test that one index is added on the first query for all fields of the query type."""
+    records = [StubDataclassPrimitiveFields(key_str_field=f"abc{i}", key_float_field=i).build() for i in range(5)]
+    active(DataSource).insert_many(records, commit=True)
+    table_name = typename(StubDataclassPrimitiveFields)
+    assert _get_index_names(sqlite_db_fixture, table_name) == []
+
+    # Index includes all fields of the query type in the order of declaration
+    query = StubDataclassPrimitiveFieldsQuery(key_float_field=In([1.0, 2.0]), key_str_field="abc1").build()
+    loaded_records = active(DataSource).load_by_query(query)
+    assert [x.key_str_field for x in loaded_records] == ["abc1"]
+    index_names = _get_index_names(sqlite_db_fixture, table_name)
+    assert len(index_names) == 1
+    index_name = index_names[0]
+    assert index_name.startswith(f"idx_{table_name}_key_str_field_key_float_field_desc_key_bool_field_")
+
+    # Check that the index is used by the query planner
+    with sqlite_db_fixture._read() as conn:
+        plan = conn.execute(
+            f'EXPLAIN QUERY PLAN SELECT * FROM "{table_name}" WHERE "_tenant" = ? AND "key_str_field" = ?',
+            ("DEFAULT", "abc1"),
+        ).fetchall()
+    assert any(index_name in row[-1] for row in plan)
+
+    # Queries of the same type that set other fields reuse the existing index
+    assert active(DataSource).count_by_query(query) == 1
+    assert active(DataSource).count_by_query(StubDataclassPrimitiveFieldsQuery(key_str_field="abc2").build()) == 1
+    assert active(DataSource).count_by_query(StubDataclassPrimitiveFieldsQuery(key_float_field=Gte(3.0)).build()) == 2
+    assert _get_index_names(sqlite_db_fixture, table_name) == [index_name]
+
+
+def test_index_query_types(sqlite_db_fixture):
+    """Test indexes for the query types specified in index_query_types created with the table."""
+    db = SqliteDb(db_id=sqlite_db_fixture.db_id, index_query_types=(typename(StubDataclassPrimitiveFieldsQuery),))
+    with DataSource(db=db.build()).build() as data_source:
+        data_source.insert_many([StubDataclassPrimitiveFields().build()], commit=True)
+    table_name = typename(StubDataclassPrimitiveFields)
+    index_names = _get_index_names(sqlite_db_fixture, table_name)
+    assert len(index_names) == 1
+    assert index_names[0].startswith(f"idx_{table_name}_key_str_field_key_float_field_desc_key_bool_field_")
+
+    # Query types are resolved once per database rather than on every save, including by a new instance
+    db = SqliteDb(db_id=sqlite_db_fixture.db_id, index_query_types=(typename(StubDataclassPrimitiveFieldsQuery),))
+    with mock.patch.object(TypeInfo, "from_type_name", side_effect=RuntimeError("Query type is resolved again.")):
+        with DataSource(db=db.build()).build() as data_source:
+            data_source.insert_many([StubDataclassPrimitiveFields(key_str_field="def").build()], commit=True)
+
+
+@pytest.mark.skip("Performance test.")
+def test_load_all_performance(sqlite_db_fixture):
+    """Test performance of load_all, compare with db_trusted_build set to False in settings."""
+    n = 100000
+    records = [StubDataclassPrimitiveFields(key_str_field=f"key{i}").build() for i in range(n)]
+    active(DataSource).insert_many(records, commit=True)
+    key_type = StubDataclassPrimitiveFields.get_key_type()
+
+    print(f">>> Test stub type: {StubDataclassPrimitiveFields.__name__}, {n=}.")
+    start_time = time.time()
+    loaded_records = active(DataSource).load_all(key_type)
+    end_time = time.time()
+    print(f"Load all: {end_time - start_time}s.")
+    assert len(loaded_records) == n
+
+
+def test_concurrent_access(sqlite_db_fixture):
+    """Test reads and writes from multiple threads."""
+    query = StubDataclassPrimitiveFieldsQuery(key_float_field=Gte(-1.0)).build()
+
+    def _save_and_count(thread_index: int) -> int:
+        records = [
+            StubDataclassPrimitiveFields(key_str_field=f"thread{thread_index}_{i}", key_float_field=i).build()
+            for i in range(10)
+        ]
+        # DataSource is not shared between threads, each thread uses its own DataSource for the same database
+        with DataSource(db=sqlite_db_fixture).build() as data_source:
+            data_source.insert_many(records, commit=True)
+            return data_source.count_by_query(query)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _save_and_count, i) for i in range(8)]
+        counts = [future.result() for future in futures]
+
+    # Each thread sees at least its own committed records
+    assert all(10 <= x <= 80 for x in counts)
+    assert active(DataSource).count_by_query(query) == 80
+
+
+def test_full_pool(sqlite_db_fixture):
+    """Test that reads above the pool size limit do not see the uncommitted writes of the writer connection."""
+    records = [StubDataclassPrimitiveFields(key_str_field=f"abc{i}").build() for i in range(3)]
+    active(DataSource).insert_many(records, commit=True)
+    query = StubDataclassPrimitiveFieldsQuery(key_float_field=Gte(-1.0)).build()
+    table_name = typename(StubDataclassPrimitiveFields)
+    # Run the query before the write to add the query index
+    assert active(DataSource).count_by_query(query) == 3
+
+    # No reader connections are available, each read opens a short-lived read-only connection
+    db_settings = dataclasses.replace(DbSettings.instance(), db_sqlite_pool_size=0)
+    with mock.patch.object(DbSettings, "instance", return_value=db_settings):
+        with sqlite_db_fixture._write() as conn:
+            conn.execute(f'DELETE FROM "{table_name}"')
+            # Read from another thread that does not have a reader connection while the delete is not committed
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(contextvars.copy_context().run, active(DataSource).count_by_query, query)
+                assert future.result() == 3
+        assert active(DataSource).count_by_query(query) == 0
+
+
+@pytest.mark.skip("Performance test.")
+def test_concurrent_read_performance(sqlite_db_fixture):
+    """Test throughput of queries from multiple threads, each query scans the entire table in SQLite."""
+    n = 100000
+    records = [StubDataclassPrimitiveFields(key_str_field=f"key{i}", key_float_field=i).build() for i in range(n)]
+    active(DataSource).insert_many(records, commit=True)
+    query = StubDataclassPrimitiveFieldsQuery(key_float_field=Gte(-1.0)).build()
+    assert active(DataSource).count_by_query(query) == n
+
+    query_count = 64
+    print(f">>> Test stub type: {StubDataclassPrimitiveFields.__name__}, {n=}, {query_count=}.")
+    for thread_count in (1, 2, 4, 8):
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, active(DataSource).count_by_query, query)
+                for _ in range(query_count)
+            ]
+            assert all(future.result() == n for future in futures)
+        end_time = time.time()
+        print(f"Threads: {thread_count}, queries per second: {query_count / (end_time - start_time):.1f}.")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
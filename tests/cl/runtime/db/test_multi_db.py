@@ -14,6 +14,7 @@
 
 import pytest
 import time
+import numpy as np
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
 from cl.runtime.db.sort_order import SortOrder
@@ -246,6 +247,23 @@ def test_derived_key(multi_db_fixture):
     assert loaded_sample == sample
 
 
+def test_ndarray_dtype(multi_db_fixture):
+    """Test that ndarray dtype and shape are preserved on roundtrip."""
+    sample = StubDataclassNumpyFields(
+        id="dtype",
+        single_array=np.arange(6, dtype=np.float32).reshape(2, 3) / 3,
+        int_array=np.array([[1, -2], [3, 2**53 + 1]], dtype=np.int64),
+    ).build()
+    active(DataSource).insert_one(sample, commit=True)
+    loaded_sample = active(DataSource).load_one(sample.get_key(), cast_to=StubDataclassNumpyFields)
+    for field_name in ("float_array", "float_cube", "single_array", "int_array"):
+        expected = getattr(sample, field_name)
+        loaded = getattr(loaded_sample, field_name)
+        assert loaded.dtype == expected.dtype
+        assert loaded.shape == expected.shape
+        assert np.array_equal(loaded, expected)
+
+
 @pytest.mark.skip(
     "Temporarily skip a test for repeated record save."
 )  # TODO(Sasha): Restore if and when tracking repeats is implemented
@@ -278,6 +296,33 @@ def test_load_by_query(multi_db_fixture):
     assert to_key_str_field(active(DataSource).load_by_query(in_query)) == ["def", "xyz"]
 
 
+def test_project_to(multi_db_fixture):
+    """Test loading only the fields of project_to type."""
+    records = [
+        StubDataclassDerived(id="abc1", derived_str_field="xyz1"),
+        StubDataclassDerived(id="abc2", derived_str_field="xyz2"),
+        StubDataclassDerived(id="abc3", derived_str_field="xyz3"),
+    ]
+    records = [x.build() for x in records]
+    keys = [x.get_key() for x in records]
+    active(DataSource).insert_many(records, commit=True)
+
+    # Project to the key type
+    assert active(DataSource).load_all(StubDataclassKey, project_to=StubDataclassKey) == tuple(keys)
+    assert active(DataSource).load_many(keys[1:], project_to=StubDataclassKey) == tuple(keys[1:])
+    query = StubDataclassDerivedQuery(derived_str_field="xyz2").build()
+    assert active(DataSource).load_by_query(query, project_to=StubDataclassKey) == (keys[1],)
+
+    # Project to the base record type
+    projected = active(DataSource).load_all(StubDataclassKey, project_to=StubDataclass)
+    assert all(type(x) is StubDataclass for x in projected)
+    assert [x.id for x in projected] == ["abc1", "abc2", "abc3"]
+
+    # Error if a field of project_to type is not stored
+    with pytest.raises(RuntimeError):
+        active(DataSource).load_all(StubDataclassKey, project_to=StubDataclassPrimitiveFields)
+
+
 def test_load_all_sort_order(multi_db_fixture):
     """Test sort_order for load_all sorts by key field."""
     records = [
@@ -343,6 +388,33 @@ def test_count_by_query(multi_db_fixture):
     assert active(DataSource).count_by_query(in_query) == 2
 
 
+def test_count_by_group(multi_db_fixture):
+    """Test count_by_group for string and bool fields."""
+    records = [
+        StubDataclassPrimitiveFields(key_str_field="abc", obj_str_field=None),
+        StubDataclassPrimitiveFields(key_str_field="def", obj_bool_field=False),
+        StubDataclassPrimitiveFields(key_str_field="ghi"),
+        StubDataclassPrimitiveFields(key_str_field="xyz"),
+    ]
+    records = [x.build() for x in records]
+    active(DataSource).insert_many(records, commit=True)
+
+    all_query = StubDataclassPrimitiveFieldsQuery().build()
+    in_query = StubDataclassPrimitiveFieldsQuery(key_str_field=In(["abc", "def", "ghi"])).build()
+
+    # Missing values are grouped as None
+    group_counts = active(DataSource).count_by_group(all_query, group_by=["obj_str_field"])
+    assert sorted(group_counts, key=str) == [(("abc",), 3), ((None,), 1)]
+
+    # Multiple fields with query conditions
+    group_counts = active(DataSource).count_by_group(in_query, group_by=["obj_str_field", "obj_bool_field"])
+    assert sorted(group_counts, key=str) == [(("abc", False), 1), (("abc", True), 1), ((None, True), 1)]
+
+    # Error for unknown or non-groupable fields
+    with pytest.raises(RuntimeError, match="not found"):
+        active(DataSource).count_by_group(all_query, group_by=["unknown_field"])
+
+
 def test_skip_and_limit(multi_db_fixture):
     """Test Dbs work correctly with 'skip' and 'limit' params."""
 
@@ -366,6 +438,34 @@ def test_skip_and_limit(multi_db_fixture):
     assert len(load_by_type_records) == 1
 
 
+def test_iter(multi_db_fixture):
+    """Test iter_all and iter_by_query return the same records as the tuple methods for any batch size."""
+    records = [
+        StubDataclassDerived(id=f"A{i}", derived_str_field="Even" if i % 2 == 0 else "Odd").build() for i in range(7)
+    ]
+    active(DataSource).insert_many(records, commit=True)
+
+    query = StubDataclassDerivedQuery(derived_str_field="Even").build()
+    for batch_size in (1, 3, 100):
+        for sort_order in (SortOrder.ASC, SortOrder.DESC):
+            iterator = active(DataSource).iter_all(
+                StubDataclassKey, restrict_to=StubDataclassDerived, sort_order=sort_order, batch_size=batch_size
+            )
+            assert not isinstance(iterator, tuple)
+            assert tuple(iterator) == active(DataSource).load_all(
+                StubDataclassKey, restrict_to=StubDataclassDerived, sort_order=sort_order
+            )
+            assert tuple(
+                active(DataSource).iter_by_query(query, sort_order=sort_order, skip=1, limit=2, batch_size=batch_size)
+            ) == active(DataSource).load_by_query(query, sort_order=sort_order, skip=1, limit=2)
+
+    # Records are fetched lazily
+    iterator = active(DataSource).iter_by_query(query, batch_size=2)
+    assert next(iterator) == records[0]
+    assert next(iterator) == records[2]
+    iterator.close()
+
+
 # TODO (Roman): Support tenant in SqliteDb
 def test_parent_data_source(multi_db_fixture):
     """Test DataSource works correctly with parent."""
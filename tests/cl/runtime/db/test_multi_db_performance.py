@@ -16,7 +16,11 @@ import pytest
 import time
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
+from cl.runtime.records.predicates import Gte
 from stubs.cl.runtime import StubDataclassPrimitiveFields
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_primitive_fields_query import (
+    StubDataclassPrimitiveFieldsQuery,
+)
 
 
 @pytest.mark.skip("Performance test.")
@@ -51,5 +55,59 @@ def test_performance(multi_db_fixture):
     print(f"Load many one by one: {end_time - start_time}s.")
 
 
+@pytest.mark.skip("Performance test.")
+def test_count_by_group_performance(multi_db_fixture):
+    """Compare grouped count with loading all records and counting in memory."""
+    n = 10000
+    samples = [StubDataclassPrimitiveFields(key_str_field=f"key{i}", obj_int_field=i % 10).build() for i in range(n)]
+    active(DataSource).replace_many(samples, commit=True)
+    query = StubDataclassPrimitiveFieldsQuery().build()
+
+    print(f">>> Test stub type: {StubDataclassPrimitiveFields.__name__}, {n=}.")
+    start_time = time.time()
+    records = active(DataSource).load_by_query(query)
+    counts = [sum(1 for x in records if x.obj_int_field == i) for i in range(10)]
+    end_time = time.time()
+    print(f"Load and count: {end_time - start_time}s.")
+
+    start_time = time.time()
+    group_counts = active(DataSource).count_by_group(query, group_by=["obj_int_field"])
+    end_time = time.time()
+    print(f"Count by group: {end_time - start_time}s.")
+    assert sorted((x[0], n) for x, n in group_counts) == list(enumerate(counts))
+
+
+@pytest.mark.skip("Performance test.")
+def test_query_performance(multi_db_fixture):
+    """Test performance of queries with equality and range conditions."""
+    n = 10000
+    m = 100
+    samples = [StubDataclassPrimitiveFields(key_str_field=f"key{i}", obj_int_field=i).build() for i in range(n)]
+    active(DataSource).replace_many(samples, commit=True)
+
+    print(f">>> Test stub type: {StubDataclassPrimitiveFields.__name__}, {n=}, {m=}.")
+    # Build queries before measuring so that only the lookups are timed
+    eq_queries = [StubDataclassPrimitiveFieldsQuery(obj_int_field=i * 7).build() for i in range(m)]
+    range_query = StubDataclassPrimitiveFieldsQuery(obj_int_field=Gte(n - 10)).build()
+
+    start_time = time.time()
+    for query in eq_queries:
+        assert len(active(DataSource).load_by_query(query)) == 1
+    end_time = time.time()
+    print(f"Load by equality query: {end_time - start_time}s.")
+
+    start_time = time.time()
+    for _ in range(m):
+        assert len(active(DataSource).load_by_query(range_query)) == 10
+    end_time = time.time()
+    print(f"Load by range query: {end_time - start_time}s.")
+
+    start_time = time.time()
+    for _ in range(m):
+        assert active(DataSource).count_by_query(range_query) == 10
+    end_time = time.time()
+    print(f"Count by range query: {end_time - start_time}s.")
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,84 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import asyncio
+import threading
+import time
+from cl.runtime.contexts.context_manager import active
+from cl.runtime.db.data_source import DataSource
+from cl.runtime.events.event import Event
+from cl.runtime.events.event_broker import EventBroker
+from cl.runtime.events.event_kind import EventKind
+from cl.runtime.settings.sse_settings import SseSettings
+
+
+async def _receive_events(event_broker: EventBroker, count: int, publish) -> list[tuple[str, float]]:
+    """Subscribe, invoke publish() and return (timestamp, receive time) for the specified number of events."""
+    result = []
+    subscription = event_broker.subscribe("events")
+    next_event = asyncio.ensure_future(anext(subscription))
+    await asyncio.sleep(0.1)
+    publish()
+    while True:
+        event_data = await next_event
+        result.append((event_data["Timestamp"], time.perf_counter()))
+        if len(result) == count:
+            break
+        next_event = asyncio.ensure_future(anext(subscription))
+    await subscription.aclose()
+    return result
+
+
+def test_push(default_db_fixture, event_broker_fixture):
+    """Test that events published in the same process are delivered without waiting for the pull interval."""
+    event_broker = active(EventBroker)
+    events = [Event(event_kind=EventKind.LOG).build() for _ in range(3)]
+    publish_time = None
+
+    def _publish_from_thread():
+        nonlocal publish_time
+        publish_time = time.perf_counter()
+        thread = threading.Thread(target=lambda: [event_broker.sync_publish("events", x) for x in events])
+        thread.start()
+
+    received = asyncio.run(asyncio.wait_for(_receive_events(event_broker, 3, _publish_from_thread), timeout=10.0))
+    assert [x[0] for x in received] == [x.timestamp for x in events]
+    assert received[-1][1] - publish_time < SseSettings.instance().sse_pull_interval_sec
+
+
+def test_pull(default_db_fixture, event_broker_fixture):
+    """Test that events saved to the DB by another process are delivered once, after the last seen timestamp."""
+    event_broker = active(EventBroker)
+    old_event = Event(event_kind=EventKind.LOG).build()
+    active(DataSource).replace_one(old_event, commit=True)
+    published_event = None
+    saved_event = None
+
+    def _publish():
+        # Publish one event in this process and save another event to the DB bypassing the broker
+        nonlocal published_event, saved_event
+        published_event = Event(event_kind=EventKind.TASK_STARTED).build()
+        event_broker.sync_publish("events", published_event)
+        saved_event = Event(event_kind=EventKind.TASK_FINISHED).build()
+        active(DataSource).replace_one(saved_event, commit=True)
+
+    received = asyncio.run(asyncio.wait_for(_receive_events(event_broker, 2, _publish), timeout=10.0))
+
+    # The old event is not delivered, the published event is delivered once
+    assert [x[0] for x in received] == [published_event.timestamp, saved_event.timestamp]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
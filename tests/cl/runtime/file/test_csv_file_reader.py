@@ -67,5 +67,22 @@ def test_csv_file_reader(default_db_fixture):
         assert record == expected_record
 
 
+def test_batch_size(default_db_fixture):
+    """Test reading rows in batches smaller than the file."""
+    file_path = os.path.join(__file__.removesuffix(".py"), "StubDataclassComposite.csv")
+    assert CsvFileReader(file_path=file_path, batch_size=2).csv_to_db() == 3
+
+    expected_records = [
+        StubDataclassComposite(
+            primitive=f"nested_primitive_{i}",
+            embedded_1=StubDataclassKey(id=f"embedded_key_id_{i}a"),
+            embedded_2=StubDataclassKey(id=f"embedded_key_id_{i}b"),
+        ).build()
+        for i in range(1, 4)
+    ]
+    records = active(DataSource).load_many([x.get_key() for x in expected_records])
+    assert list(records) == expected_records
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,102 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import logging
+import time
+from typing import Callable
+from cl.runtime.contexts.context_manager import activate
+from cl.runtime.contexts.context_manager import active
+from cl.runtime.db.data_source import DataSource
+from cl.runtime.db.tenant import Tenant
+from cl.runtime.log.db_log_handler import DbLogHandler
+from cl.runtime.log.log_message import LogMessage
+
+
+def _create_record(message: str) -> logging.LogRecord:
+    """Create log record with the specified message."""
+    return logging.LogRecord("cl.runtime.test", logging.INFO, __file__, 0, message, None, None)
+
+
+def _wait_for(condition: Callable[[], bool], timeout_sec: float = 60.0) -> None:
+    """Wait until the condition is true, error on timeout."""
+    deadline = time.time() + timeout_sec
+    while not condition():
+        if time.time() > deadline:
+            raise RuntimeError(f"Condition is not true after {timeout_sec} sec.")
+        time.sleep(0.05)
+
+
+def test_unbatched(sqlite_db_fixture):
+    """Test saving each message on the calling thread."""
+    handler = DbLogHandler(batch_size=1)
+    try:
+        handler.emit(_create_record("abc"))
+        assert handler.get_backlog_count() == 0
+        assert [x.message for x in active(DataSource).load_by_type(LogMessage)] == ["abc"]
+    finally:
+        handler.close()
+
+
+def test_batched(sqlite_db_fixture):
+    """Test saving messages in batches when batch size, time or flush threshold is reached."""
+    handler = DbLogHandler(batch_size=3, flush_interval_sec=60.0)
+    try:
+        # Messages are queued until batch size is reached
+        handler.emit(_create_record("abc0"))
+        handler.emit(_create_record("abc1"))
+        assert handler.get_backlog_count() == 2
+        assert active(DataSource).load_by_type(LogMessage) == ()
+        handler.emit(_create_record("abc2"))
+        _wait_for(lambda: len(active(DataSource).load_by_type(LogMessage)) == 3)
+        assert handler.get_backlog_count() == 0
+        assert [x.message for x in active(DataSource).load_by_type(LogMessage)] == ["abc0", "abc1", "abc2"]
+
+        # Flush saves the remaining messages to the tenant captured at emit time
+        other_tenant = Tenant(tenant_id="other").build()
+        other_data_source = DataSource(db=sqlite_db_fixture, tenant=other_tenant).build()
+        with activate(other_data_source):
+            handler.emit(_create_record("xyz"))
+        DbLogHandler.flush_all()
+        assert handler.get_backlog_count() == 0
+        assert len(active(DataSource).load_by_type(LogMessage)) == 3
+        assert [x.message for x in other_data_source.load_by_type(LogMessage)] == ["xyz"]
+    finally:
+        handler.close()
+
+
+def test_backlog(sqlite_db_fixture):
+    """Test that messages are dropped when max backlog is exceeded, and saved on close by the time threshold."""
+    handler = DbLogHandler(batch_size=2, flush_interval_sec=60.0, max_backlog=2)
+    handler._flush_lock.acquire()  # Prevent the flush thread from saving to test backlog limit
+    try:
+        [handler.emit(_create_record(f"abc{i}")) for i in range(4)]
+        assert handler.get_dropped_count() == 2
+    finally:
+        handler._flush_lock.release()
+    handler.close()
+    assert handler.get_backlog_count() == 0
+    assert len(active(DataSource).load_by_type(LogMessage)) == 4 - handler.get_dropped_count()
+
+    # Time threshold
+    handler = DbLogHandler(batch_size=100, flush_interval_sec=0.1)
+    try:
+        handler.emit(_create_record("xyz"))
+        _wait_for(lambda: len(active(DataSource).load_by_type(LogMessage)) == 3)
+    finally:
+        handler.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
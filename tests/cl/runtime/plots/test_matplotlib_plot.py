@@ -0,0 +1,114 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+import gc
+import sys
+import time
+import tracemalloc
+from matplotlib import pyplot as plt
+from cl.runtime.plots.matplotlib_plot import _PLOT_SERIALIZER
+from cl.runtime.plots.matplotlib_plot import MatplotlibPlot
+from cl.runtime.plots.matplotlib_plot import _render_serialized
+from stubs.cl.runtime.plots.stub_line_plots import StubLinePlots
+
+
+def test_render(default_db_fixture):
+    """Test render method and image cache."""
+    MatplotlibPlot.clear_image_cache()
+    plot = StubLinePlots.get_one_line_plot(plot_id="test_matplotlib_plot.test_render")
+
+    # Figure is closed after rendering
+    png_bytes = plot.render()
+    assert png_bytes.startswith(b"\x89PNG")
+    assert plt.get_fignums() == []
+
+    # Cached image is returned for the same plot and for another plot_id with the same fields
+    assert plot.render() is png_bytes
+    assert StubLinePlots.get_one_line_plot(plot_id="other").render() is png_bytes
+    assert plot.get_view().png_bytes is png_bytes
+
+    # Other plots, formats and parameters are rendered separately
+    assert StubLinePlots.get_two_line_plot(plot_id="test_matplotlib_plot.test_render").render() != png_bytes
+    assert plot.render(tight=True) != png_bytes
+    assert b"<svg" in plot.render("svg")
+    assert plt.get_fignums() == []
+
+    # Same image is rendered from the serialized plot as in a worker process
+    data = _PLOT_SERIALIZER.serialize(plot)
+    assert _render_serialized(data, "png", dark_theme=False, transparent=False, tight=False) == png_bytes
+
+
+def _render_without_cache(plot: MatplotlibPlot, count: int) -> None:
+    """Render the plot the specified number of times bypassing the image cache."""
+    for _ in range(count):
+        plot._render_image("png", dark_theme=False, transparent=False, tight=False)  # noqa
+
+
+def test_memory_growth(default_db_fixture):
+    """Test that rendering the same plot repeatedly without cache does not leak figures or memory."""
+    plot = StubLinePlots.get_one_line_plot(plot_id="test_matplotlib_plot.test_memory_growth")
+
+    # Warm up before measuring so that one-time allocations such as fonts are excluded
+    _render_without_cache(plot, 5)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start_memory, _ = tracemalloc.get_traced_memory()
+        _render_without_cache(plot, 10)
+        gc.collect()
+        end_memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert plt.get_fignums() == []
+
+    # Each figure that is not closed retains hundreds of kilobytes of Python objects
+    assert end_memory - start_memory < 1024 * 1024  # In bytes
+
+
+@pytest.mark.skip("Performance test.")
+def test_memory_growth_without_cache(default_db_fixture):
+    """Test that rendering the same plot 1000 times without cache does not leak figures or memory."""
+    plot = StubLinePlots.get_one_line_plot(plot_id="test_matplotlib_plot.test_memory_growth_without_cache")
+
+    # Warm up before measuring so that one-time allocations such as fonts are excluded
+    _render_without_cache(plot, 100)
+    start_time = time.time()
+    start_memory = _get_peak_rss_kb()
+    _render_without_cache(plot, 1000)
+    end_memory = _get_peak_rss_kb()
+    end_time = time.time()
+    assert plt.get_fignums() == []
+    if start_memory is None:
+        print(f"Render 1000 times: {end_time - start_time:.2f}s, peak memory is not available on this platform.")
+    else:
+        print(f"Render 1000 times: {end_time - start_time:.2f}s, peak memory growth: {end_memory - start_memory} KB.")
+
+        # Figures that are not closed retain about 2MB each, the limit allows for native allocator growth
+        assert end_memory - start_memory < 100 * 1024  # In kilobytes
+
+
+def _get_peak_rss_kb() -> int | None:
+    """Peak resident set size of the current process in kilobytes on Linux, None where it is not available."""
+    if not sys.platform.startswith("linux"):
+        # The resource module is not available on Windows and ru_maxrss is in bytes on macOS
+        return None
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
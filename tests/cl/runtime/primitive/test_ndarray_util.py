@@ -0,0 +1,83 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import time
+import numpy as np
+from cl.runtime.primitive.ndarray_util import NdarrayUtil
+from cl.runtime.serializers.data_serializers import DataSerializers
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_numpy_fields import StubDataclassNumpyFields
+
+_DTYPES = (np.float32, np.float64, np.int64)
+"""Data types used in tests."""
+
+
+def test_roundtrip():
+    """Test roundtrip for different dtypes and shapes."""
+    for dtype in _DTYPES:
+        for shape in ((), (0,), (5,), (2, 3), (2, 3, 4)):
+            data = np.arange(int(np.prod(shape)), dtype=dtype).reshape(shape) - 3
+            result = NdarrayUtil.from_bytes(NdarrayUtil.to_bytes(data))
+            assert result.dtype == data.dtype
+            assert result.shape == data.shape
+            assert np.array_equal(result, data)
+
+    # Non-contiguous array
+    data = np.arange(24, dtype=np.float64).reshape(4, 6)[::2, 1::2]
+    result = NdarrayUtil.from_bytes(NdarrayUtil.to_bytes(data))
+    assert np.array_equal(result, data)
+
+    # Non-native byte order is preserved
+    data = np.arange(5, dtype=">f8")
+    result = NdarrayUtil.from_bytes(NdarrayUtil.to_bytes(data))
+    assert result.dtype == data.dtype
+    assert np.array_equal(result, data)
+
+
+def test_errors():
+    """Test errors for unsupported or invalid data."""
+    with pytest.raises(RuntimeError, match="contains Python objects"):
+        NdarrayUtil.to_bytes(np.array([1, "a"], dtype=object))
+    with pytest.raises(RuntimeError, match="not in binary ndarray format"):
+        NdarrayUtil.from_bytes(b"abc")
+    with pytest.raises(RuntimeError, match="does not match the expected size"):
+        NdarrayUtil.from_bytes(NdarrayUtil.to_bytes(np.arange(5, dtype=np.float64))[:-1])
+
+
+@pytest.mark.skip("Performance test.")
+def test_performance():
+    """Compare the list form used for JSON and the binary form used for DB storage for large arrays."""
+    for dtype, field_name in zip(_DTYPES, ("single_array", "float_array", "int_array")):
+        for size in (10**5, 10**6, 10**7):
+            record = StubDataclassNumpyFields(**{field_name: np.arange(size, dtype=dtype)}).build()
+            print(f">>> dtype={np.dtype(dtype).name}, size={size}")
+            for serializer_name, serializer in (
+                ("FOR_JSON", DataSerializers.FOR_JSON),
+                ("FOR_SQLITE", DataSerializers.FOR_SQLITE),
+                ("FOR_MONGO", DataSerializers.FOR_MONGO),
+            ):
+                start_time = time.time()
+                serialized = serializer.serialize(record)
+                middle_time = time.time()
+                result = serializer.deserialize(serialized)
+                end_time = time.time()
+                assert getattr(result, field_name).dtype == dtype
+                print(
+                    f"{serializer_name}: serialize {middle_time - start_time:.4f}s, "
+                    f"deserialize {end_time - middle_time:.4f}s."
+                )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -13,10 +13,14 @@
 # limitations under the License.
 
 import pytest
+import gc
+import time
+import tracemalloc
 from cl.runtime.qa.regression_guard import RegressionGuard
 from stubs.cl.runtime import StubDataclassData
 from stubs.cl.runtime import StubDataclassDerivedData
 from stubs.cl.runtime import StubDataclassDoubleDerivedData
+from stubs.cl.runtime import StubDataclassKey
 
 
 def test_cast():
@@ -68,5 +72,29 @@ def test_clone_as():
     guard.verify()
 
 
+@pytest.mark.skip("Performance test.")
+def test_frozen_performance():
+    """Test memory and time for building and releasing frozen keys."""
+    n = 1000000
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.time()
+    keys = [StubDataclassKey(id=f"key{i}").build() for i in range(n)]
+    build_time = time.time() - start_time
+    build_memory, _ = tracemalloc.get_traced_memory()
+    start_time = time.time()
+    assert all(key.is_frozen() for key in keys)
+    check_time = time.time() - start_time
+    start_time = time.time()
+    del keys
+    gc.collect()
+    release_time = time.time() - start_time
+    release_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f">>> Build {n=} keys: {build_time}s, {build_memory / n:.0f} bytes per key.")
+    print(f">>> Check frozen: {check_time}s.")
+    print(f">>> Release: {release_time}s, {release_memory / n:.0f} bytes per key remain, peak {peak_memory / n:.0f}.")
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import pytest
+import time
 from cl.runtime.records.data_util import DataUtil
 from cl.runtime.schema.type_hint import TypeHint
 from cl.runtime.settings.labels.type_label import TypeLabel
@@ -85,5 +86,23 @@ def test_field_type():
             DataUtil.build_(sample, TypeHint.for_type(type(sample)))
 
 
+@pytest.mark.skip("Performance test.")
+def test_performance():
+    """Test performance of build for flat keys, nested records and records with list fields."""
+    n = 10000
+    sample_factories = [
+        (StubDataclassKey, lambda i: StubDataclassKey(id=f"abc{i}")),
+        (StubDataclassNestedFields, lambda i: StubDataclassNestedFields(id=f"abc{i}")),
+        (StubDataclassListFields, lambda i: StubDataclassListFields(id=f"abc{i}")),
+    ]
+    for sample_type, sample_factory in sample_factories:
+        samples = [sample_factory(i) for i in range(n)]
+        start_time = time.time()
+        for sample in samples:
+            sample.build()
+        end_time = time.time()
+        print(f">>> Build {sample_type.__name__}, {n=}: {end_time - start_time}s.")
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
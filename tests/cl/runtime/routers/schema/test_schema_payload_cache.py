@@ -0,0 +1,76 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+import gzip
+import orjson
+from cl.runtime.qa.qa_client import QaClient
+from cl.runtime.routers.schema.schema_payload_cache import SchemaPayloadCache
+from cl.runtime.routers.schema.type_request import TypeRequest
+from cl.runtime.routers.schema.type_response_util import TypeResponseUtil
+from cl.runtime.schema.type_info import TypeInfo
+
+
+def test_type_payload(monkeypatch):
+    """Test payload for /schema/type route."""
+    SchemaPayloadCache.clear()
+    request = TypeRequest(type_name="UiAppState")
+
+    # The result of TypeDecl.as_dict_with_dependencies is cached and must not be modified by get_type
+    expected = TypeResponseUtil.get_type(request)
+    assert TypeResponseUtil.get_type(request) == expected
+
+    # Payload is reused for the same TypeInfo version
+    payload = SchemaPayloadCache.get_type_payload(request)
+    assert orjson.loads(payload.body) == expected
+    assert gzip.decompress(payload.gzip_body) == payload.body
+    assert SchemaPayloadCache.get_type_payload(request) is payload
+
+    # Payload is rebuilt with the same ETag when TypeInfo version changes
+    monkeypatch.setattr(TypeInfo, "_version", TypeInfo.get_version() + 1)
+    rebuilt_payload = SchemaPayloadCache.get_type_payload(request)
+    assert rebuilt_payload is not payload
+    assert rebuilt_payload.etag == payload.etag
+
+
+def test_api():
+    """Test ETag and compression for /schema/type and /schema/types routes."""
+    SchemaPayloadCache.clear()
+    with QaClient() as test_client:
+        for url, params in [("/schema/type", {"type_name": "UiAppState"}), ("/schema/types", None)]:
+            # First request returns the body and ETag
+            response = test_client.get(url, params=params)
+            assert response.status_code == 200
+            assert response.headers["Content-Encoding"] == "gzip"
+            etag = response.headers["ETag"]
+            result = response.json()
+
+            # Request with matching ETag returns 304 without body
+            response = test_client.get(url, params=params, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.headers["ETag"] == etag
+            assert response.content == b""
+
+            # Request with another ETag and without compression returns the same body
+            response = test_client.get(
+                url, params=params, headers={"If-None-Match": '"other"', "Accept-Encoding": "identity"}
+            )
+            assert response.status_code == 200
+            assert "Content-Encoding" not in response.headers
+            assert response.json() == result
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
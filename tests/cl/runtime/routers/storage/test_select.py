@@ -13,12 +13,15 @@
 # limitations under the License.
 
 import pytest
+import time
 from cl.runtime.contexts.context_manager import active
 from cl.runtime.db.data_source import DataSource
+from cl.runtime.db.sort_order import SortOrder
 from cl.runtime.qa.qa_client import QaClient
 from cl.runtime.qa.regression_guard import RegressionGuard
 from cl.runtime.routers.storage.select_request import SelectRequest
 from cl.runtime.routers.storage.select_response import SelectResponse
+from cl.runtime.serializers.data_serializers import DataSerializers
 from stubs.cl.runtime import StubDataclass
 
 
@@ -34,8 +37,8 @@ def test_method(default_db_fixture):
 
     assert isinstance(result, SelectResponse)
 
-    # Check if there are only "schema" and "data".
-    assert [x.strip("_") for x in result.model_dump().keys()] == ["schema", "data"]
+    # Check if there are only "schema", "data" and "total_count".
+    assert [x.strip("_") for x in result.model_dump().keys()] == ["schema", "data", "total_count"]
 
     # Check result.
     guard = RegressionGuard()
@@ -66,5 +69,62 @@ def test_api(default_db_fixture):
         guard.verify()
 
 
+def test_pagination(default_db_fixture):
+    """Test /storage/select route with limit, skip, query and sort order."""
+
+    # Save test records
+    records = [StubDataclass(id=f"{__name__}.{i}").build() for i in range(5)]
+    active(DataSource).replace_many(records, commit=True)
+    ids = [x.id for x in records]
+
+    # Page of records and total count
+    result = SelectResponse.get_response(SelectRequest(type_="StubDataclass", limit=2, skip=1))
+    assert [x["Id"] for x in result.data] == ids[1:3]
+    assert result.total_count == 5
+
+    # Descending order, table name rather than type name
+    result = SelectResponse.get_response(SelectRequest(type_="StubDataclassKey", limit=2, sort_order=SortOrder.DESC))
+    assert [x["Id"] for x in result.data] == ids[:-3:-1]
+    assert result.total_count == 5
+
+    # Query
+    query_dict = {"_t": "StubDataclassQuery", "Id": ids[3]}
+    result = SelectResponse.get_response(SelectRequest(type_="StubDataclass", query_dict=query_dict, limit=2))
+    assert [x["Id"] for x in result.data] == ids[3:4]
+    assert result.total_count == 1
+
+    # Full records rather than table format
+    result = SelectResponse.get_response(SelectRequest(type_="StubDataclass", limit=1, table_format=False))
+    assert result.data == [DataSerializers.FOR_UI.serialize(records[0])]
+
+    # REST API
+    with QaClient() as test_client:
+        response = test_client.post(
+            "/storage/select",
+            json={"Type": "StubDataclass"},
+            params={"limit": 2, "skip": 3, "descending": True},
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert [x["Id"] for x in result["Data"]] == ids[1::-1]
+        assert result["TotalCount"] == 5
+
+
+@pytest.mark.skip("Performance test.")
+def test_performance(default_db_fixture):
+    """Test performance of loading the first page of a large table."""
+    n = 100000
+    records = [StubDataclass(id=f"{__name__}.{i:06}").build() for i in range(n)]
+    active(DataSource).replace_many(records, commit=True)
+
+    print(f">>> Test stub type: {StubDataclass.__name__}, {n=}.")
+    for limit in (100, None):
+        start_time = time.time()
+        result = SelectResponse.get_response(SelectRequest(type_="StubDataclass", limit=limit))
+        end_time = time.time()
+        print(f"Select {limit=}: {end_time - start_time:.3f}s.")
+        assert result.total_count == n
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,104 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import asyncio
+import time
+from fastapi import FastAPI
+from httpx import ASGITransport
+from httpx import AsyncClient
+from cl.runtime.contexts.context_manager import active
+from cl.runtime.db.data_source import DataSource
+from cl.runtime.records.typename import typename
+from cl.runtime.routers.executor_util import ExecutorUtil
+from cl.runtime.routers.server_util import ServerUtil
+from cl.runtime.routers.storage.key_request_item import KeyRequestItem
+from stubs.cl.runtime import StubDataclass
+
+
+def _get_active_data_source(duration_sec: float) -> DataSource:
+    """Sleep to simulate a blocking DB call, then return the active data source."""
+    time.sleep(duration_sec)
+    return active(DataSource)
+
+
+async def _run_concurrently(count: int, duration_sec: float) -> list[DataSource]:
+    """Run blocking calls in the DB executor concurrently."""
+    tasks = [ExecutorUtil.run_in_db_executor(_get_active_data_source, duration_sec) for _ in range(count)]
+    return await asyncio.gather(*tasks)
+
+
+def test_run_in_db_executor(default_db_fixture):
+    """Test that active contexts are carried over to the executor threads and calls run concurrently."""
+    ExecutorUtil.reset_db_executor(max_workers=4)
+    try:
+        start_time = time.perf_counter()
+        result = asyncio.run(_run_concurrently(4, 0.5))
+        duration = time.perf_counter() - start_time
+
+        # Each call sees the data source active in the caller
+        assert all(x is active(DataSource) for x in result)
+
+        # Calls are not serialized by the event loop
+        assert duration < 1.5
+    finally:
+        ExecutorUtil.reset_db_executor()
+
+
+@pytest.mark.skip("Performance test.")
+def test_performance(default_db_fixture):
+    """
+    Measure throughput for concurrent calls depending on the number of DB executor threads.
+
+    Notes:
+        - Calls with simulated DB latency release the GIL and scale with the number of threads
+        - /storage/load requests to in-process SQLite are bound by deserialization under the GIL
+    """
+    request_count = 200
+    records = [StubDataclass(id=f"{__name__}_{i}").build() for i in range(100)]
+    active(DataSource).replace_many(records, commit=True)
+    request_body = [KeyRequestItem(key=x.id, type=typename(StubDataclass)).model_dump() for x in records]
+
+    app = FastAPI()
+    ServerUtil.include_routers(app)
+
+    async def _post_load_concurrently() -> None:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            tasks = [client.post("/storage/load", json=request_body) for _ in range(request_count)]
+            responses = await asyncio.gather(*tasks)
+            assert all(x.status_code == 200 for x in responses)
+
+    try:
+        for max_workers in (1, 2, 4, 8):
+            ExecutorUtil.reset_db_executor(max_workers=max_workers)
+
+            start_time = time.perf_counter()
+            asyncio.run(_run_concurrently(request_count, 0.01))
+            latency_duration = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            asyncio.run(_post_load_concurrently())
+            load_duration = time.perf_counter() - start_time
+
+            print(
+                f"Workers: {max_workers} "
+                f"Simulated latency calls/sec: {request_count / latency_duration:.1f} "
+                f"/storage/load requests/sec: {request_count / load_duration:.1f}"
+            )
+    finally:
+        ExecutorUtil.reset_db_executor()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -13,15 +13,21 @@
 # limitations under the License.
 
 import pytest
+import os
+import subprocess
+import sys
+import tempfile
 from enum import Enum
 from enum import IntEnum
 from cl.runtime.records.data_mixin import DataMixin
 from cl.runtime.records.key_mixin import KeyMixin
 from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.records.typename import qualname
+from cl.runtime.records.typename import typename
 from cl.runtime.schema.type_decl import TypeDecl
 from cl.runtime.schema.type_info import TypeInfo
 from cl.runtime.schema.type_kind import TypeKind
+from cl.runtime.settings.project_settings import ProjectSettings
 from stubs.cl.runtime import StubDataclass
 from stubs.cl.runtime import StubDataclassData
 from stubs.cl.runtime import StubDataclassDerived
@@ -36,6 +42,52 @@ from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_double_underscore i
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_primitive_fields_key import StubDataclassPrimitiveFieldsKey
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_underscore import _StubDataclassUnderscore  # noqa
 
+_HEAVY_MODULES = ("fastapi", "matplotlib", "pandas", "plotly", "pymongo")
+"""Modules that must not be imported by the first load from DataSource."""
+
+_STARTUP_SCRIPT = f"""
+import sys
+import time
+import uuid
+start_time = time.perf_counter()
+from cl.runtime.contexts.context_manager import activate
+from cl.runtime.db.data_source import DataSource
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.server.env import Env
+from cl.runtime.settings.env_kind import EnvKind
+from cl.runtime.settings.labels.field_label import FieldLabel
+import_time = time.perf_counter()
+with activate(Env(env_id="startup", env_kind=EnvKind.TEST, env_dir=sys.argv[1]).build()):
+    with activate(DataSource(db=SqliteDb(db_id="temp;startup").build()).build()) as data_source:
+        record = FieldLabel(field_name=uuid.uuid4().hex, field_label="Label").build()
+        data_source.insert_many([record], commit=True)
+        assert data_source.load_one(record.get_key()) == record
+end_time = time.perf_counter()
+print(import_time - start_time, end_time - import_time, len(sys.modules))
+print(",".join(x for x in {_HEAVY_MODULES} if x in sys.modules))
+"""
+"""Script that measures cold import time and the time of the first load from DataSource in a new process."""
+
+
+def _run_startup_script() -> tuple[float, float, int, str]:
+    """Run startup script in a new process, return import time, load time, module count and heavy modules."""
+    project_root = ProjectSettings.get_project_root()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(x for x in (project_root, env.get("PYTHONPATH")) if x)
+        env["CL_DB_DIR"] = temp_dir
+        output = subprocess.run(
+            [sys.executable, "-c", _STARTUP_SCRIPT, temp_dir],
+            cwd=project_root,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    times_line, heavy_modules_line = output.splitlines()[-2:]
+    import_time, load_time, module_count = times_line.split()
+    return float(import_time), float(load_time), int(module_count), heavy_modules_line
+
 
 def test_rebuild_cache():
     """Test TypeInfo.reload_cache method, this also generates and saves a new TypeInfo.csv file."""
@@ -226,6 +278,40 @@ def test_get_child_and_self_types():
     )
 
 
+def test_get_child_and_self_type_names():
+    """Test that child type names from TypeInfo.csv match subclasses of the imported types."""
+    for type_ in TypeInfo.get_types():
+        if TypeInfo._get_type_kind(type_) in (TypeKind.DATA, TypeKind.KEY, TypeKind.RECORD):
+            for type_kind in (None, TypeKind.DATA, TypeKind.KEY, TypeKind.RECORD):
+                subtypes_set = tuple(TypeInfo._get_unfiltered_child_types_set(type_))
+                expected_types = TypeInfo._get_data_key_or_record_types(subtypes_set, type_kind=type_kind)
+                # Eliminate duplicate names because __subclasses__ may include the original class replaced
+                # by the slots=True dataclass decorator until it is garbage collected
+                expected_names = tuple(sorted(set(typename(x) for x in expected_types)))
+                assert TypeInfo.get_child_and_self_type_names(type_, type_kind=type_kind) == expected_names
+
+    # Mixin types are flagged in TypeInfo.csv using the same check as for the imported types
+    assert TypeInfo.get_type_name_info("RecordMixin").is_mixin
+    assert not TypeInfo.get_type_name_info(typename(StubDataclass)).is_mixin
+
+
+def test_lazy_import():
+    """Test that the first load from DataSource in a new process does not import every type in TypeInfo.csv."""
+    _, _, _, heavy_modules = _run_startup_script()
+    assert heavy_modules == ""
+
+
+@pytest.mark.skip("Performance test.")
+def test_startup_performance():
+    """Test cold import time and the time of the first load from DataSource in a new process."""
+    for _ in range(5):
+        import_time, load_time, module_count, heavy_modules = _run_startup_script()
+        print(
+            f"Import: {import_time:.3f}s, first load: {load_time:.3f}s, "
+            f"modules: {module_count}, heavy modules: {heavy_modules or 'none'}."
+        )
+
+
 def test_get_common_base_type():
     """Test TypeInfo.get_common_base_type method."""
     assert TypeInfo.get_common_base_type([StubDataclass]) is StubDataclass
@@ -14,12 +14,15 @@
 
 
 import pytest
+import dataclasses
+import re
 import orjson
 from frozendict import frozendict
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.qa.regression_guard import RegressionGuard
 from cl.runtime.records.builder_checks import BuilderChecks
 from cl.runtime.serializers.data_serializer import DataSerializer
+from cl.runtime.serializers.data_serializers import DataSerializers
 from cl.runtime.serializers.enum_serializers import EnumSerializers
 from cl.runtime.serializers.json_serializer import orjson_default
 from cl.runtime.serializers.primitive_serializers import PrimitiveSerializers
@@ -109,7 +112,8 @@ _SAMPLES = [
 
 
 _INVALID_SAMPLES = [
-    # TODO (Roman): The Stub class must be valid for displaying on UI. Create a separate class for testing invalid fields.
+    # TODO (Roman): The Stub class must be valid for displaying on UI.
+    #   Create a separate class for testing invalid fields.
     # (
     #     StubDataclassNumpyFields(untyped_ndarray=np.array([1.0, 2.0])),
     #     "is an ndarray but does not specify dtype",
@@ -192,5 +196,77 @@ def test_unidirectional():
             serializer.serialize(sample)
 
 
+def test_compiled_plans():
+    """Test that compiled per-type plans produce the same result or error as the interpreted path."""
+
+    for compiled_serializer in (DataSerializers.FOR_SQLITE, DataSerializers.FOR_MONGO, DataSerializers.FOR_UI):
+        interpreted_serializer = _to_interpreted(compiled_serializer)
+        for sample in _SAMPLES:
+            sample = sample.build()
+
+            # Compare serialized data including the order of keys, run twice to use a cached plan
+            for _ in range(2):
+                try:
+                    interpreted = interpreted_serializer.serialize(sample)
+                except RuntimeError as e:
+                    with pytest.raises(RuntimeError, match=re.escape(str(e).splitlines()[0])):
+                        compiled_serializer.serialize(sample)
+                    break
+                compiled = compiled_serializer.serialize(sample)
+                assert compiled == interpreted
+                assert list(compiled.keys()) == list(interpreted.keys())
+            else:
+                # Deserialize and compare, including the case when the interpreted path raises an error
+                try:
+                    expected = interpreted_serializer.deserialize(interpreted)
+                except RuntimeError as e:
+                    with pytest.raises(RuntimeError, match=re.escape(str(e).splitlines()[0])):
+                        compiled_serializer.deserialize(compiled)
+                else:
+                    assert BuilderChecks.is_equal(compiled_serializer.deserialize(compiled), expected)
+
+
+def test_trusted():
+    """Test that trusted build of deserialized objects produces the same result as full build."""
+
+    for trusted_serializer in (DataSerializers.FOR_SQLITE, DataSerializers.FOR_MONGO):
+        untrusted_serializer = _to_untrusted(trusted_serializer)
+        for sample in _SAMPLES:
+            sample = sample.build()
+            try:
+                serialized = trusted_serializer.serialize(sample)
+                expected = untrusted_serializer.deserialize(serialized)
+            except RuntimeError:
+                # Samples that cannot be serialized or deserialized are tested elsewhere
+                continue
+            result = trusted_serializer.deserialize(serialized)
+            assert result.is_frozen()
+            assert BuilderChecks.is_equal(result, expected)
+
+
+def _to_untrusted(serializer: DataSerializer) -> DataSerializer:
+    """Create a copy of the serializer and its inner serializer that performs full build of deserialized objects."""
+    return dataclasses.replace(
+        serializer,
+        trusted=None,
+        inner_serializer=_to_untrusted(serializer.inner_serializer) if serializer.inner_serializer else None,
+        _serialization_plans=None,
+        _deserialization_plans=None,
+        _deserialization_plans_by_name=None,
+    ).build()
+
+
+def _to_interpreted(serializer: DataSerializer) -> DataSerializer:
+    """Create a copy of the serializer and its inner serializer that does not use compiled plans."""
+    return dataclasses.replace(
+        serializer,
+        interpreted=True,
+        inner_serializer=_to_interpreted(serializer.inner_serializer) if serializer.inner_serializer else None,
+        _serialization_plans=None,
+        _deserialization_plans=None,
+        _deserialization_plans_by_name=None,
+    ).build()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,67 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import dataclasses
+import time
+from cl.runtime.serializers.data_serializer import DataSerializer
+from cl.runtime.serializers.data_serializers import DataSerializers
+from stubs.cl.runtime import StubDataclassNestedFields
+from stubs.cl.runtime import StubDataclassPrimitiveFields
+
+
+@pytest.mark.skip("Performance test.")
+def test_performance():
+    """Compare compiled and interpreted serialization paths."""
+    n = 10000
+    samples = [
+        *(StubDataclassPrimitiveFields(key_str_field=f"key{i}").build() for i in range(n)),
+        *(StubDataclassNestedFields(id=f"key{i}").build() for i in range(n)),
+    ]
+
+    serializers = {
+        "FOR_SQLITE": DataSerializers.FOR_SQLITE,
+        "FOR_MONGO": DataSerializers.FOR_MONGO,
+        "FOR_UI": DataSerializers.FOR_UI,
+    }
+    for serializer_name, compiled_serializer in serializers.items():
+        interpreted_serializer = _to_interpreted(compiled_serializer)
+        print(f">>> Serializer: {serializer_name}, n={len(samples)}.")
+        for mode, serializer in (("interpreted", interpreted_serializer), ("compiled", compiled_serializer)):
+            start_time = time.time()
+            serialized = [serializer.serialize(sample) for sample in samples]
+            end_time = time.time()
+            print(f"Serialize {mode}: {end_time - start_time}s.")
+
+            if serializer_name != "FOR_UI":
+                start_time = time.time()
+                [serializer.deserialize(data) for data in serialized]
+                end_time = time.time()
+                print(f"Deserialize {mode}: {end_time - start_time}s.")
+
+
+def _to_interpreted(serializer: DataSerializer) -> DataSerializer:
+    """Create a copy of the serializer and its inner serializer that does not use compiled plans."""
+    return dataclasses.replace(
+        serializer,
+        interpreted=True,
+        inner_serializer=_to_interpreted(serializer.inner_serializer) if serializer.inner_serializer else None,
+        _serialization_plans=None,
+        _deserialization_plans=None,
+        _deserialization_plans_by_name=None,
+    ).build()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
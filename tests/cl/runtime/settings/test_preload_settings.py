@@ -14,7 +14,12 @@
 
 import pytest
 import os
+from cl.runtime.contexts.context_manager import active
+from cl.runtime.db.data_source import DataSource
 from cl.runtime.settings.preload_settings import PreloadSettings
+from stubs.cl.runtime import StubDataclass
+from stubs.cl.runtime import StubDataclassDerived
+from stubs.cl.runtime import StubDataclassKey
 
 
 def test_preload_settings():
@@ -33,5 +38,25 @@ def test_preload_settings():
         raise RuntimeError("Preload directory errors:\n" + "".join(errors))
 
 
+def test_preload_dirs_order(default_db_fixture):
+    """Test that a file in a later preload dir replaces the records with the same key from an earlier dir."""
+    test_dir = __file__.removesuffix(".py")
+    preload_settings = PreloadSettings(
+        preload_dirs=[os.path.join(test_dir, "first"), os.path.join(test_dir, "second")],
+        preload_max_workers=4,
+        preload_batch_size=1,
+    ).build()
+    preload_settings.save_and_configure()
+
+    # Record of the same type from the later dir
+    assert (
+        active(DataSource).load_one(StubDataclassKey(id="shared_id").build())
+        == StubDataclassDerived(id="shared_id", derived_str_field="second").build()
+    )
+
+    # Record of another type with the same key type from the later dir
+    assert active(DataSource).load_one(StubDataclassKey(id="first_id").build()) == StubDataclass(id="first_id").build()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
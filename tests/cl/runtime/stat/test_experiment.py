@@ -111,5 +111,33 @@ def test_launch_all_trials(multi_db_fixture):
     assert max_trials_set.calc_num_additional_trials(max_trials=5) == (0,)
 
 
+def test_launch_parallel_trials(multi_db_fixture):
+    """Test running trials in parallel when max_parallel is set."""
+    experiment = StubBinaryExperiment(
+        experiment_id="test_launch_parallel_trials",
+        params=[
+            Param(param_id="Test1"),
+            Param(param_id="Test2"),
+        ],
+        max_trials=4,
+        max_parallel=4,
+        trial_duration_sec=0.2,
+    ).build()
+
+    experiment.run_launch_one_trial()
+    assert experiment.calc_num_completed_trials() == (1, 1)
+
+    # Six remaining trials run concurrently up to the limit
+    experiment.run_launch_all_trials()
+    assert experiment.get_max_active_count() == experiment.max_parallel
+    assert experiment.calc_num_completed_trials() == (4, 4)
+
+    # No trials remaining
+    experiment.run_launch_all_trials()
+    assert experiment.calc_num_completed_trials() == (4, 4)
+    with pytest.raises(RuntimeError, match="reached or exceeded"):
+        experiment.run_launch_one_trial()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,89 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+import time
+from cl.runtime.contexts.context_manager import active
+from cl.runtime.db.data_source import DataSource
+from cl.runtime.views.dag.successor_dag_key import SuccessorDagKey
+from cl.runtime.views.dag.successor_dag_node import SuccessorDagNode
+from cl.runtime.views.dag.successor_dag_node_key import SuccessorDagNodeKey
+
+
+def _create_node(dag_node_id: str, successors: list[str], edges: list[str] | None = None) -> SuccessorDagNode:
+    """Create a node of the test DAG with the specified successors."""
+    return SuccessorDagNode(
+        dag=SuccessorDagKey(dag_id="test").build(),
+        dag_node_id=dag_node_id,
+        node_yaml=f"Name: {dag_node_id}",
+        successor_nodes=[SuccessorDagNodeKey(node_id=f"test: {x}").build() for x in successors] or None,
+        successor_edges=edges,
+    ).build()
+
+
+def test_build_dag(default_db_fixture):
+    """Test building DAG from the root node."""
+    root = _create_node("root", ["a", "b"], ["To A", "To B"])
+    records = [root, _create_node("a", ["c"]), _create_node("b", ["c", "d"]), _create_node("c", [])]
+    active(DataSource).replace_many(records, commit=True)
+
+    # Shared successor c is included once, missing node d is included without data
+    dag = SuccessorDagNode.build_dag(node=root)
+    assert [x.id_ for x in dag.nodes] == [f"test: {x}" for x in ["root", "a", "b", "c", "d"]]
+    assert [(x.source, x.target, x.label) for x in dag.edges] == [
+        ("test: root", "test: a", "To A"),
+        ("test: root", "test: b", "To B"),
+        ("test: a", "test: c", "Successor Nodes[1]"),
+        ("test: b", "test: c", "Successor Nodes[1]"),
+        ("test: b", "test: d", "Successor Nodes[2]"),
+    ]
+    assert dag.nodes[-1].data.node_data is None
+
+    # Depth and node limits
+    assert [x.id_ for x in SuccessorDagNode.build_dag(node=root, max_depth=1).nodes] == [
+        "test: root",
+        "test: a",
+        "test: b",
+    ]
+    dag = SuccessorDagNode.build_dag(node=root, max_nodes=4)
+    assert [x.id_ for x in dag.nodes] == [f"test: {x}" for x in ["root", "a", "b", "c"]]
+    assert len(dag.edges) == 4
+
+    # Ignored fields are not traversed
+    assert len(SuccessorDagNode.build_dag(node=root, ignore_fields=["successor_nodes"]).nodes) == 1
+
+
+@pytest.mark.skip("Performance test.")
+def test_performance(default_db_fixture):
+    """Test performance of building a DAG in the form of a binary tree."""
+    n = 5000
+    records = [_create_node(str(i), [str(j) for j in (2 * i + 1, 2 * i + 2) if j < n]) for i in range(n)]
+    active(DataSource).replace_many(records, commit=True)
+
+    print(f">>> {n=}.")
+    start_time = time.time()
+    dag = SuccessorDagNode.build_dag(node=records[0], max_depth=None)
+    end_time = time.time()
+    print(f"Build DAG: {end_time - start_time}s.")
+    assert len(dag.nodes) == n
+    start_time = time.time()
+    dag = SuccessorDagNode.build_dag(node=records[0], max_depth=5)
+    end_time = time.time()
+    print(f"Build DAG with max_depth=5: {end_time - start_time}s.")
+    assert len(dag.nodes) == 63
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])